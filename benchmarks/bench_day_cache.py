@@ -0,0 +1,77 @@
+"""
+Benchmark of the day cache on an interactive booking session: a user looks at the schedule of the coming week,
+tries a few dates after the booking window and books one of them, over and over.
+The same session runs with the day cache and without it (day_cache_size=0).
+
+Run from the repository root:
+    python -m benchmarks.bench_day_cache
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+
+SESSIONS = 300
+RESERVATIONS = 20000
+
+
+def make_db(path, day_cache_size):
+    db = DataBase('9:00', '21:00', path, day_cache_size=day_cache_size)
+    db.set_db()
+    return db
+
+
+def fill(path):
+    db = make_db(path, 0)
+    day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=RESERVATIONS // 6)
+    db.add_many(
+        ('Jan', 'Kowalski', day + timedelta(days=i // 6, hours=9 + 2 * (i % 6)),
+         day + timedelta(days=i // 6, hours=10 + 2 * (i % 6)))
+        for i in range(RESERVATIONS)
+    )
+    db.close()
+
+
+def session(db, number):
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    for _ in db.show_schedule(today, today + timedelta(days=6)):
+        pass
+    # after the booking window, so the slot index does not answer
+    day = today + timedelta(days=20 + number % 5)
+    for hour in (10, 12, 15):
+        date = day + timedelta(hours=hour)
+        if db.check_availability_court(date):
+            db.check_reservation_options(date)
+        else:
+            db.suggest_new_date(date)
+    start = day + timedelta(hours=9, minutes=number % 60)
+    db.add(f'User{number}', 'Nowak', start, start + timedelta(minutes=1))
+
+
+def measure(path, day_cache_size):
+    db = make_db(path, day_cache_size)
+    start = time.perf_counter()
+    for number in range(SESSIONS):
+        session(db, number)
+    elapsed = time.perf_counter() - start
+    info = db.cache_info()
+    db.close()
+    return elapsed / SESSIONS * 1e3, info
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        fill(path)
+        without, _ = measure(path, 0)
+        with_cache, info = measure(path, 64)
+
+    print(f"without day cache:  {without:.2f} ms per session")
+    print(f"with day cache:     {with_cache:.2f} ms per session")
+    print(f"hits / misses:      {info.hits} / {info.misses}")
+
+
+if __name__ == '__main__':
+    main()
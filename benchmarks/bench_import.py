@@ -0,0 +1,52 @@
+"""
+Benchmark of importing a large CSV file written in the save_as_csv format.
+
+Run from the repository root:
+    python -m benchmarks.bench_import [rows]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase, change_date_format
+from tennis_court.importer import import_file
+
+ROWS = 200000
+
+
+def write_csv(path, rows):
+    day = datetime(2000, 1, 3)
+    with open(path, 'w', encoding='utf8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['name', 'start_date', 'end_date'])
+        for index in range(rows):
+            start = day + timedelta(days=index // 12, hours=9 + index % 12)
+            writer.writerow(
+                ['Jan Kowalski', change_date_format(start), change_date_format(start + timedelta(hours=1))]
+            )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'reservations.csv')
+        write_csv(path, rows)
+
+        db = DataBase('9:00', '21:00', os.path.join(directory, 'import.db'))
+        db.set_db()
+        start = time.perf_counter()
+        summary = import_file(db, path)
+        elapsed = time.perf_counter() - start
+        db.close()
+
+    print(f"rows:     {rows}")
+    print(f"summary:  {summary}")
+    print(f"time:     {elapsed:.2f} s")
+    print(f"rows / s: {rows / elapsed:.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark of the statement cache: the reservation lookup of DataBase.cancel
+run with the values formatted into the SQL text, as the queries used to be built, against the named,
+parameterized statement of queries.py, with and without the sqlite3 statement cache.
+The lookup is a single index probe, so most of the time left is the prepare step.
+
+Run from the repository root:
+    python -m benchmarks.bench_queries
+"""
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from tennis_court import queries
+from tennis_court.migrations import migrate
+
+ROUNDS = 20000
+RESERVATIONS = 2000
+
+
+def make_db(cached_statements):
+    db = sqlite3.connect(':memory:', cached_statements=cached_statements)
+    migrate(db)
+    day = datetime(2030, 1, 1, 9)
+    db.executemany(
+        queries.INSERT_RESERVATION,
+        (
+            ('Jan', 'Kowalski', str(day + timedelta(hours=2 * i)), str(day + timedelta(hours=2 * i + 1)), 1)
+            for i in range(RESERVATIONS)
+        )
+    )
+    db.commit()
+    return db
+
+
+def dates():
+    day = datetime(2030, 1, 1, 9)
+    return [(day + timedelta(minutes=30 * i)).isoformat(' ', 'minutes') for i in range(ROUNDS)]
+
+
+def run_formatted(db, dates):
+    for date in dates:
+        db.execute(
+            f"""
+            SELECT * FROM reservations
+            WHERE start_date = '{date}' AND first_name = 'Jan' AND last_name = 'Kowalski' AND court_id = 1;
+            """
+        ).fetchone()
+
+
+def run_parameterized(db, dates):
+    for date in dates:
+        db.execute(queries.SELECT_RESERVATION, (date, 'Jan', 'Kowalski', 1)).fetchone()
+
+
+def measure(run, cached_statements):
+    db = make_db(cached_statements)
+    values = dates()
+    start = time.perf_counter()
+    run(db, values)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed / ROUNDS * 1e6
+
+
+def main():
+    print(f"formatted SQL text:             {measure(run_formatted, 128):.2f} us per query")
+    print(f"parameterized, no cache:        {measure(run_parameterized, 0):.2f} us per query")
+    print(f"parameterized, cached:          {measure(run_parameterized, 128):.2f} us per query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of the cold start of `python -m tennis_court`: every command runs in a new interpreter,
+the way a script calling the CLI runs it, and the wall time of the whole process is measured.
+The import time of tennis_court.app is measured the same way with `python -X importtime`.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROUNDS = 20
+
+
+def run(args, stdin='', env=None, cwd=None):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], input=stdin, capture_output=True, text=True, check=True, env=env, cwd=cwd
+    )
+    return (time.perf_counter() - start) * 1e3
+
+
+def import_time(env):
+    """
+    The function returns the cumulative import time of tennis_court.app in milliseconds.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import tennis_court.app'],
+        capture_output=True, text=True, check=True, env=env
+    ).stderr
+    for line in stderr.splitlines():
+        if line.rstrip().endswith('| tennis_court.app'):
+            return int(line.split('|')[1]) / 1e3
+
+
+def main():
+    day = f"{datetime.today() + timedelta(days=3):%d.%m.%Y}"
+    with tempfile.TemporaryDirectory() as directory:
+        path_db = os.path.join(directory, 'startup.db')
+        # the menu opens the database at its default path, relative to the working directory
+        os.makedirs(os.path.join(directory, 'src', 'tennis_court', 'db'))
+        env = {
+            **os.environ,
+            'PYTHONPATH': os.path.abspath('src'),
+            'CONFIG_CACHE': os.path.join(directory, 'config.json'),
+        }
+        commands = {
+            'python -c pass': (['-c', 'pass'], ''),
+            'menu, exit at once': (['-m', 'tennis_court'], '5\n'),
+            'schedule': (['-m', 'tennis_court', 'schedule', day, day, '--db', path_db], ''),
+            'book': (['-m', 'tennis_court', 'book', 'Jan Kowalski', f"{day} 10:00", '--db', path_db], ''),
+        }
+        # the database and the config cache are created before the measured runs
+        run(commands['schedule'][0], env=env, cwd=directory)
+
+        for name, (args, stdin) in commands.items():
+            times = [run(args, stdin, env, directory) for _ in range(ROUNDS)]
+            print(f"{name:<24} median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms")
+
+        times = [import_time(env) for _ in range(ROUNDS)]
+        print(f"{'import tennis_court.app':<24} median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
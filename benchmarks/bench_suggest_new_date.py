@@ -0,0 +1,60 @@
+"""
+Benchmark of DataBase.suggest_new_date on a busy day, answered by the slot index in the booking window
+and by a query of the day after it.
+
+Run from the repository root:
+    python -m benchmarks.bench_suggest_new_date
+"""
+import time
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+
+ROUNDS = 1000
+
+
+def measure(db, day):
+    """
+    The function returns the suggestion for 15:00 of the day, the reservations queries of one call
+    and the microseconds of one call.
+    """
+    # every half-hour is taken except the first and the last one
+    hour = day + timedelta(hours=9, minutes=30)
+    while hour < day + timedelta(hours=20, minutes=30):
+        db.add('Jan', 'Kowalski', hour, hour + timedelta(minutes=30))
+        hour += timedelta(minutes=30)
+    date = day + timedelta(hours=15)
+
+    statements = []
+    db._db.set_trace_callback(statements.append)
+    suggestion = db.suggest_new_date(date)
+    db._db.set_trace_callback(None)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        db.suggest_new_date(date)
+    elapsed = time.perf_counter() - start
+    # PRAGMA data_version is not a search of the reservations
+    queries = len([statement for statement in statements if 'reservations' in statement])
+    return suggestion, queries, elapsed / ROUNDS * 1e6
+
+
+def main():
+    # without the day cache the days after the booking window are read on every call
+    db = DataBase('9:00', '21:00', ':memory:', day_cache_size=0)
+    db.set_db()
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    probes = (timedelta(hours=15) - timedelta(hours=9, minutes=30)) // timedelta(minutes=30) * 2
+    print(f"queries per call (step-by-step): ~{probes}")
+    for name, day in (('in the booking window', today + timedelta(days=3)),
+                      ('after the booking window', today + timedelta(days=20))):
+        suggestion, queries, call_us = measure(db, day)
+        print(f"{name}:")
+        print(f"  suggestion:       {suggestion}")
+        print(f"  queries per call: {queries}")
+        print(f"  time per call:    {call_us:.1f} us")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark of the waitlist under heavy cancellation traffic: every half hour of the coming months is booked
+and has WAITERS users waiting for it, the holder of every half hour cancels over and over, so every cancel books
+the next waiter in the same transaction. The same cancels are timed without waiters, and with NOISE more
+waiters of other hours, which the indexed lookup of a freed period does not read.
+
+Run from the repository root:
+    python -m benchmarks.bench_waitlist
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tennis_court import queries
+from tennis_court.control_db import DataBase
+from tennis_court.series import to_text
+
+SLOTS = 2000
+WAITERS = 3
+NOISE = 50000
+# half hours between 9:00 and 21:00
+SLOTS_PER_DAY = 24
+
+
+def slot(number):
+    day = datetime.today().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=2)
+    return day + timedelta(days=number // SLOTS_PER_DAY, minutes=30 * (number % SLOTS_PER_DAY))
+
+
+def make_db(path, waiters, noise=0):
+    db = DataBase('9:00', '21:00', path)
+    db.set_db()
+    # every user books once, so the weekly quota never refuses a promotion
+    db.add_many((f'Holder{number}', 'Nowak', slot(number), slot(number) + timedelta(minutes=30))
+                for number in range(SLOTS))
+    waitlist = [(f'Waiter{waiter}x{number}', slot(number)) for waiter in range(waiters) for number in range(SLOTS)]
+    waitlist += [(f'Noise{number}', slot(SLOTS + number)) for number in range(noise)]
+    with db._connections.writing() as connection:
+        connection.executemany(
+            queries.INSERT_WAITER,
+            ((first_name, 'Lis', 1, to_text(start), to_text(start + timedelta(minutes=30)))
+             for first_name, start in waitlist)
+        )
+        connection.commit()
+    return db
+
+
+def measure(path, waiters, noise=0):
+    """
+    The function returns the milliseconds of one cancel and the promotions per second.
+    """
+    db = make_db(path, waiters, noise)
+    holders = {number: f'Holder{number}' for number in range(SLOTS)}
+    promoted = []
+    db.on_promote = promoted.extend
+    starts = {slot(number): number for number in range(SLOTS)}
+
+    cancels = 0
+    start = time.perf_counter()
+    for _ in range(max(waiters, 1)):
+        for number in range(SLOTS):
+            db.cancel(holders[number], 'Nowak' if holders[number].startswith('Holder') else 'Lis', slot(number))
+            cancels += 1
+        for first_name, _, start_date, _, _ in promoted:
+            holders[starts[start_date]] = first_name
+        promoted.clear()
+    elapsed = time.perf_counter() - start
+    db.close()
+    promotions = SLOTS * waiters
+    return elapsed / cancels * 1e3, promotions / elapsed if promotions else 0
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            ('no waiters', measure(os.path.join(directory, 'empty.db'), 0)),
+            (f'{WAITERS} waiters a slot', measure(os.path.join(directory, 'waiters.db'), WAITERS)),
+            (f'and {NOISE} other waiters', measure(os.path.join(directory, 'noise.db'), WAITERS, NOISE)),
+        ]
+
+    for name, (cancel_ms, promotions) in results:
+        print(f"{name + ':':<26} {cancel_ms:.3f} ms per cancel, {promotions:.0f} promotions/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Synthetic reservation histories for the benchmarks.
+
+The reservations are spread evenly over the days before last_day, every day gets non-overlapping
+reservations of 30 to 90 minutes between the opening hours, made by a pool of Faker users.
+The same seed gives the same history.
+"""
+import math
+import random
+from datetime import datetime, timedelta
+
+from faker import Faker
+
+SLOT = timedelta(minutes=30)
+# reservations of a day, unless the history would start before FIRST_DAY
+PER_DAY = 8
+# a week after datetime.min, so the dates a query derives from the first reservations are still valid
+FIRST_DAY = datetime.min + timedelta(weeks=1)
+
+
+def make_users(count, seed=0):
+    """
+    The function returns count distinct (first_name, last_name) pairs.
+    """
+    fake = Faker()
+    fake.seed_instance(seed)
+    users = set()
+    while len(users) < count:
+        users.add((fake.first_name(), fake.last_name()))
+    return sorted(users)
+
+
+def history_days(count, last_day, slots):
+    """
+    The function returns the number of days ending with last_day the count reservations are spread over,
+    PER_DAY a day unless that would start before FIRST_DAY, with at most slots reservations a day.
+    """
+    days = min(math.ceil(count / PER_DAY), (last_day - FIRST_DAY).days)
+    if days * slots < count:
+        raise ValueError(f"{count} reservations do not fit between {FIRST_DAY:%Y-%m-%d} and {last_day:%Y-%m-%d}.")
+    return days
+
+
+def generate_reservations(count, last_day, seed=0, open_hour=9, close_hour=21, users=None):
+    """
+    The function yields count (first_name, last_name, start_date, end_date) reservations sorted by start_date,
+    the last of them on last_day.
+    """
+    rng = random.Random(seed)
+    users = users or make_users(min(10000, max(10, count // 50)), seed)
+    slots = (close_hour - open_hour) * 2
+    last_day = datetime.combine(last_day.date(), datetime.min.time())
+
+    days = history_days(count, last_day, slots)
+    first_day = last_day - timedelta(days=days - 1)
+    for index in range(days):
+        per_day = count // days + (index < count % days)
+        if not per_day:
+            continue
+        # lengths of 1 to 3 slots, the rest of the day is split into random gaps
+        longest = min(3, slots // per_day)
+        lengths = [rng.randint(1, longest) for _ in range(per_day)]
+        cuts = sorted(rng.randint(0, slots - sum(lengths)) for _ in range(per_day))
+
+        day = first_day + timedelta(days=index, hours=open_hour)
+        taken = 0
+        for length, cut in zip(lengths, cuts):
+            start = day + SLOT * (taken + cut)
+            first_name, last_name = rng.choice(users)
+            yield first_name, last_name, start, start + SLOT * length
+            taken += length
@@ -0,0 +1,258 @@
+"""
+Benchmark suite of DataBase on synthetic histories (generator.py) of different sizes.
+
+The DataBase methods of the menu and of the commands and the whole make_reservation flow of TennisCourtApp
+are timed on a database file filled with the given number of reservations. The results are written as JSON,
+a previous result can be given with --compare to print the change of every measurement.
+
+Run from the repository root:
+    python -m benchmarks.suite --sizes 10000 1000000 --output results.json
+    python -m benchmarks.suite --sizes 10000 --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tennis_court.app import TennisCourtApp
+from tennis_court.control_db import DataBase
+from .generator import generate_reservations, make_users
+
+SIZES = [10000]
+ROUNDS = 200
+FILL_BATCH_SIZE = 10000
+SAVE_PATH = os.path.join('src', 'tennis_court', 'save')
+
+
+def measure(call, rounds):
+    """
+    The function calls call(number) rounds times and returns the statistics of one call in microseconds.
+    """
+    times = []
+    for number in range(rounds):
+        start = time.perf_counter()
+        call(number)
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return {
+        'rounds': rounds,
+        'mean_us': round(statistics.fmean(times), 2),
+        'median_us': round(statistics.median(times), 2),
+        'p95_us': round(times[int(len(times) * 0.95) - 1 if len(times) > 1 else 0], 2),
+        'min_us': round(times[0], 2),
+    }
+
+
+def fill(path, size, today, seed):
+    db = DataBase('9:00', '21:00', path)
+    db.set_db()
+    # the history ends with the booking window, so the slot index has something to answer
+    reservations = generate_reservations(size, today + timedelta(days=13), seed)
+    batch = []
+    for reservation in reservations:
+        batch.append(reservation)
+        if len(batch) == FILL_BATCH_SIZE:
+            db.add_many(batch)
+            batch.clear()
+    db.add_many(batch)
+    db.close()
+
+
+class ScriptedUser:
+    """
+    Answers of one user of the make_reservation flow, chosen by the last question of the app.
+    """
+
+    def __init__(self, name, dates):
+        self.name = name
+        self.dates = iter(dates)
+        self.question = ''
+
+    def output(self, text):
+        self.question = text
+
+    def input(self):
+        if self.question.startswith("What's your Name?"):
+            return self.name
+        if self.question.startswith('When would you like to book?'):
+            return f"{next(self.dates):%d.%m.%Y %H:%M}"
+        if self.question.startswith('The time you chose is unavailable'):
+            return 'yes'
+        if self.question.startswith('The nearest free dates are:'):
+            return '1'
+        if self.question.startswith('Would you like to wait for'):
+            # a different date
+            return ''
+        if self.question.startswith('How long would you like to book court?'):
+            return '1'
+        raise RuntimeError(f"Unexpected question: {self.question!r}")
+
+
+def make_reservation_flow(db, today, rounds, seed):
+    rng = random.Random(seed)
+    users = make_users(rounds, seed + 1)
+
+    def call(number):
+        first_name, last_name = users[number % len(users)]
+        dates = (
+            today + timedelta(days=rng.randint(2, 13), hours=rng.randint(9, 20), minutes=rng.choice((0, 30)))
+            for _ in range(100)
+        )
+        user = ScriptedUser(f"{first_name} {last_name}", dates)
+        TennisCourtApp(io=(user.input, user.output), db=db).make_reservation()
+
+    return call
+
+
+def run_size(path, size, rounds, seed):
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    results = {'size': size}
+
+    start = time.perf_counter()
+    fill(path, size, today, seed)
+    results['fill_s'] = round(time.perf_counter() - start, 2)
+
+    start = time.perf_counter()
+    db = DataBase('9:00', '21:00', path)
+    db.set_db()
+    results['set_db_s'] = round(time.perf_counter() - start, 3)
+
+    rng = random.Random(seed)
+    history_days = max(1, size // 8)
+    window_date = lambda: (
+        today + timedelta(days=rng.randint(1, 13), hours=rng.randint(9, 20), minutes=rng.choice((0, 30)))
+    )
+    history_date = lambda: (
+        today - timedelta(days=rng.randint(1, history_days))
+        + timedelta(hours=rng.randint(9, 20), minutes=rng.choice((0, 30)))
+    )
+    users = make_users(min(10000, max(10, size // 50)), seed)
+    user = lambda: rng.choice(users)
+    future_day = today + timedelta(days=400)
+    # the series lie beyond the booking window, every one on weeks of its own
+    series_start = lambda number: future_day + timedelta(days=3000 + 35 * number, hours=15)
+    waitlist_start = lambda number: today + timedelta(days=1 + number % 13, hours=9 + number % 24 / 2)
+
+    methods = {
+        'has_permission_can_reservation': lambda _: db.has_permission_can_reservation(*user()),
+        'has_permission_date': lambda _: db.has_permission_date(window_date()),
+        'check_availability_court.window': lambda _: db.check_availability_court(window_date()),
+        'check_availability_court.history': lambda _: db.check_availability_court(history_date()),
+        'suggest_new_date.window': lambda _: db.suggest_new_date(window_date()),
+        'suggest_new_date.history': lambda _: db.suggest_new_date(history_date()),
+        'check_reservation_options.window': lambda _: db.check_reservation_options(window_date()),
+        'check_reservation_options.history': lambda _: db.check_reservation_options(history_date()),
+        'take_schedule_days.week': lambda _: list(db.take_schedule_days(today, today + timedelta(days=6))),
+        'show_schedule.week': lambda _: list(db.show_schedule(today, today + timedelta(days=6))),
+        'save_as_json.month': lambda _: db.save_as_json('benchmark', [today - timedelta(days=30), today]),
+        'save_as_csv.month': lambda _: db.save_as_csv('benchmark', [today - timedelta(days=30), today]),
+        'add': lambda number: db.add(
+            'Bench', 'Add', future_day + timedelta(days=number, hours=9), future_day + timedelta(days=number, hours=10)
+        ),
+        'book': lambda number: db.book(
+            f'Bench{number}', 'Book', future_day + timedelta(days=number, hours=11),
+            future_day + timedelta(days=number, hours=12)
+        ),
+        'add_many.100': lambda number: db.add_many(
+            ('Bench', 'Many', start, start + timedelta(minutes=30))
+            for start in (future_day + timedelta(days=1000 + 3 * number, minutes=30 * i) for i in range(100))
+        ),
+        'cancel': lambda number: db.cancel('Bench', 'Add', future_day + timedelta(days=number, hours=9)),
+        'book_many.10': lambda number: db.book_many([
+            (f'Bench{i}', 'BookMany', start, start + timedelta(minutes=30))
+            for i, start in enumerate(future_day + timedelta(days=2000 + number, minutes=30 * i) for i in range(10))
+        ]),
+        'cancel_many.10': lambda number: db.cancel_many([
+            (f'Bench{i}', 'BookMany', future_day + timedelta(days=2000 + number, minutes=30 * i)) for i in range(10)
+        ]),
+        'find_free_slots.window': lambda _: db.find_free_slots(window_date()),
+        'find_court.window': lambda _: db.find_court(window_date()),
+        'add_series.4_weeks': lambda number: db.add_series(
+            f'Bench{number}', 'Series', series_start(number), series_start(number) + timedelta(hours=1),
+            series_start(number) + timedelta(weeks=4)
+        ),
+        'cancel_series': lambda number: db.cancel_series(f'Bench{number}', 'Series', series_start(number)),
+        'join_waitlist': lambda number: db.join_waitlist(
+            f'Bench{number}', 'Wait', waitlist_start(number), waitlist_start(number) + timedelta(minutes=30)
+        ),
+        'leave_waitlist': lambda number: db.leave_waitlist(f'Bench{number}', 'Wait', waitlist_start(number)),
+        'make_reservation': make_reservation_flow(db, today, rounds, seed),
+    }
+    results['methods'] = {name: measure(call, rounds) for name, call in methods.items()}
+    results['methods']['check_counters'] = measure(lambda _: db.check_counters(), 1)
+    # the history before the last 30 days leaves the live table, so it is measured last
+    results['methods']['archive'] = measure(lambda _: db.archive(), 1)
+    db.close()
+
+    for extension in ('.json', '.csv'):
+        if os.path.exists(os.path.join(SAVE_PATH, 'benchmark' + extension)):
+            os.remove(os.path.join(SAVE_PATH, 'benchmark' + extension))
+    return results
+
+
+def take_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    """
+    The function prints the median of every measurement against the previous result of the same size.
+    """
+    sizes = {result['size']: result for result in previous['results']}
+    for result in current['results']:
+        before = sizes.get(result['size'])
+        if not before:
+            continue
+        print(f"\nsize {result['size']}: {previous.get('commit')} -> {current.get('commit')}")
+        for name, stats in result['methods'].items():
+            if name in before['methods']:
+                old, new = before['methods'][name]['median_us'], stats['median_us']
+                print(f"  {name:<36} {old:>12.1f} us {new:>12.1f} us {(new - old) / old * 100 if old else 0:>+8.1f} %")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='numbers of reservations')
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help='calls of every method')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file for the results')
+    parser.add_argument('--compare', help='JSON file of a previous run')
+    args = parser.parse_args(argv)
+
+    results = {
+        'commit': take_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'rounds': args.rounds,
+        'results': [],
+    }
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_size(os.path.join(directory, 'benchmark.db'), size, args.rounds, args.seed)
+        results['results'].append(result)
+        print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf8') as file:
+            compare(json.load(file), results)
+    return results
+
+
+if __name__ == '__main__':
+    main()
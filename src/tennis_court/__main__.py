@@ -1,3 +1,185 @@
-from .app import TennisCourtApp
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from datetime import datetime
 
-TennisCourtApp().run()
\ No newline at end of file
+from .config import get_config, ConfigError, DEFAULT_PATH_DB
+from .migrations import DEFAULT_COURT
+from .control_db import ARCHIVE_AFTER_DAYS
+
+
+def past_days(text):
+    days = int(text)
+    if days < 0:
+        raise argparse.ArgumentTypeError(f"the days should not be negative, not {days}")
+    return days
+
+
+parser = argparse.ArgumentParser(prog='python -m tennis_court')
+subcommands = parser.add_subparsers(dest='command')
+
+serve = subcommands.add_parser('serve', help='serve the menu to many TCP clients')
+serve.add_argument('--host', default='127.0.0.1')
+serve.add_argument('--port', type=int, default=8023)
+serve.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+serve.add_argument('--pool-size', type=int, default=8, help='read-only connections for schedules')
+serve.add_argument('--max-sessions', type=int, default=256, help='clients served at the same time')
+
+load = subcommands.add_parser('import', help='load reservations from a saved .csv or .json file')
+load.add_argument('path')
+load.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+load.add_argument('--year', type=int, help='year of the first day in a .json file, the current one by default')
+
+book = subcommands.add_parser(
+    'book', help='book one reservation or a batch of JSON lines: {"name": ..., "start": ..., "minutes": ...}'
+)
+book.add_argument('name', nargs='?', help='"First Last", without it the batch is read')
+book.add_argument('start', nargs='?', help='DD.MM.YYYY HH:MM')
+book.add_argument('--minutes', type=int, default=30, choices=[30, 60, 90])
+book.add_argument('--file', default='-', help='JSON lines of the batch, stdin by default')
+book.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+book.add_argument('--court', type=int, default=DEFAULT_COURT, help='id of the court')
+
+cancel = subcommands.add_parser(
+    'cancel', help='cancel one reservation or a batch of JSON lines: {"name": ..., "start": ...}'
+)
+cancel.add_argument('name', nargs='?', help='"First Last", without it the batch is read')
+cancel.add_argument('start', nargs='?', help='DD.MM.YYYY HH:MM')
+cancel.add_argument('--file', default='-', help='JSON lines of the batch, stdin by default')
+cancel.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+cancel.add_argument('--court', type=int, default=DEFAULT_COURT, help='id of the court')
+
+series = subcommands.add_parser('series', help='book the same hours every week up to a day')
+series.add_argument('name', help='"First Last"')
+series.add_argument('start', help='DD.MM.YYYY HH:MM of the first reservation')
+series.add_argument('--minutes', type=int, default=30, choices=[30, 60, 90])
+series.add_argument('--until', help='DD.MM.YYYY, the last day of the series')
+series.add_argument('--cancel', action='store_true', help='cancel the series with the first reservation at start')
+series.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+series.add_argument('--court', type=int, default=DEFAULT_COURT, help='id of the court')
+
+schedule = subcommands.add_parser('schedule', help='print the reservations of the days as JSON lines')
+schedule.add_argument('from_date', help='DD.MM.YYYY')
+schedule.add_argument('to_date', help='DD.MM.YYYY')
+schedule.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+schedule.add_argument('--court', type=int, default=DEFAULT_COURT, help='id of the court')
+
+export = subcommands.add_parser('export', help='save the schedule of the days to a file and print its path')
+export.add_argument('from_date', help='DD.MM.YYYY')
+export.add_argument('to_date', help='DD.MM.YYYY')
+export.add_argument('--format', choices=['json', 'csv'], default='json')
+export.add_argument('--gzip', action='store_true', help='compress the file')
+export.add_argument('--dir', help='directory of the file, src/tennis_court/save by default')
+export.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+export.add_argument('--court', type=int, default=DEFAULT_COURT, help='id of the court')
+
+archive = subcommands.add_parser(
+    'archive', help='move the reservations ended more than --days days ago out of the live table'
+)
+archive.add_argument(
+    '--days', type=past_days, default=ARCHIVE_AFTER_DAYS, help='days of the past kept in the live table'
+)
+archive.add_argument('--db', default=DEFAULT_PATH_DB, help='path to the database file')
+
+args = parser.parse_args()
+
+try:
+    get_config()
+except ConfigError as error:
+    sys.exit(str(error))
+
+
+def open_db():
+    from .control_db import DataBase
+    config = get_config()
+    db = DataBase(
+        config.open, config.close, args.db, config.date_storage, court=getattr(args, 'court', DEFAULT_COURT)
+    )
+    try:
+        db.set_db()
+    except ValueError as error:
+        # an unknown --court
+        parser.error(f"{args.command}: {error}")
+    return db
+
+
+def read_batch(args, fields, file):
+    from .cli import read_lines
+    if args.name:
+        if not args.start:
+            parser.error(f"{args.command}: the start date is missing")
+        return [(1, {field: getattr(args, field) for field in fields})]
+    return read_lines(file)
+
+
+def parse_day(text):
+    try:
+        return datetime.strptime(text, "%d.%m.%Y")
+    except ValueError:
+        parser.error(f"{args.command}: the date should be DD.MM.YYYY, not {text!r}")
+
+
+# the modules of a command are imported only when it runs
+if args.command == 'serve':
+    from .server import run_server
+    run_server(args.host, args.port, args.db, args.pool_size, args.max_sessions)
+elif args.command == 'import':
+    from .importer import import_file
+    db = open_db()
+    try:
+        summary = import_file(db, args.path, args.year)
+    except (OSError, ValueError) as error:
+        # a missing file, a wrong CSV header or broken JSON; the batches loaded before it stay in the database
+        parser.error(f"import: {args.path}: {error}")
+    finally:
+        db.close()
+    print(json.dumps(summary))
+elif args.command in ('book', 'cancel'):
+    from . import cli
+    fields = ('name', 'start', 'minutes') if args.command == 'book' else ('name', 'start')
+    if args.name or args.file == '-':
+        source = nullcontext(sys.stdin)
+    else:
+        try:
+            source = open(args.file, encoding='utf8')
+        except OSError as error:
+            parser.error(f"{args.command}: cannot read {args.file}: {error.strerror}")
+    with source as file:
+        lines = read_batch(args, fields, file)
+        db = open_db()
+        getattr(cli, args.command)(db, lines, sys.stdout)
+        db.close()
+elif args.command == 'series':
+    from . import cli
+    if not args.cancel and not args.until:
+        parser.error("series: --until is required")
+    item = {'name': args.name, 'start': args.start, 'minutes': args.minutes}
+    db = open_db()
+    if args.cancel:
+        cli.cancel_series(db, item, sys.stdout)
+    else:
+        cli.series(db, item, args.until, sys.stdout)
+    db.close()
+elif args.command == 'schedule':
+    from .cli import schedule
+    from_date, to_date = sorted((parse_day(args.from_date), parse_day(args.to_date)))
+    db = open_db()
+    schedule(db, from_date, to_date, sys.stdout)
+    db.close()
+elif args.command == 'export':
+    from .control_db import SAVE_DIRECTORY
+    from_date, to_date = sorted((parse_day(args.from_date), parse_day(args.to_date)))
+    db = open_db()
+    path = db.save_to_file(
+        from_date, to_date, '1' if args.format == 'json' else '2', args.gzip, args.dir or SAVE_DIRECTORY
+    )
+    print(json.dumps({'path': path}))
+    db.close()
+elif args.command == 'archive':
+    db = open_db()
+    print(json.dumps({'archived': db.archive(args.days)}))
+    db.close()
+else:
+    from .app import TennisCourtApp
+    TennisCourtApp().run()
@@ -1,21 +1,29 @@
-import os
-import sys
+import time
 import functools
 from datetime import datetime, timedelta
 
+from .config import get_config, DEFAULT_PATH_DB
 from .control_db import DataBase
-from dotenv.main import load_dotenv
+from .metrics import (
+    Metrics, MetricsWriter, DEFAULT_METRICS_INTERVAL, ACTIONS_TOTAL, ACTION_SECONDS, OUTCOMES_TOTAL
+)
 
-load_dotenv()
 
-try:
-    OPEN = os.environ['OPEN']
-    CLOSE = os.environ['CLOSE']
+def make_profiler(config=None):
+    config = config or get_config()
+    if config.query_profile or config.slow_query_log:
+        # the profiler is imported only when it is enabled
+        from .profiler import QueryProfiler, DEFAULT_SLOW_QUERY_MS
+        slow_query_ms = DEFAULT_SLOW_QUERY_MS if config.slow_query_ms is None else config.slow_query_ms
+        return QueryProfiler(slow_query_ms, config.slow_query_log)
 
-except Exception:
-    sys.exit()
 
-DEFAULT_PATH_DB = os.path.join('src', 'tennis_court', 'db', 'tennis_court.db')
+def make_metrics_writer(metrics, config=None):
+    config = config or get_config()
+    if config.metrics_file:
+        interval = DEFAULT_METRICS_INTERVAL if config.metrics_interval is None else config.metrics_interval
+        return MetricsWriter(metrics, config.metrics_file, interval).start()
+
 
 MENU = """
 What do you want to do? Choose number: \n 
@@ -28,12 +36,37 @@ What do you want to do? Choose number: \n
 
 class TennisCourtApp:
 
-    def __init__(self, path_db=DEFAULT_PATH_DB, io=(input, functools.partial(print, end=""))):
-        self._in, self._out = io
+    def __init__(
+        self, path_db=DEFAULT_PATH_DB, io=(input, functools.partial(print, end="")), db=None, metrics=None
+    ):
+        self._read, self._out = io
+        # seconds spent waiting for the user, not counted in the duration of the menu actions
+        self._waiting = 0.0
+        # shared by the sessions of a server, see metrics.py
+        self._metrics = metrics if metrics is not None else Metrics()
         self.path_db = path_db
-        self._db = None
+        # a DataBase shared with other sessions is neither opened nor closed by the app
+        self._db = db
+        self._own_db = db is None
         self._quit = False
 
+    def _in(self):
+        start = time.perf_counter()
+        try:
+            return self._read()
+        finally:
+            self._waiting += time.perf_counter() - start
+
+    def _run_action(self, name, action):
+        """
+        The function runs a menu action and records its count and duration without the user's time.
+        """
+        self._waiting = 0.0
+        start = time.perf_counter()
+        action()
+        self._metrics.inc(ACTIONS_TOTAL, action=name)
+        self._metrics.observe(ACTION_SECONDS, time.perf_counter() - start - self._waiting, action=name)
+
     def _check_response(self, response, possibility):
 
         if response.lower().strip() == 'quit':  return 'quit'
@@ -77,24 +110,30 @@ class TennisCourtApp:
         if not only_date and correct_date.minute not in [0, 30]:
             return
 
-        # change format date
+        # only date: the day starts when the court opens
         if only_date:
-            response = f"{correct_date.year}-{correct_date.month:0>2}-{correct_date.day:0>2} " \
-                       f"{OPEN}"
-        else:
-            response = f"{correct_date.year}-{correct_date.month:0>2}-{correct_date.day:0>2} " \
-                   f"{correct_date.hour:0>2}:{correct_date.minute:0>2}"
+            open_hour, open_minute = self._db.open_hour.split(':')
+            return correct_date.replace(hour=int(open_hour), minute=int(open_minute))
 
-        return datetime.strptime(response, "%Y-%m-%d %H:%M")
+        return correct_date
 
     def exit(self):
         self._quit = True
+        # a shared DataBase is reported by its owner
+        if self._own_db and self._db.profiler and get_config().query_profile:
+            self._db.profiler.dump(get_config().query_profile)
 
     def run(self):
 
         # open database
-        self._db = DataBase(OPEN, CLOSE, self.path_db)
-        self._db.set_db()
+        if self._own_db:
+            config = get_config()
+            self._db = DataBase(
+                config.open, config.close, self.path_db, config.date_storage, profiler=make_profiler(config)
+            )
+            self._db.set_db()
+
+        writer = make_metrics_writer(self._metrics) if self._own_db else None
 
         self._out(MENU)
 
@@ -104,13 +143,13 @@ class TennisCourtApp:
             response = self._in()
             match self._check_response(response, list('12345')):
                 case '1':
-                    self.make_reservation()
+                    self._run_action('make', self.make_reservation)
                 case '2':
-                    self.cancel_reservation()
+                    self._run_action('cancel', self.cancel_reservation)
                 case '3':
-                    self.print_schedule()
+                    self._run_action('print', self.print_schedule)
                 case '4':
-                    self.save_schedule()
+                    self._run_action('save', self.save_schedule)
                 case '5':
                     self.exit()
                     continue
@@ -122,7 +161,10 @@ class TennisCourtApp:
             self._out(MENU)
 
         self._out('See you soon!\n')
-        self._db.close()
+        if writer:
+            writer.stop()
+        if self._own_db:
+            self._db.close()
 
     def make_reservation(self):
 
@@ -167,6 +209,7 @@ class TennisCourtApp:
 
             # check conditionals
             if not self._db.has_permission_can_reservation(first_name, last_name):
+                self._metrics.inc(OUTCOMES_TOTAL, outcome='quota')
                 self._out("User cannot have more than 2 reservations in the current week.\n")
                 break
             elif not self._db.has_permission_date(reservation_date):
@@ -175,22 +218,26 @@ class TennisCourtApp:
 
             # check availability
             if not self._db.check_availability_court(reservation_date):
-                reservation_date = self._db.suggest_new_date(reservation_date)
+                chosen_date, reservation_date = reservation_date, self._db.suggest_new_date(reservation_date)
                 if not reservation_date:
                     self._out("All hours are occupied on this day. Choose different date.\n")
-                    reservation_date = None
-                    continue
+                    reservation_date = self._choose_free_slot(chosen_date)
+                    if not reservation_date:
+                        self._offer_waitlist(first_name, last_name, chosen_date)
+                        continue
                 else:
                     self._out("The time you chose is unavailable, "
                               f"would you like to make a reservation for {reservation_date.time()} instead? (yes/no)\n")
                     response = self._in()
                     if self._check_response(response, ['yes', 'y', 'no', 'n']) and response.lower() in ['no', 'n']:
+                        self._metrics.inc(OUTCOMES_TOTAL, outcome='suggestion_declined')
                         reservation_date = None
                         continue
+                    self._metrics.inc(OUTCOMES_TOTAL, outcome='suggestion_accepted')
 
             reservation_options = self._db.check_reservation_options(reservation_date)
             if not reservation_options:
-                self._out(f"You chose probably invalid date. Make sure that your hour is between: {OPEN} - {CLOSE}\n")
+                self._out(f"You chose probably invalid date. Make sure that your hour is between: {self._db.open_hour} - {self._db.close_hour}\n")
                 reservation_date = None
                 continue
 
@@ -206,8 +253,64 @@ class TennisCourtApp:
                 continue
             end_date = reservation_date + timedelta(minutes=[30,60,90][int(response)-1])
         else:
-            self._db.add(first_name, last_name, reservation_date, end_date)
-            self._out(f"Add reservation: {reservation_date}\n")
+            booking = self._db.book(first_name, last_name, reservation_date, end_date)
+            self._metrics.inc(OUTCOMES_TOTAL, outcome='booked' if booking.booked else booking.reason)
+            if booking.booked:
+                self._out(f"Add reservation: {reservation_date}\n")
+            elif booking.reason == 'quota':
+                self._out("User cannot have more than 2 reservations in the current week.\n")
+            else:
+                self._out("Somebody has just booked this time. Choose different date.\n")
+
+    def _choose_free_slot(self, date):
+        """
+        The function offers the next free dates after a full day and returns the chosen one or None.
+        """
+        slots = self._db.find_free_slots(date)
+        if not slots:
+            return
+        self._out(
+            "The nearest free dates are:\n"
+            + ''.join(f"[{index + 1}] {slot:%d.%m.%Y %H:%M}\n" for index, slot in enumerate(slots))
+            + "Choose a number or press enter to choose a different date.\n"
+        )
+        response = self._in()
+        if self._check_response(response, [str(i) for i in range(1, len(slots) + 1)]) in (None, 'quit'):
+            self._metrics.inc(OUTCOMES_TOTAL, outcome='free_slot_declined')
+            return
+        self._metrics.inc(OUTCOMES_TOTAL, outcome='free_slot_accepted')
+        return slots[int(response) - 1]
+
+    def _offer_waitlist(self, first_name, last_name, date):
+        """
+        The function offers the waitlist of the chosen date after a full day,
+        the user gets the reservation when somebody cancels it. Only the lengths ending by the closing hour are offered.
+        join_waitlist refuses a date outside of the opening hours or in the past as well, the message tells which.
+        """
+        open_court = datetime.combine(date.date(), datetime.strptime(self._db.open_hour, "%H:%M").time())
+        close_court = datetime.combine(date.date(), datetime.strptime(self._db.close_hour, "%H:%M").time())
+        options = [minutes for minutes in [30, 60, 90] if date + timedelta(minutes=minutes) <= close_court]
+        if date < open_court or not options:
+            self._out(f"The waiting list is only for the hours between {self._db.open_hour} - {self._db.close_hour}.\n")
+            return
+
+        self._out(
+            f"Would you like to wait for {date:%d.%m.%Y %H:%M}? You get the court if somebody cancels.\n"
+            + ''.join(f"[{index + 1}] {minutes} minutes\n" for index, minutes in enumerate(options))
+            + "Choose a number or press enter to choose a different date.\n"
+        )
+        response = self._in()
+        if self._check_response(response, [str(i) for i in range(1, len(options) + 1)]) in (None, 'quit'):
+            return
+        end_date = date + timedelta(minutes=options[int(response) - 1])
+        if self._db.join_waitlist(first_name, last_name, date, end_date):
+            self._metrics.inc(OUTCOMES_TOTAL, outcome='waitlisted')
+            self._out(f"You are on the waiting list for {date:%d.%m.%Y %H:%M}.\n")
+        elif date <= self._db.get_current_date:
+            # the date passed while the user was choosing
+            self._out(f"The date {date:%d.%m.%Y %H:%M} has already passed.\n")
+        else:
+            self._out(f"You are already on the waiting list for {date:%d.%m.%Y %H:%M}.\n")
 
     def cancel_reservation(self):
 
@@ -253,6 +356,7 @@ class TennisCourtApp:
                 self._out("The date must be at least an hour later than the current date.\n")
         else:
             is_cancel = self._db.cancel(first_name, last_name, start_date)
+            self._metrics.inc(OUTCOMES_TOTAL, outcome='cancelled' if is_cancel else 'cancel_not_found')
             if not is_cancel:
                 self._out("You have provided incorrect data.\n")
             else:
@@ -0,0 +1,202 @@
+"""
+Non-interactive commands of `python -m tennis_court` for scripts.
+
+book and cancel take one reservation from the arguments or a batch of JSON lines from a file or stdin:
+    {"name": "Jan Kowalski", "start": "13.05.2030 10:00", "minutes": 60}
+    {"name": "Jan Kowalski", "start": "13.05.2030 10:00"}
+and write one JSON line for every input line, in the same order. A batch is checked with the rules
+of the menu and booked or cancelled BATCH_SIZE reservations per transaction.
+series books or cancels one weekly series and writes one JSON line.
+schedule writes one JSON line for every reservation, export writes a file and prints its path.
+"""
+import json
+from datetime import datetime, timedelta
+
+from .importer import parse_date
+
+BATCH_SIZE = 1000
+DURATIONS = (30, 60, 90)
+
+
+class InvalidLine(ValueError):
+    pass
+
+
+def read_lines(file):
+    """
+    The function yields (line number, object) for every non-empty JSON line, a line which cannot be read
+    is yielded as an InvalidLine.
+    """
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("a line should be a JSON object")
+            yield number, item
+        except ValueError as error:
+            yield number, InvalidLine(str(error))
+
+
+def parse_name(name):
+    # the same rule as the menu: a first name and a last name, letters only
+    parts = str(name).title().split()
+    if len(parts) != 2 or not all(part.isalpha() for part in parts):
+        raise InvalidLine("the name should consist of a first name and a last name, letters only")
+    return parts[0], parts[1]
+
+
+def parse_start(db, text):
+    try:
+        start_date = parse_date(str(text))
+    except ValueError:
+        raise InvalidLine("the date should be DD.MM.YYYY HH:MM")
+    if start_date.minute not in (0, 30):
+        raise InvalidLine("reservations can only be made on the hour or half-hour")
+    if not db.has_permission_date(start_date):
+        raise InvalidLine("the date must be at least an hour later than the current date and within two weeks")
+    return start_date
+
+
+def parse_booking(db, item):
+    first_name, last_name = parse_name(item.get('name'))
+    start_date = parse_start(db, item.get('start'))
+    minutes = item.get('minutes', DURATIONS[0])
+    if minutes not in DURATIONS:
+        raise InvalidLine(f"minutes should be one of {', '.join(map(str, DURATIONS))}")
+    end_date = start_date + timedelta(minutes=minutes)
+
+    open_court = datetime.combine(start_date.date(), datetime.strptime(db.open_hour, "%H:%M").time())
+    close_court = datetime.combine(start_date.date(), datetime.strptime(db.close_hour, "%H:%M").time())
+    if start_date < open_court or end_date > close_court:
+        raise InvalidLine(f"the reservation should be between {db.open_hour} - {db.close_hour}")
+    return first_name, last_name, start_date, end_date
+
+
+def parse_cancel(db, item):
+    first_name, last_name = parse_name(item.get('name'))
+    try:
+        start_date = parse_date(str(item.get('start')))
+    except ValueError:
+        raise InvalidLine("the date should be DD.MM.YYYY HH:MM")
+    return first_name, last_name, start_date
+
+
+def parse_until(text):
+    try:
+        day = datetime.strptime(str(text), "%d.%m.%Y")
+    except ValueError:
+        raise InvalidLine("the last day should be DD.MM.YYYY")
+    # an occurrence on the last day is still booked
+    return day.replace(hour=23, minute=59)
+
+
+def format_date(date):
+    return date.isoformat(timespec='minutes')
+
+
+def _run_batches(db, lines, parse, run, output):
+    """
+    The function parses the lines, runs the valid ones BATCH_SIZE at a time and writes a result for every line.
+    """
+    pending = []
+
+    def flush():
+        valid = [(number, parsed) for number, parsed in pending if not isinstance(parsed, InvalidLine)]
+        results = iter(run([parsed for _, parsed in valid]))
+        for number, parsed in pending:
+            if isinstance(parsed, InvalidLine):
+                result = {'status': 'invalid', 'error': str(parsed)}
+            else:
+                result = next(results)
+            output.write(json.dumps({'line': number, **result}, ensure_ascii=False) + '\n')
+        pending.clear()
+
+    for number, item in lines:
+        if not isinstance(item, InvalidLine):
+            try:
+                item = parse(db, item)
+            except InvalidLine as error:
+                item = error
+        pending.append((number, item))
+        if len(pending) >= BATCH_SIZE:
+            flush()
+    flush()
+
+
+def _booking_result(reservation, booking):
+    first_name, last_name, start_date, end_date = reservation
+    result = {
+        'status': 'booked' if booking.booked else booking.reason,
+        'name': f"{first_name} {last_name}",
+        'start': format_date(start_date),
+        'end': format_date(end_date),
+    }
+    if booking.conflict:
+        result['conflict'] = {
+            'name': f"{booking.conflict[0]} {booking.conflict[1]}",
+            'start': format_date(booking.conflict[2]),
+            'end': format_date(booking.conflict[3]),
+        }
+    return result
+
+
+def book(db, lines, output):
+    def run(reservations):
+        for reservation, booking in zip(reservations, db.book_many(reservations)):
+            yield _booking_result(reservation, booking)
+
+    _run_batches(db, lines, parse_booking, run, output)
+
+
+def cancel(db, lines, output):
+    def run(reservations):
+        for (first_name, last_name, start_date), cancelled in zip(reservations, db.cancel_many(reservations)):
+            yield {
+                'status': 'cancelled' if cancelled else 'not_found',
+                'name': f"{first_name} {last_name}",
+                'start': format_date(start_date),
+            }
+
+    _run_batches(db, lines, parse_cancel, run, output)
+
+
+def series(db, item, until, output):
+    """
+    The function books the reservation of the item every week up to the day until (DD.MM.YYYY).
+    """
+    try:
+        reservation = parse_booking(db, item)
+        until = parse_until(until)
+    except InvalidLine as error:
+        result = {'status': 'invalid', 'error': str(error)}
+    else:
+        result = _booking_result(reservation, db.add_series(*reservation, until))
+        result['until'] = until.date().isoformat()
+    output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def cancel_series(db, item, output):
+    try:
+        first_name, last_name, start_date = parse_cancel(db, item)
+    except InvalidLine as error:
+        result = {'status': 'invalid', 'error': str(error)}
+    else:
+        result = {
+            'status': 'cancelled' if db.cancel_series(first_name, last_name, start_date) else 'not_found',
+            'name': f"{first_name} {last_name}",
+            'start': format_date(start_date),
+        }
+    output.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def schedule(db, from_date, to_date, output):
+    for day, reservations in db.take_schedule_days(from_date, to_date):
+        for _, first_name, last_name, start_date, end_date in reservations:
+            output.write(json.dumps({
+                'day': day.isoformat(),
+                'name': f"{first_name} {last_name}",
+                'start': format_date(start_date),
+                'end': format_date(end_date),
+            }, ensure_ascii=False) + '\n')
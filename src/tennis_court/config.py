@@ -0,0 +1,119 @@
+"""
+Configuration of the application, read once when it is first needed.
+
+The settings come from the environment and from the .env file found from the package directory upwards,
+the environment wins. Parsing the .env file needs python-dotenv, which is imported only when the file
+has to be parsed: with CONFIG_CACHE set to a path, the parsed values are kept there as JSON and reused
+as long as the .env file keeps its size and modification time.
+"""
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+DEFAULT_PATH_DB = os.path.join('src', 'tennis_court', 'db', 'tennis_court.db')
+ENV_FILE = '.env'
+
+
+class ConfigError(Exception):
+    pass
+
+
+class Config(NamedTuple):
+    open: str
+    close: str
+    # 'text' or 'minutes', see date_storage.py
+    date_storage: str = None
+    # query profiling, see profiler.py: the file of the report written on exit ('-' - standard error)
+    # and the file the statements slower than slow_query_ms milliseconds are appended to
+    query_profile: str = None
+    slow_query_log: str = None
+    slow_query_ms: float = None
+    # Prometheus textfile with the metrics of the menu, see metrics.py
+    metrics_file: str = None
+    metrics_interval: float = None
+
+
+def find_env_file(directory=os.path.dirname(os.path.abspath(__file__))):
+    while True:
+        path = os.path.join(directory, ENV_FILE)
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def read_env_file(path, cache_file=None):
+    """
+    The function returns the values of the .env file, from cache_file when it was written for the same file.
+    """
+    # json is imported here, the application does not need it otherwise
+    import json
+    stat = os.stat(path)
+    key = [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+    if cache_file:
+        try:
+            with open(cache_file, encoding='utf8') as file:
+                cached = json.load(file)
+            if cached['key'] == key:
+                return cached['values']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    from dotenv import dotenv_values
+    values = {name: value for name, value in dotenv_values(path).items() if value is not None}
+    if cache_file:
+        from .export import open_atomic
+        try:
+            with open_atomic(cache_file) as file:
+                json.dump({'key': key, 'values': values}, file)
+        except OSError:
+            # the cache only saves time, the configuration is read without it
+            pass
+    return values
+
+
+def _number(values, name):
+    if values.get(name) is None:
+        return None
+    try:
+        return float(values[name])
+    except ValueError:
+        raise ConfigError(f"{name} should be a number, not {values[name]!r}")
+
+
+def load_config(environ=None, env_file=None, cache_file=None):
+    """
+    The function reads the configuration, env_file and cache_file default to the .env file of the package
+    and the CONFIG_CACHE variable.
+    """
+    environ = os.environ if environ is None else environ
+    env_file = env_file or find_env_file()
+    cache_file = cache_file or environ.get('CONFIG_CACHE')
+
+    values = read_env_file(env_file, cache_file) if env_file else {}
+    values.update(environ)
+    if not values.get('OPEN') or not values.get('CLOSE'):
+        raise ConfigError(
+            "The opening hours are not set: OPEN and CLOSE (e.g. OPEN=9:00, CLOSE=21:00) "
+            "should be in the environment or in the .env file."
+        )
+    return Config(
+        open=values['OPEN'],
+        close=values['CLOSE'],
+        date_storage=values.get('DATE_STORAGE'),
+        query_profile=values.get('QUERY_PROFILE'),
+        slow_query_log=values.get('SLOW_QUERY_LOG'),
+        slow_query_ms=_number(values, 'SLOW_QUERY_MS'),
+        metrics_file=values.get('METRICS_FILE'),
+        metrics_interval=_number(values, 'METRICS_INTERVAL'),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_config():
+    """
+    The function returns the configuration of the process, it is read on the first call.
+    """
+    return load_config()
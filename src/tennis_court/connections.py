@@ -0,0 +1,122 @@
+"""
+Connections used by DataBase.
+
+SingleConnection is the default: one connection and one cursor, used by one thread.
+ConnectionPool lets many threads share one DataBase:
+
+* every thread gets its own connection and cursor for the availability queries,
+* schedule queries borrow one of a bounded number of read-only connections,
+* all writes go through a single writer connection, one at a time.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# the default of sqlite3.connect is 128; DataBase has a dozen statements (queries.py) per connection,
+# the larger cache leaves room for the statements of migrations and ad hoc queries
+CACHED_STATEMENTS = 256
+
+
+class SingleConnection:
+
+    def __init__(self, db_path, cached_statements=CACHED_STATEMENTS, factory=sqlite3.Connection):
+        self._db = sqlite3.connect(db_path, cached_statements=cached_statements, factory=factory)
+        self._cursor = self._db.cursor()
+
+    def connection(self):
+        return self._db
+
+    def cursor(self):
+        return self._cursor
+
+    @contextmanager
+    def reading(self):
+        yield self._db
+
+    @contextmanager
+    def writing(self):
+        yield self._db
+
+    def close(self):
+        self._db.close()
+
+
+class ConnectionPool:
+
+    def __init__(
+        self, db_path, readers=4, timeout=5.0, cached_statements=CACHED_STATEMENTS, factory=sqlite3.Connection
+    ):
+        if db_path == ':memory:':
+            raise ValueError("A connection pool needs a database file, not ':memory:'.")
+
+        self.db_path = db_path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        # e.g. ProfiledConnection, see profiler.py
+        self.factory = factory
+        self._writer = self._connect(db_path)
+        self._write_lock = threading.RLock()
+
+        self._local = threading.local()
+        self._opened = []
+        self._opened_lock = threading.Lock()
+
+        self._readers = queue.LifoQueue(maxsize=readers)
+        self._readers_left = readers
+        self._readers_lock = threading.Lock()
+
+    def _connect(self, database, uri=False):
+        # connections are closed by the thread which closes the pool
+        return sqlite3.connect(
+            database, timeout=self.timeout, uri=uri, check_same_thread=False,
+            cached_statements=self.cached_statements, factory=self.factory
+        )
+
+    def connection(self):
+        """
+        The function returns the connection of the current thread, it is created on first use.
+        """
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = self._connect(self.db_path)
+            self._local.cursor = db.cursor()
+            with self._opened_lock:
+                self._opened.append(db)
+        return db
+
+    def cursor(self):
+        self.connection()
+        return self._local.cursor
+
+    @contextmanager
+    def reading(self):
+        """
+        The function lends a read-only connection, waiting when all of them are in use.
+        """
+        with self._readers_lock:
+            create = self._readers.empty() and self._readers_left > 0
+            if create:
+                self._readers_left -= 1
+        if create:
+            db = self._connect(f"file:{self.db_path}?mode=ro", uri=True)
+            with self._opened_lock:
+                self._opened.append(db)
+        else:
+            db = self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put(db)
+
+    @contextmanager
+    def writing(self):
+        with self._write_lock:
+            yield self._writer
+
+    def close(self):
+        with self._opened_lock:
+            for db in self._opened:
+                db.close()
+            self._opened.clear()
+        self._writer.close()
@@ -1,71 +1,369 @@
-import sqlite3
 from datetime import datetime, timedelta
 import os
-import json
-import csv
+import sqlite3
+import threading
+from bisect import bisect_right
+from collections import Counter
+from operator import itemgetter
+from typing import NamedTuple
+
+from .migrations import migrate, DEFAULT_COURT
+from .date_storage import get_date_storage, read_date_storage, convert_date_storage
+from .slot_index import SlotIndex, SLOT, WINDOW_DAYS
+from .connections import SingleConnection, ConnectionPool, CACHED_STATEMENTS
+from .day_cache import DayCache, DAY_CACHE_SIZE, day_period
+from .counters import week_of, check_counters, rebuild_counters
+from .series import occurrences, to_text, from_text
+from . import queries
+
+# rows fetched at once by the exports
+EXPORT_BATCH_SIZE = 1000
+SAVE_DIRECTORY = os.path.join('src', 'tennis_court', 'save')
+# reservations of a user in the coming week
+WEEK_QUOTA = 2
+# reservations ended more than ARCHIVE_AFTER_DAYS ago are moved to the archive by DataBase.archive,
+# ARCHIVE_BATCH_SIZE of them per transaction
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_BATCH_SIZE = 10000
+# free dates offered when the chosen day is full
+FREE_SLOTS = 5
+# a reservation fits between the opening hours; the overlap queries rely on it (queries.py)
+LONGEST_RESERVATION = timedelta(days=1)
 
 def convert_date_to_str(date, format="%Y-%m-%d %H:%M"):
     return date.strftime(format)
 
-def change_date_format(date: str, only_hour=False) -> str:
-    if only_hour:
+def change_date_format(date, only_hour=False) -> str:
+    if isinstance(date, str):
         date = datetime.strptime(date, "%Y-%m-%d %H:%M")
-        return f"{date.hour:0>2}:{date.minute:0>2}"
 
-    date = datetime.strptime(date, "%Y-%m-%d %H:%M")
+    if only_hour:
+        return f"{date.hour:0>2}:{date.minute:0>2}"
     return f"{date.day:0>2}.{date.month:0>2}.{date.year} {date.hour:0>2}:{date.minute:0>2}"
 
+def find_conflicts(periods, dates):
+    """
+    The function returns the reservation overlapping each of the sorted (start_date, end_date) dates or None,
+    the periods are the sorted, disjoint ones of DataBase._take_stored_periods.
+    """
+    conflicts = []
+    position = 0
+    for start_date, end_date in dates:
+        while position < len(periods) and periods[position][1] <= start_date:
+            position += 1
+        conflicts.append(periods[position][2] if position < len(periods) and periods[position][0] < end_date else None)
+    return conflicts
+
+class Booking(NamedTuple):
+    """
+    The result of DataBase.book. On failure reason is 'quota' or 'conflict',
+    for a conflict the overlapping reservation is given as (first_name, last_name, start_date, end_date).
+    """
+    booked: bool
+    reason: str = None
+    conflict: tuple = None
+
+
+class CourtSlot(NamedTuple):
+    """
+    The result of DataBase.find_court, the earliest start of the requested length and the court it is free on.
+    """
+    start: datetime
+    court: int
+    name: str
+
+
 class DataBase:
 
-    def __init__(self, open_hour, close_hour, db_path):
+    def __init__(
+        self, open_hour, close_hour, db_path, date_storage=None, pool_size=None,
+        cached_statements=CACHED_STATEMENTS, day_cache_size=DAY_CACHE_SIZE, profiler=None, court=DEFAULT_COURT
+    ):
 
         self.db_path = db_path
-        self._db = None
-        self._cursor = None
+        # prepared statements kept by every connection, see queries.py
+        self.cached_statements = cached_statements
+        # QueryProfiler timing the statements and the calls, see profiler.py
+        self.profiler = profiler
+        # pool_size read-only connections for schedules, see connections.py; None - one connection
+        self.pool_size = pool_size
+        self._connections = None
+        # None keeps the storage the database was created with
+        self.date_storage = date_storage
+        self._dates = None
+        # occupancy of the booking window, see slot_index.py
+        self._slots = None
+        # reservations of the recently used days, see day_cache.py
+        self._days = DayCache(day_cache_size)
+        # (data_version, total_changes) the slot index and the cached days are valid for
+        self._data_state = None
+        # guards _data_state, _slots and the days put into _days; it is taken inside the writer, never around it
+        self._state_lock = threading.Lock()
+        # the reservations ended before it are in reservations_archive, None - nothing archived
+        self._archived_before = None
+        # the occurrences of the series starting before it are reservations, see series.py
+        self._series_until = None
+        # called with the (first_name, last_name, start_date, end_date, court) bookings of the waitlist
+        # made by a cancel, after it commits
+        self.on_promote = None
 
         self.open_hour = open_hour
         self.close_hour = close_hour
+        # the court whose availability, schedule and cancellations the methods handle by default,
+        # find_court searches all courts
+        self.court = court
+        # ids of the courts, read by set_db and again when an unknown id is given
+        self._court_ids = set()
 
     @property
     def get_current_date(self):
         return datetime.today()
 
+    @property
+    def _db(self):
+        # the connection of the current thread
+        return self._connections.connection()
+
+    @property
+    def _cursor(self):
+        return self._connections.cursor()
+
     def set_db(self):
         """
         The function connects to the database or create the one and sets up the cursor.
+        An existing database is upgraded to the current schema version
+        and its dates are converted when a different date storage is requested.
         """
-        self._db = sqlite3.connect(self.db_path)
-        self._cursor = self._db.cursor()
-
-        self._cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS reservations (
-            id INTEGER PRIMARY KEY,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            start_date DATETIME NOT NULL,
-            end_date NOT NULL
+        factory = self.profiler.connection_factory() if self.profiler else sqlite3.Connection
+        if self.pool_size:
+            self._connections = ConnectionPool(
+                self.db_path, self.pool_size, cached_statements=self.cached_statements, factory=factory
             )
-            """
+        else:
+            self._connections = SingleConnection(self.db_path, self.cached_statements, factory)
+        if self.profiler:
+            self.profiler.watch(self)
+
+        with self._connections.writing() as db:
+            # readers do not block the writer of a booking transaction
+            db.execute("PRAGMA journal_mode=WAL")
+
+            migrate(db)
+            if self.date_storage:
+                self._dates = convert_date_storage(db, get_date_storage(self.date_storage))
+            else:
+                self._dates = read_date_storage(db)
+
+            self._court_ids = {court for court, _ in db.execute(queries.SELECT_COURTS)}
+            if self.court not in self._court_ids:
+                raise ValueError(f"There is no court {self.court}.")
+            self._sync_state(db)
+            self._slots = self._build_slot_index(db, SlotIndex.window_start(self.get_current_date))
+
+    def _sync_state(self, db):
+        """
+        The function drops the slot index and the cached days when the database has been changed
+        by another connection (data_version) or past DataBase on the writer connection (total_changes).
+        The series are expanded into the booking window first, the reservations they add drop them as well.
+        It returns the data state the caches are valid for.
+        """
+        self._expand_series(db)
+        state = (db.execute(queries.DATA_VERSION).fetchone()[0], db.total_changes)
+        with self._state_lock:
+            if state != self._data_state:
+                self._data_state = state
+                self._slots = None
+                self._days.clear()
+                self._archived_before = self._read_archived_before(db)
+            return self._data_state
+
+    def _take_state(self):
+        """
+        The function syncs the caches under the writer and returns their data state. The queries loading
+        a cache miss run on the connection of the thread afterwards, so a lookup holds the writer only for the check.
+        """
+        with self._connections.writing() as db:
+            return self._sync_state(db)
+
+    def _read_archived_before(self, db):
+        res = db.execute(queries.SELECT_SETTING, ('archived_before',)).fetchone()
+        return datetime.fromisoformat(res[0]) if res else None
+
+    def _spans_archive(self, from_date, archived_before):
+        return archived_before is not None and from_date < archived_before
+
+    def _expand_series(self, db):
+        """
+        The function adds the occurrences of the series starting before the end of the booking window
+        as reservations, once a day. An occurrence overlapping a reservation is skipped.
+        """
+        until = SlotIndex.window_start(self.get_current_date) + timedelta(days=WINDOW_DAYS)
+        if self._series_until == until:
+            return
+
+        cursor = db.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            rules = cursor.execute(queries.SELECT_SERIES_TO_EXPAND, (to_text(until),)).fetchall()
+            for id_, first_name, last_name, court, start_date, end_date, until_date, expanded_until in rules:
+                expanded_until = from_text(expanded_until)
+                dates = [
+                    (start, end) for start, end in occurrences(
+                        from_text(start_date), from_text(end_date), from_text(until_date), expanded_until, until
+                    ) if start >= expanded_until
+                ]
+                if dates:
+                    periods = self._take_stored_periods(cursor, dates[0][0], dates[-1][1], court, with_series=False)
+                    cursor.executemany(
+                        queries.INSERT_RESERVATION,
+                        (
+                            (first_name, last_name, self._dates.encode(start), self._dates.encode(end), court)
+                            for (start, end), conflict in zip(dates, find_conflicts(periods, dates)) if not conflict
+                        )
+                    )
+                cursor.execute(queries.SET_SERIES_EXPANDED, (to_text(until), id_))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self._series_until = until
+
+    def _mark_written(self, db):
+        # the writes of DataBase update the slot index and the cached days themselves
+        with self._state_lock:
+            self._data_state = (self._data_state[0], db.total_changes)
+
+    def _build_slot_index(self, db, window_start):
+        """
+        The function returns a slot index of the booking window from window_start with its reservations loaded.
+        """
+        slots = SlotIndex(window_start)
+        self._fill_slot_index(db, slots, slots.start, slots.end)
+        return slots
+
+    def _overlap_dates(self, from_date, to_date):
+        # (to_date, earliest start, from_date) of the statements selecting the reservations overlapping a period
+        encode = self._dates.encode
+        return encode(to_date), encode(from_date - LONGEST_RESERVATION), encode(from_date)
+
+    def _fill_slot_index(self, db, slots, from_date, to_date):
+        rows = db.execute(queries.SELECT_PERIODS, (*self._overlap_dates(from_date, to_date), self.court))
+        for start_date, end_date in rows:
+            slots.fill(self._dates.decode(start_date), self._dates.decode(end_date))
+
+    def _take_slot_index(self, date):
+        """
+        The function returns the slot index if it can answer for the date, otherwise None.
+        The index is rebuilt on a new day or when another process has written to the database.
+        """
+        window_start = SlotIndex.window_start(self.get_current_date)
+        if not SlotIndex.is_aligned(date) or not window_start <= date < window_start + timedelta(days=WINDOW_DAYS):
+            return
+
+        # all writes of this process go through the writer, which keeps the index up to date
+        state = self._take_state()
+        with self._state_lock:
+            if self._slots is not None and self._slots.start == window_start:
+                return self._slots
+
+        slots = self._build_slot_index(self._db, window_start)
+        with self._state_lock:
+            # a write since the state was taken did not update the new index, so it answers only this call
+            if self._data_state == state:
+                self._slots = slots
+        return slots
+
+    def _take_days(self, first_day, last_day):
+        """
+        The function returns {day: reservations starting on the day} from first_day to last_day.
+        The days missing in the day cache are loaded with one range query,
+        the reservations are (id, first_name, last_name, start_date, end_date) with datetimes.
+        """
+        state = self._take_state()
+        days = {}
+        missing = []
+        day = first_day
+        while day <= last_day:
+            reservations = self._days.get(day)
+            if reservations is None:
+                missing.append(day)
+            else:
+                days[day] = reservations
+            day += timedelta(days=1)
+        if not missing:
+            return days
+
+        loaded = {}
+        day = missing[0]
+        while day <= missing[-1]:
+            loaded[day] = []
+            day += timedelta(days=1)
+        decode = self._dates.decode
+        from_date, to_date = day_period(missing[0])[0], day_period(missing[-1])[1]
+        db = self._db
+        # the connection of the thread is not synced, so the boundary is read with the rows
+        rows = db.execute(
+            queries.SELECT_SCHEDULE_ARCHIVE if self._spans_archive(from_date, self._read_archived_before(db))
+            else queries.SELECT_SCHEDULE,
+            (self._dates.encode(from_date), self._dates.encode(to_date), self.court)
         )
+        for id_, first_name, last_name, start_date, end_date in rows:
+            start_date = decode(start_date)
+            loaded[start_date.date()].append((id_, first_name, last_name, start_date, decode(end_date)))
+
+        with self._state_lock:
+            # a write since the state was taken may have invalidated the days before they were loaded,
+            # then they answer only this call
+            cache = self._data_state == state
+            for day, reservations in loaded.items():
+                if cache:
+                    self._days.put(day, reservations)
+                days[day] = tuple(reservations)
+        return days
+
+    def _take_day_reservations(self, day):
+        """
+        The function returns the reservations overlapping the day sorted by start_date,
+        a reservation fits between the opening hours, so it overlaps at most the day after its start.
+        """
+        days = self._take_days(day - timedelta(days=1), day)
+        day_start = day_period(day)[0]
+        return [
+            reservation for reservation in days[day - timedelta(days=1)] if reservation[4] > day_start
+        ] + list(days[day])
 
     def has_permission_can_reservation(self, first_name, last_name):
         """
         The function check how many reservation have user.
         User cannot have more than 2 reservations in the current week.
+        The series are expanded first, so their occurrences in the week are counted;
+        the counting runs on the connection of the thread.
+        """
+        self._take_state()
+        return not self._reached_quota(self._cursor, first_name, last_name)
+
+    def _reached_quota(self, cursor, first_name, last_name):
+        """
+        The function checks the quota of the coming week. The week from now lies in this and the next
+        calendar week, the counters of both (counters.py) are read by the primary key; only when together
+        they reach the quota the reservations of the week are counted.
         """
+        week = week_of(self.get_current_date)
+        cursor.execute(queries.SUM_USER_WEEKS, (first_name, last_name, week, week + 1))
+        if cursor.fetchone()[0] < WEEK_QUOTA:
+            return False
+        return self._count_week_reservations(cursor, first_name, last_name) >= WEEK_QUOTA
+
+    def _count_week_reservations(self, cursor, first_name, last_name):
         today = self.get_current_date
         today_plus_week = today + timedelta(weeks=1)
 
-        query = f"""
-        SELECT COUNT (*) FROM reservations 
-        WHERE start_date > '{convert_date_to_str(self.get_current_date)}' 
-        AND start_date < '{convert_date_to_str(today_plus_week)}' 
-        AND first_name = '{first_name}' AND last_name='{last_name}';
-        """
-        self._cursor.execute(query)
+        cursor.execute(
+            queries.COUNT_USER_RESERVATIONS,
+            (self._dates.encode(today), self._dates.encode(today_plus_week), first_name, last_name)
+        )
+        return cursor.fetchone()[0]
 
-        return bool( self._cursor.fetchone()[0] < 2 )
     def has_permission_date(self, date):
         """
         The date must be at least an hour later than the current date.
@@ -78,79 +376,147 @@ class DataBase:
         """
         The function check availability tennis court
         """
+        slots = self._take_slot_index(date)
+        if slots:
+            return True if slots.is_free(date) else None
 
-        query = f"""
-            SELECT * FROM reservations
-            WHERE start_date <= '{date.strftime("%Y-%m-%d %H:%M")}' AND end_date > '{date.strftime("%Y-%m-%d %H:%M")}';
-            """
-        self._cursor.execute(query)
-        res = self._cursor.fetchall()
-
-        if res:
-            return
+        for reservation in self._take_day_reservations(date.date()):
+            if reservation[3] <= date < reservation[4]:
+                return
         return True
 
     def suggest_new_date(self, date):
         """
         The function searches for the fastest available court reservation on a given day.
+        The reservations of the day are loaded once and searched in memory, later hours win a tie.
         """
-        open_court = datetime.strptime(self.open_hour, "%H:%M").time()
-        close_court = datetime.strptime(self.close_hour, "%H:%M").time()
+        open_court = datetime.combine(date.date(), datetime.strptime(self.open_hour, "%H:%M").time())
+        close_court = datetime.combine(date.date(), datetime.strptime(self.close_hour, "%H:%M").time())
 
-        new_hour_right = date + timedelta(minutes=30)
-        new_hour_left = date - timedelta(minutes=30)
+        slots = self._take_slot_index(date)
+        if slots:
+            new_hour_right = slots.next_free(date + SLOT)
+            if new_hour_right and new_hour_right >= close_court:
+                new_hour_right = None
+            new_hour_left = slots.previous_free(date)
+            if new_hour_left and new_hour_left <= open_court:
+                new_hour_left = None
+        else:
+            new_hour_right, new_hour_left = self._search_busy_intervals(date, open_court, close_court)
 
-        query = lambda date_one: f"""
-            SELECT * FROM reservations
-            WHERE start_date <= '{date_one}' AND  end_date > '{date_one}';
-            """
+        if new_hour_right and (not new_hour_left or new_hour_right - date <= date - new_hour_left):
+            return new_hour_right
+        return new_hour_left
 
+    def _search_busy_intervals(self, date, open_court, close_court):
+        """
+        The function returns the nearest free half-hours after and before the date, searching
+        the day's reservations in memory. It is used for the dates outside of the slot index.
+        """
+        step = SLOT
+        starts, ends = self._take_busy_intervals(date)
 
-        is_close = True
-        is_open = True
+        # right side: first free half-hour after the chosen date
+        new_hour_right = date + step
+        while new_hour_right < close_court:
+            index = bisect_right(starts, new_hour_right) - 1
+            if index < 0 or ends[index] <= new_hour_right:
+                break
+            # jump behind the reservation
+            new_hour_right = date + step * -(-(ends[index] - date) // step)
+        else:
+            new_hour_right = None
 
-        while is_close or is_open:
-            if is_close and close_court > new_hour_right.time():
-                q = query(new_hour_right)
-                self._cursor.execute(q)
-                res = self._cursor.fetchall()
-                if res:
-                    new_hour_right += timedelta(minutes=30)
-                else:
-                    return new_hour_right
+        # left side: first free half-hour before the chosen date
+        new_hour_left = date - step
+        while new_hour_left > open_court:
+            index = bisect_right(starts, new_hour_left) - 1
+            if index < 0 or ends[index] <= new_hour_left:
+                break
+            # jump in front of the reservation
+            new_hour_left = date - step * ((date - starts[index]) // step + 1)
+        else:
+            new_hour_left = None
+
+        return new_hour_right, new_hour_left
+
+    def _take_busy_intervals(self, date):
+        """
+        The function returns sorted starts and ends of the occupied periods on a given day.
+        Overlapping and adjacent reservations are merged, so the lists can be bisected.
+        """
+        starts, ends = [], []
+        for _, _, _, start_date, end_date in self._take_day_reservations(date.date()):
+            if ends and start_date <= ends[-1]:
+                ends[-1] = max(ends[-1], end_date)
             else:
-                is_close = False
+                starts.append(start_date)
+                ends.append(end_date)
+        return starts, ends
 
-            if is_open and new_hour_left.time() > open_court:
+    def find_free_slots(self, start, duration=30, limit=FREE_SLOTS, horizon=None):
+        """
+        The function returns up to limit dates from start on, on the half-hour grid of start and between
+        the opening hours, when the court is free for duration minutes. The reservations until start + horizon
+        (the end of the booking window by default) are read with one range query, sorted and merged,
+        and their gaps are walked once.
+        """
+        length = timedelta(minutes=duration)
+        end = start + horizon if horizon else self.get_current_date + timedelta(weeks=2)
+        open_time = datetime.strptime(self.open_hour, "%H:%M").time()
+        close_time = datetime.strptime(self.close_hour, "%H:%M").time()
+        align = lambda date: start + SLOT * -(-(date - start) // SLOT)
+        if end <= start:
+            return []
 
-                q = query(new_hour_left)
-                self._cursor.execute(q)
-                res = self._cursor.fetchall()
+        with self._connections.reading() as db:
+            periods = self._take_stored_periods(db.cursor(), start, end + length, self.court)
 
-                if res:
-                    new_hour_left -= timedelta(minutes=30)
-                else:
-                    return new_hour_left
-            else:
-                is_open = False
-        return
+        slots = []
+        index = 0
+        date = start
+        while date < end and len(slots) < limit:
+            open_court = datetime.combine(date.date(), open_time)
+            if date < open_court:
+                date = align(open_court)
+                continue
+            if date + length > datetime.combine(date.date(), close_time):
+                date = align(open_court + timedelta(days=1))
+                continue
+            while index < len(periods) and periods[index][1] <= date:
+                index += 1
+            if index < len(periods) and periods[index][0] < date + length:
+                # jump behind the reservation
+                date = align(periods[index][1])
+                continue
+            slots.append(date)
+            date += SLOT
+        return slots
 
     def check_reservation_options(self, date):
 
-        query = f"""
-            SELECT * FROM reservations
-            WHERE start_date > '{date}' AND DATE(start_date) == '{convert_date_to_str(date, "%Y-%m-%d")}'
-            ORDER BY start_date;
-            """
-        self._cursor.execute(query)
-        res = self._cursor.fetchall()
-        if not res:
+        day = datetime(date.year, date.month, date.day)
+        close_court = datetime.combine(day, datetime.strptime(self.close_hour, "%H:%M").time())
+
+        slots = self._take_slot_index(date)
+        if slots:
+            # the free run table of the day, the booking window needs no search
+            period = min(SLOT * slots.free_run(date), close_court - date)
+            return self._take_reservation_options(period)
+
+        next_start = next(
+            (reservation[3] for reservation in self._take_days(day.date(), day.date())[day.date()]
+             if reservation[3] > date),
+            None
+        )
+        if not next_start:
             # nikt nic do nie zarezerwował do końca dnia
-            close_court = datetime.strptime(f'{date.year}-{date.month}-{date.day} {self.close_hour}', "%Y-%m-%d %H:%M")
             period = close_court - date
         else:
-            next_reservation = res[0][3]
-            period = datetime.strptime(next_reservation, "%Y-%m-%d %H:%M") - date
+            period = next_start - date
+        return self._take_reservation_options(period)
+
+    def _take_reservation_options(self, period):
 
         if period - timedelta(minutes=90) >= timedelta(minutes=0):
             return [30, 60, 90]
@@ -161,6 +527,60 @@ class DataBase:
         else:
             return
 
+    def find_court(self, date, minutes=30):
+        """
+        The function returns the earliest CourtSlot from the date to the closing hour where the minutes fit
+        on one of the courts, or None. The reservations of all courts are read with one range query
+        and swept once in order of start, a tie goes to the court with the lower id.
+        """
+        length = timedelta(minutes=minutes)
+        open_court = datetime.combine(date.date(), datetime.strptime(self.open_hour, "%H:%M").time())
+        close_court = datetime.combine(date.date(), datetime.strptime(self.close_hour, "%H:%M").time())
+        first = max(date, open_court)
+        # the starts stay on the half-hour grid of the first one
+        align = lambda end_date: first + SLOT * -(-(end_date - first) // SLOT)
+
+        decode = self._dates.decode
+        with self._connections.reading() as db:
+            names = dict(db.execute(queries.SELECT_COURTS).fetchall())
+            free_from = dict.fromkeys(names, first)
+            found = {}
+            rows = db.execute(queries.SELECT_COURT_PERIODS, self._overlap_dates(first, close_court))
+            for court, start_date, end_date in rows:
+                if court in found or court not in free_from:
+                    continue
+                if decode(start_date) - free_from[court] >= length:
+                    found[court] = free_from[court]
+                else:
+                    free_from[court] = max(free_from[court], align(decode(end_date)))
+
+        for court, start in free_from.items():
+            if court not in found and start + length <= close_court:
+                found[court] = start
+        if not found:
+            return
+        court = min(found, key=lambda court: (found[court], court))
+        return CourtSlot(found[court], court, names[court])
+
+    def courts(self):
+        """
+        The function returns the (id, name) of every court.
+        """
+        with self._connections.reading() as db:
+            return db.execute(queries.SELECT_COURTS).fetchall()
+
+    def add_court(self, name):
+        """
+        The function adds a court and returns its id, the names are unique.
+        """
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            court = db.execute(queries.INSERT_COURT, (name,)).lastrowid
+            db.commit()
+            self._mark_written(db)
+            self._court_ids.add(court)
+        return court
+
     def take_schedule_day(self, reservation) -> str:
         """
         The function returns reservations for a specified day (reservation).
@@ -170,135 +590,617 @@ class DataBase:
         else:
             print_text = ''
             print_text += '\n'.join(
-                f"* {i[1] + ' ' + i[2]:<30} {i[3]:<17} - {i[4]:<17}" for i in reservation
+                f"* {i[1] + ' ' + i[2]:<30} {convert_date_to_str(i[3]):<17} - {convert_date_to_str(i[4]):<17}"
+                for i in reservation
             ) + '\n\n'
         return print_text
 
-    def save_as_json(self, name_file, from_to):
+    def take_schedule_days(self, from_date, to_date):
+        """
+        The function yields (day, reservations) for every day from from_date to to_date, empty days included.
+        The reservations are fetched with one range query and grouped into days as they stream,
+        their start_date and end_date are datetimes. Ranges which fit in the day cache are read through it.
+        """
+        day = from_date.date()
+        last_day = to_date.date()
+
+        if (last_day - day).days < self._days.maxsize:
+            days = self._take_days(day, last_day)
+            while day <= last_day:
+                yield day, list(days[day])
+                day += timedelta(days=1)
+            return
 
-        payload = {}
-        from_date = from_to[0]
-        to_date = from_to[1]
+        from_date = datetime.combine(day, datetime.min.time())
+        to_date = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+        with self._connections.reading() as db:
+            # a reader is not synced, so the boundary is read with the rows
+            rows = db.execute(
+                queries.SELECT_SCHEDULE_ARCHIVE if self._spans_archive(from_date, self._read_archived_before(db))
+                else queries.SELECT_SCHEDULE,
+                (self._dates.encode(from_date), self._dates.encode(to_date), self.court)
+            )
+            decode = self._dates.decode
+            rows = ((id_, first_name, last_name, decode(start_date), decode(end_date))
+                    for id_, first_name, last_name, start_date, end_date in rows)
 
-        while from_date <= to_date:
+            row = next(rows, None)
+            while day <= last_day:
+                reservations = []
+                while row and row[3].date() == day:
+                    reservations.append(row)
+                    row = next(rows, None)
+                yield day, reservations
+                day += timedelta(days=1)
 
-            query = f"""
-                    SELECT * FROM reservations
-                    WHERE DATE(start_date) = '{convert_date_to_str(from_date, '%Y-%m-%d')}'
-                    ORDER BY start_date;
-                    """
-            self._cursor.execute(query)
-            res = self._cursor.fetchall()
+    def save_as_json(self, name_file, from_to, compress=False, directory=SAVE_DIRECTORY):
 
-            payload_reservation = []
-            if res:
-                for datum in res:
-                    reservation = {
+        payload = (
+            (
+                convert_date_to_str(day, '%d.%m'),
+                [
+                    {
                         'name': datum[1] + ' ' + datum[2],
                         'start_time': change_date_format(datum[3], True),
                         'end_time': change_date_format(datum[4], True)
                     }
-                    payload_reservation.append(reservation)
-            payload[convert_date_to_str(from_date, '%d.%m')] = payload_reservation
-            from_date += timedelta(days=1)
-        path = os.path.join('src', 'tennis_court', 'save', name_file+'.json')
-        with open(path, 'w', encoding='utf8') as file:
-            json.dump(payload, file, indent=2, ensure_ascii=False)
+                    for datum in res
+                ]
+            )
+            for day, res in self.take_schedule_days(from_to[0], from_to[1])
+        )
+
+        # the writers are imported by the exports only, not on every start of the application
+        from .export import write_json
+        path = os.path.join(directory, name_file+'.json')
+        return write_json(path, payload, compress)
+
+    def save_as_csv(self, name_file, from_to, compress=False, directory=SAVE_DIRECTORY):
+        from_day = datetime.combine(from_to[0].date(), datetime.min.time())
+        to_day = datetime.combine(from_to[1].date(), datetime.min.time()) + timedelta(days=1)
+        def take_rows(cursor):
+            decode = self._dates.decode
+            while res := cursor.fetchmany(EXPORT_BATCH_SIZE):
+                yield [
+                    (row[1]+ ' ' + row[2], change_date_format(decode(row[3])), change_date_format(decode(row[4])))
+                    for row in res
+                ]
+
+        from .export import write_csv
+        path = os.path.join(directory, name_file+'.csv')
+        with self._connections.reading() as db:
+            cursor = db.execute(
+                queries.SELECT_EXPORT_ARCHIVE if self._spans_archive(from_day, self._read_archived_before(db))
+                else queries.SELECT_EXPORT,
+                (self._dates.encode(from_day), self._dates.encode(to_day), self.court)
+            )
+            return write_csv(path, take_rows(cursor), compress)
+
+    def add(self, first_name, last_name, start_date, end_date, court=None):
+
+        court = self._court(court)
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            db.execute(
+                queries.INSERT_RESERVATION,
+                (first_name, last_name, self._dates.encode(start_date), self._dates.encode(end_date), court)
+            )
+
+            db.commit()
+            self._mark_written(db)
+            self._take_booked(court, start_date, end_date)
         return True
 
+    def _court(self, court):
+        """
+        The function returns the court of a method call, self.court when it is None.
+        An id which is not in courts raises ValueError, the reservations do not check their court_id.
+        """
+        if court is None:
+            return self.court
+        if court not in self._court_ids:
+            # the court may have been added by another process
+            with self._connections.reading() as db:
+                self._court_ids = {court for court, _ in db.execute(queries.SELECT_COURTS)}
+            if court not in self._court_ids:
+                raise ValueError(f"There is no court {court}.")
+        return court
+
+    def _take_booked(self, court, start_date, end_date):
+        # the day cache and the slot index hold the reservations of self.court only
+        if court == self.court:
+            with self._state_lock:
+                self._days.invalidate(start_date, end_date)
+                if self._slots:
+                    self._slots.fill(start_date, end_date)
 
-    def save_as_csv(self, name_file, from_to):
-        query = f"""
-        SELECT * FROM reservations
-        WHERE DATE(start_date) >= '{convert_date_to_str(from_to[0],'%Y-%m-%d')}' 
-        AND DATE(end_date) <= '{convert_date_to_str(from_to[1], '%Y-%m-%d')}'
-        ORDER BY start_date;
+    def book(self, first_name, last_name, start_date, end_date, court=None):
+        """
+        The function checks the weekly limit and the overlapping reservations and adds the reservation
+        in one BEGIN IMMEDIATE transaction, so two processes cannot book the same court.
         """
-        self._cursor.execute(query)
-        res = self._cursor.fetchall()
+        return self.book_many([(first_name, last_name, start_date, end_date)], court)[0]
 
-        rows = [(row[1]+ ' ' + row[2], change_date_format(row[3]), change_date_format(row[4])) for row in res]
-        header = ['name', 'start_date', 'end_date']
+    def book_many(self, reservations, court=None):
+        """
+        The function books (first_name, last_name, start_date, end_date) reservations one after another
+        like book, all of them in one BEGIN IMMEDIATE transaction, and returns a Booking for each of them.
+        A reservation ending before it starts or longer than a day is rejected as 'invalid'.
+        """
+        court = self._court(court)
+        report = []
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            cursor = db.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for first_name, last_name, start_date, end_date in reservations:
+                    report.append(self._book(cursor, first_name, last_name, start_date, end_date, court))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
 
-        path = os.path.join('src', 'tennis_court', 'save', name_file+'.csv')
-        with open(path, 'w', encoding='utf8') as f:
+            self._mark_written(db)
+            for booking, (_, _, start_date, end_date) in zip(report, reservations):
+                if booking.booked:
+                    self._take_booked(court, start_date, end_date)
+        return report
 
-            writer = csv.writer(f)
-            writer.writerow(header)
-            writer.writerows(rows)
+    def _book(self, cursor, first_name, last_name, start_date, end_date, court):
+        if not start_date < end_date <= start_date + LONGEST_RESERVATION:
+            return Booking(False, 'invalid')
+        if self._reached_quota(cursor, first_name, last_name):
+            return Booking(False, 'quota')
 
+        cursor.execute(
+            queries.SELECT_OVERLAPPING_ARCHIVE if self._spans_archive(start_date, self._archived_before)
+            else queries.SELECT_OVERLAPPING,
+            (*self._overlap_dates(start_date, end_date), court)
+        )
+        conflict = cursor.fetchone()
+        if conflict:
+            conflict = (conflict[0], conflict[1], self._dates.decode(conflict[2]), self._dates.decode(conflict[3]))
+        elif self._beyond_expanded(end_date):
+            # beyond the booking window the occurrences of the series are not reservations yet
+            conflict = min(
+                self._take_series_occurrences(cursor, start_date, end_date, court), key=itemgetter(2), default=None
+            )
+        if conflict:
+            return Booking(False, 'conflict', conflict)
 
-    def add(self, first_name, last_name, start_date, end_date):
+        cursor.execute(
+            queries.INSERT_RESERVATION,
+            (first_name, last_name, self._dates.encode(start_date), self._dates.encode(end_date), court)
+        )
+        return Booking(True)
 
-        start_date = convert_date_to_str(start_date)
-        end_date = convert_date_to_str(end_date)
-        self._cursor.execute(
-            """
-            INSERT INTO reservations (first_name, last_name, start_date, end_date)
-            VALUES (?, ?, ?, ?)
-            """,
-            (first_name, last_name, start_date, end_date)
+    def add_many(self, reservations, court=None):
+        """
+        The function adds (first_name, last_name, start_date, end_date) reservations in one transaction
+        and returns a Booking for each of them, in the given order. A reservation overlapping a stored one
+        or an earlier one of the batch is rejected as 'conflict', one ending before it starts or longer than a day
+        as 'invalid'.
+        """
+        court = self._court(court)
+        reservations = [tuple(reservation) for reservation in reservations]
+        report = [Booking(False, 'invalid')] * len(reservations)
+        order = sorted(
+            (
+                index for index, reservation in enumerate(reservations)
+                if reservation[2] < reservation[3] <= reservation[2] + LONGEST_RESERVATION
+            ),
+            key=lambda index: reservations[index][2]
         )
+        if not order:
+            return report
 
-        self._db.commit()
-        return True
+        accepted = []
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            cursor = db.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                stored = self._take_stored_periods(
+                    cursor, reservations[order[0]][2], max(reservations[index][3] for index in order), court
+                )
+
+                # sweep line: the batch and the stored periods are both sorted by start
+                position = 0
+                last = None
+                for index in order:
+                    start_date, end_date = reservations[index][2:]
+                    while position < len(stored) and stored[position][1] <= start_date:
+                        position += 1
+                    if position < len(stored) and stored[position][0] < end_date:
+                        report[index] = Booking(False, 'conflict', stored[position][2])
+                    elif last and last[3] > start_date:
+                        report[index] = Booking(False, 'conflict', last)
+                    else:
+                        report[index] = Booking(True)
+                        accepted.append(reservations[index])
+                        last = reservations[index]
 
-    def cancel(self, first_name, last_name, start_date):
+                cursor.executemany(
+                    queries.INSERT_RESERVATION,
+                    (
+                        (first_name, last_name, self._dates.encode(start_date), self._dates.encode(end_date), court)
+                        for first_name, last_name, start_date, end_date in accepted
+                    )
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
 
-        start_date = convert_date_to_str(start_date)
-        query = f"""
-        SELECT * FROM reservations
-        WHERE start_date = '{start_date}' AND first_name='{first_name}' AND last_name='{last_name}';
+            self._mark_written(db)
+            for reservation in accepted:
+                self._take_booked(court, reservation[2], reservation[3])
+        return report
+
+    def _take_stored_periods(self, cursor, from_date, to_date, court, with_series=True):
+        """
+        The function returns sorted, disjoint (start_date, end_date, reservation) periods taken between the dates,
+        overlapping reservations are merged and the first of them is kept. With with_series the occurrences
+        of the series which are not reservations yet take their periods as well.
         """
+        cursor.execute(
+            queries.SELECT_OVERLAPPING_ALL_ARCHIVE if self._spans_archive(from_date, self._archived_before)
+            else queries.SELECT_OVERLAPPING_ALL,
+            (*self._overlap_dates(from_date, to_date), court)
+        )
+        decode = self._dates.decode
+        reservations = (
+            (first_name, last_name, decode(start_date), decode(end_date))
+            for first_name, last_name, start_date, end_date in cursor
+        )
+        if with_series and self._beyond_expanded(to_date):
+            reservations = list(reservations) + self._take_series_occurrences(cursor, from_date, to_date, court)
+            reservations.sort(key=itemgetter(2))
+
+        periods = []
+        for first_name, last_name, start_date, end_date in reservations:
+            if periods and start_date < periods[-1][1]:
+                periods[-1][1] = max(periods[-1][1], end_date)
+            else:
+                periods.append([start_date, end_date, (first_name, last_name, start_date, end_date)])
+        return periods
 
-        self._cursor.execute(query)
-        res = self._cursor.fetchone()
+    def _beyond_expanded(self, end_date):
+        # a reader of another thread may run before the series are expanded today
+        return self._series_until is None or end_date > self._series_until
+
+    def _take_series_occurrences(self, cursor, from_date, to_date, court):
+        """
+        The function returns the (first_name, last_name, start_date, end_date) occurrences of the series
+        of the court overlapping the period which are not reservations yet.
+        """
+        cursor.execute(
+            queries.SELECT_SERIES_PERIODS, (court, to_text(to_date), to_text(from_date - LONGEST_RESERVATION))
+        )
+        taken = []
+        for first_name, last_name, start_date, end_date, until_date, expanded_until in cursor.fetchall():
+            expanded_until = from_text(expanded_until)
+            taken.extend(
+                (first_name, last_name, start, end) for start, end in occurrences(
+                    from_text(start_date), from_text(end_date), from_text(until_date), from_date, to_date
+                ) if start >= expanded_until
+            )
+        return taken
+
+    def add_series(self, first_name, last_name, start_date, end_date, until, court=None):
+        """
+        The function adds a weekly series: start_date - end_date and the same hours every week, the last one
+        starting up to until. All occurrences are checked against the schedule of the court with one range query
+        and the series is added only when none of them conflicts, the Booking gives the first conflict.
+        The weekly quota counts the occurrences, 'quota' when they would give the user more than WEEK_QUOTA
+        reservations in a week. The occurrences in the booking window become reservations at once,
+        the later ones when the window reaches them.
+        """
+        court = self._court(court)
+        if not start_date < end_date <= start_date + LONGEST_RESERVATION or until < start_date:
+            return Booking(False, 'invalid')
+        dates = list(occurrences(start_date, end_date, until))
 
-        if not res:
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            cursor = db.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                if self._reached_series_quota(cursor, first_name, last_name, dates):
+                    booking = Booking(False, 'quota')
+                else:
+                    periods = self._take_stored_periods(cursor, dates[0][0], dates[-1][1], court)
+                    conflict = next(filter(None, find_conflicts(periods, dates)), None)
+                    booking = Booking(False, 'conflict', conflict) if conflict else Booking(True)
+                if booking.booked:
+                    cursor.execute(
+                        queries.INSERT_SERIES,
+                        (first_name, last_name, court, to_text(start_date), to_text(end_date), to_text(until),
+                         to_text(self._series_until))
+                    )
+                    expanded = [(start, end) for start, end in dates if start < self._series_until]
+                    cursor.executemany(
+                        queries.INSERT_RESERVATION,
+                        (
+                            (first_name, last_name, self._dates.encode(start), self._dates.encode(end), court)
+                            for start, end in expanded
+                        )
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            self._mark_written(db)
+            if booking.booked:
+                for start, end in expanded:
+                    self._take_booked(court, start, end)
+        return booking
+
+    def _reached_series_quota(self, cursor, first_name, last_name, dates):
+        """
+        The function checks whether the dates would give the user more than WEEK_QUOTA reservations in one
+        of their calendar weeks, counting the weekly counters and the occurrences of the other series
+        of the user which are not reservations yet.
+        """
+        weeks = Counter(week_of(start) for start, _ in dates)
+        cursor.execute(queries.SELECT_USER_WEEKS, (first_name, last_name, min(weeks), max(weeks)))
+        for week, reservations in cursor.fetchall():
+            weeks[week] += reservations
+
+        from_date, to_date = dates[0][0], dates[-1][1]
+        cursor.execute(
+            queries.SELECT_USER_SERIES,
+            (first_name, last_name, to_text(from_date - LONGEST_RESERVATION), to_text(to_date))
+        )
+        for start_date, end_date, until_date, expanded_until in cursor.fetchall():
+            expanded_until = from_text(expanded_until)
+            for start, _ in occurrences(
+                from_text(start_date), from_text(end_date), from_text(until_date), from_date, to_date
+            ):
+                if start >= expanded_until and week_of(start) in weeks:
+                    weeks[week_of(start)] += 1
+        return any(reservations > WEEK_QUOTA for reservations in weeks.values())
+
+    def cancel_series(self, first_name, last_name, start_date, court=None):
+        """
+        The function cancels the series with the first occurrence at start_date and its reservations
+        which have not started yet, it returns False when there is no such series.
+        """
+        court = self._court(court)
+        now = self.get_current_date
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                res = db.execute(queries.SELECT_SERIES, (to_text(start_date), first_name, last_name, court)).fetchone()
+                cancelled = []
+                if res:
+                    id_, end_date, until_date, expanded_until = res
+                    db.execute(queries.DELETE_SERIES, (id_,))
+                    upcoming = [
+                        (first_name, last_name, start) for start, _ in occurrences(
+                            start_date, from_text(end_date), from_text(until_date), now, from_text(expanded_until)
+                        ) if start >= now
+                    ]
+                    cancelled = self._delete_reservations(db, upcoming, court)[1]
+                promoted = self._promote_waiters(db.cursor(), cancelled, court)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            self._mark_written(db)
+            self._take_cancelled(db, court, cancelled, promoted)
+        self._notify_promoted(promoted)
+        return bool(res)
+
+    def cancel(self, first_name, last_name, start_date, court=None):
+
+        return self.cancel_many([(first_name, last_name, start_date)], court)[0]
+
+    def cancel_many(self, reservations, court=None):
+        """
+        The function cancels (first_name, last_name, start_date) reservations in one transaction
+        and returns True for each cancelled one and False for each one which does not exist.
+        """
+        court = self._court(court)
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                report, cancelled = self._delete_reservations(db, reservations, court)
+                promoted = self._promote_waiters(db.cursor(), cancelled, court)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            self._mark_written(db)
+            self._take_cancelled(db, court, cancelled, promoted)
+        self._notify_promoted(promoted)
+        return report
+
+    def _delete_reservations(self, db, reservations, court):
+        """
+        The function deletes (first_name, last_name, start_date) reservations in the open transaction,
+        it returns True or False for each of them and the (start_date, end_date) of the deleted ones.
+        """
+        report = []
+        cancelled = []
+        for first_name, last_name, start_date in reservations:
+            encoded = self._dates.encode(start_date)
+            res = db.execute(queries.SELECT_RESERVATION, (encoded, first_name, last_name, court)).fetchone()
+            if res:
+                db.execute(queries.DELETE_RESERVATION, (encoded, first_name, last_name, court))
+                cancelled.append((start_date, self._dates.decode(res[4])))
+            report.append(bool(res))
+        return report, cancelled
+
+    def _take_cancelled(self, db, court, cancelled, promoted):
+        if court != self.court:
+            return
+        with self._state_lock:
+            for start, end in cancelled:
+                self._days.invalidate(start, end)
+                if self._slots and start < self._slots.end and end > self._slots.start:
+                    # overlapping reservations may still take some of the freed slots
+                    self._slots.clear(start, end)
+                    self._fill_slot_index(db, self._slots, start, end)
+        for _, _, start, end, _ in promoted:
+            self._take_booked(court, start, end)
+
+    def _promote_waiters(self, cursor, cancelled, court):
+        """
+        The function books the waiters of the freed (start_date, end_date) periods in the open transaction,
+        the earliest first, with the checks of book; the booked ones leave the waitlist.
+        A waiter is found by the start of the period they wait for, so only the waiters of the freed hours are read.
+        The waiters of the periods which have started are deleted first.
+        """
+        promoted = []
+        now = self.get_current_date
+        if cancelled:
+            cursor.execute(queries.DELETE_PAST_WAITERS, (court, to_text(now)))
+        for freed_start, freed_end in cancelled:
+            booked = []
+            cursor.execute(
+                queries.SELECT_WAITERS,
+                (court, to_text(max(freed_start - LONGEST_RESERVATION, now)), to_text(freed_end), to_text(freed_start))
+            )
+            for id_, first_name, last_name, start_date, end_date in cursor.fetchall():
+                start_date, end_date = from_text(start_date), from_text(end_date)
+                # the ones overlapping a promoted waiter stay without a query
+                if any(start_date < taken_end and end_date > taken_start for taken_start, taken_end in booked):
+                    continue
+                if self._book(cursor, first_name, last_name, start_date, end_date, court).booked:
+                    cursor.execute(queries.DELETE_WAITER_BY_ID, (id_,))
+                    booked.append((start_date, end_date))
+                    promoted.append((first_name, last_name, start_date, end_date, court))
+        return promoted
+
+    def _notify_promoted(self, promoted):
+        if promoted and self.on_promote:
+            self.on_promote(promoted)
+
+    def join_waitlist(self, first_name, last_name, start_date, end_date, court=None):
+        """
+        The function puts the user on the waitlist of the period, the first cancel freeing it books it for them
+        if the weekly quota allows. It returns False when the period is not a future one between the opening hours
+        or the user already waits for the start.
+        """
+        open_court = datetime.combine(start_date.date(), datetime.strptime(self.open_hour, "%H:%M").time())
+        close_court = datetime.combine(start_date.date(), datetime.strptime(self.close_hour, "%H:%M").time())
+        if not (self.get_current_date < start_date and open_court <= start_date < end_date <= close_court):
             return False
-        else:
-            query = f"""
-            DELETE FROM reservations
-            WHERE start_date = '{start_date}' AND first_name='{first_name}' AND last_name='{last_name}';
-            """
-            self._cursor.execute(query)
-            self._db.commit()
-            return True
+        court = self._court(court)
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            added = db.execute(
+                queries.INSERT_WAITER, (first_name, last_name, court, to_text(start_date), to_text(end_date))
+            ).rowcount
+            db.commit()
+            self._mark_written(db)
+        return bool(added)
 
-    def show_schedule(self, from_date, to_date):
+    def leave_waitlist(self, first_name, last_name, start_date, court=None):
+        """
+        The function takes the user off the waitlist of the start, it returns False when they did not wait for it.
+        """
+        court = self._court(court)
+        with self._connections.writing() as db:
+            self._sync_state(db)
+            removed = db.execute(queries.DELETE_WAITER, (court, to_text(start_date), first_name, last_name)).rowcount
+            db.commit()
+            self._mark_written(db)
+        return bool(removed)
+
+    def archive(self, days=ARCHIVE_AFTER_DAYS):
+        """
+        The function moves the reservations which ended more than days days before today to
+        reservations_archive, ARCHIVE_BATCH_SIZE of them per transaction, and returns how many were moved.
+        The checks of the booking window read only the live table, the schedules, exports and
+        imports of the earlier days read both tables. An archived reservation cannot be cancelled.
+        """
+        if days < 0:
+            raise ValueError("Only the reservations of past days can be archived.")
+        before = datetime.combine(self.get_current_date.date(), datetime.min.time()) - timedelta(days=days)
+        encoded = self._dates.encode(before)
 
+        moved = 0
+        while True:
+            # the writer is released between the batches, so bookings do not wait for the whole archive
+            with self._connections.writing() as db:
+                self._sync_state(db)
+                db.execute("BEGIN IMMEDIATE")
+                moves_boundary = self._archived_before is None or self._archived_before < before
+                try:
+                    if moves_boundary:
+                        # the boundary is moved with the first batch, so the readers look into the archive
+                        db.execute(queries.SET_SETTING, ('archived_before', before.isoformat(' ', 'minutes')))
+                    res = db.execute(queries.SELECT_ARCHIVE_BATCH_END, (encoded, ARCHIVE_BATCH_SIZE - 1)).fetchone()
+                    batch_end = res[0] if res else encoded
+                    db.execute(queries.ARCHIVE_RESERVATIONS, (encoded, batch_end))
+                    moved += db.execute(queries.DELETE_ARCHIVED, (encoded, batch_end)).rowcount
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                if moves_boundary:
+                    self._archived_before = before
+                # the moved reservations ended before the booking window and their days read both tables,
+                # so neither the slot index nor the cached days change
+                self._mark_written(db)
+            if not res:
+                return moved
 
-        while from_date <= to_date:
+    def show_schedule(self, from_date, to_date):
 
-            from_date_str = convert_date_to_str(from_date, "%Y-%m-%d")
-            query = f"""
-                    SELECT * FROM reservations
-                    WHERE DATE(start_date) = '{from_date_str}'
-                    ORDER BY start_date;
-                    """
-            self._cursor.execute(query)
-            res = self._cursor.fetchall()
+        today = self.get_current_date.date()
+        for day, res in self.take_schedule_days(from_date, to_date):
 
             print_text = ""
-            if from_date.date() == self.get_current_date.date():
+            if day == today:
                 print_text += "Today:\n" + self.take_schedule_day(res)
-            elif from_date.date() == self.get_current_date.date() + timedelta(days=1):
+            elif day == today + timedelta(days=1):
                 print_text += 'Tomorrow:\n' + self.take_schedule_day(res)
             else:
-                print_text += from_date.strftime("%A") + '\n' + self.take_schedule_day(res)
+                print_text += day.strftime("%A") + '\n' + self.take_schedule_day(res)
 
-            from_date += timedelta(days=1)
             yield print_text
 
-    def save_to_file(self, from_date, to_date, format):
+    def save_to_file(self, from_date, to_date, format, compress=False, directory=SAVE_DIRECTORY):
         """
-           The function save file as json or csv
+           The function save file as json or csv and returns its path
         """
         name_file = convert_date_to_str(from_date,'%d.%m') + '-' + convert_date_to_str(to_date,'%d.%m')
         if format == '1':
-            self.save_as_json(name_file, [from_date, to_date])
+            return self.save_as_json(name_file, [from_date, to_date], compress, directory)
         elif format == '2':
-            self.save_as_csv(name_file, [from_date, to_date])
+            return self.save_as_csv(name_file, [from_date, to_date], compress, directory)
+
+    def cache_info(self):
+        """
+        The function returns the hits, misses, maxsize and currsize of the day cache.
+        """
+        return self._days.info()
+
+    def check_counters(self, repair=False):
+        """
+        The function returns the differences between the weekly counters and the reservations,
+        with repair=True the counters are rebuilt when they differ.
+        """
+        with self._connections.writing() as db:
+            differences = check_counters(db)
+            if differences and repair:
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    rebuild_counters(db)
+                except Exception:
+                    db.rollback()
+                    raise
+                db.commit()
+        return differences
 
     def close(self):
-        self._db.close()
\ No newline at end of file
+        self._connections.close()
\ No newline at end of file
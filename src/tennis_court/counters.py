@@ -0,0 +1,114 @@
+"""
+Weekly reservation counters of the users, kept up to date by SQLite triggers.
+
+Every pair of first_name and last_name gets an integer id in the users table, and user_weeks
+holds the number of reservations of a user starting in a week. The triggers update the counters
+on every insert, delete and update of the reservations, whichever connection or process writes,
+so the weekly quota is read from user_weeks instead of counting the reservations.
+
+Weeks are numbered from Monday 1969-12-29. The dates are stored as text or as minutes since 1970-01-01
+(date_storage.py), WEEK_SQL computes the week for both.
+"""
+from datetime import date
+
+WEEK_START = date(1969, 12, 29)
+# minutes from WEEK_START to 1970-01-01 and in a week
+_EPOCH_OFFSET = 3 * 24 * 60
+_WEEK_MINUTES = 7 * 24 * 60
+
+WEEK_SQL = f"""
+CASE typeof({{date}})
+WHEN 'integer' THEN ({{date}} + {_EPOCH_OFFSET}) / {_WEEK_MINUTES}
+ELSE CAST((julianday(date({{date}})) - julianday('{WEEK_START}')) / 7 AS INTEGER)
+END
+"""
+
+_USER_ID_SQL = "(SELECT id FROM users WHERE first_name = {row}.first_name AND last_name = {row}.last_name)"
+
+_COUNT_SQL = f"""
+INSERT OR IGNORE INTO users (first_name, last_name) VALUES (NEW.first_name, NEW.last_name);
+INSERT INTO user_weeks (user_id, week, reservations)
+VALUES ({_USER_ID_SQL.format(row='NEW')}, {WEEK_SQL.format(date='NEW.start_date')}, 1)
+ON CONFLICT (user_id, week) DO UPDATE SET reservations = reservations + 1;
+"""
+
+_UNCOUNT_SQL = f"""
+UPDATE user_weeks SET reservations = reservations - 1
+WHERE user_id = {_USER_ID_SQL.format(row='OLD')} AND week = {WEEK_SQL.format(date='OLD.start_date')};
+DELETE FROM user_weeks
+WHERE user_id = {_USER_ID_SQL.format(row='OLD')} AND week = {WEEK_SQL.format(date='OLD.start_date')}
+AND reservations <= 0;
+"""
+
+TRIGGERS = {
+    'reservations_count_insert': f"AFTER INSERT ON reservations BEGIN {_COUNT_SQL} END",
+    'reservations_count_delete': f"AFTER DELETE ON reservations BEGIN {_UNCOUNT_SQL} END",
+    'reservations_count_update': (
+        "AFTER UPDATE OF first_name, last_name, start_date ON reservations "
+        f"BEGIN {_UNCOUNT_SQL} {_COUNT_SQL} END"
+    ),
+}
+
+_COUNTED_SQL = f"""
+SELECT users.id, {WEEK_SQL.format(date='reservations.start_date')} AS week, COUNT(*)
+FROM reservations JOIN users USING (first_name, last_name)
+GROUP BY users.id, week
+"""
+
+
+def week_of(day):
+    return (day.date() - WEEK_START).days // 7
+
+
+def create_counters(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        UNIQUE (first_name, last_name)
+        )
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_weeks (
+        user_id INTEGER NOT NULL REFERENCES users (id),
+        week INTEGER NOT NULL,
+        reservations INTEGER NOT NULL,
+        PRIMARY KEY (user_id, week)
+        ) WITHOUT ROWID
+        """
+    )
+    for name, body in TRIGGERS.items():
+        db.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    rebuild_counters(db)
+
+
+def check_counters(db):
+    """
+    The function compares user_weeks with the reservations and returns the differences
+    as (user_id, week, stored, counted) tuples, an empty list when the counters are right.
+    """
+    stored = {(user_id, week): count for user_id, week, count in db.execute(
+        "SELECT user_id, week, reservations FROM user_weeks"
+    )}
+    counted = {(user_id, week): count for user_id, week, count in db.execute(_COUNTED_SQL)}
+    return [
+        (user_id, week, stored.get((user_id, week), 0), counted.get((user_id, week), 0))
+        for user_id, week in sorted(stored.keys() | counted.keys())
+        if stored.get((user_id, week), 0) != counted.get((user_id, week), 0)
+    ]
+
+
+def rebuild_counters(db):
+    """
+    The function fills users and user_weeks again from the reservations.
+    It does not commit, the caller decides about the transaction.
+    """
+    db.execute(
+        "INSERT OR IGNORE INTO users (first_name, last_name) SELECT DISTINCT first_name, last_name FROM reservations"
+    )
+    db.execute("DELETE FROM user_weeks")
+    db.execute(f"INSERT INTO user_weeks (user_id, week, reservations) {_COUNTED_SQL}")
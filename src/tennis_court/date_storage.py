@@ -0,0 +1,78 @@
+"""
+Converters between datetime and the value stored in the start_date / end_date columns.
+
+* text    - "%Y-%m-%d %H:%M" strings, the original format,
+* minutes - integer minutes since 1970-01-01, so range comparisons are integer compares
+            and reading a row back needs no strptime.
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+class TextDates:
+    name = 'text'
+
+    # isoformat is "%Y-%m-%d %H:%M" and several times faster than strftime and strptime
+    def encode(self, date):
+        return date.isoformat(' ', 'minutes')
+
+    def decode(self, value):
+        return datetime.fromisoformat(value)
+
+
+class MinuteDates:
+    name = 'minutes'
+
+    def encode(self, date):
+        return (date - EPOCH) // MINUTE
+
+    def decode(self, value):
+        return EPOCH + MINUTE * value
+
+
+DATE_STORAGES = {storage.name: storage for storage in (TextDates(), MinuteDates())}
+DEFAULT_DATE_STORAGE = TextDates.name
+# tables with start_date and end_date columns, see migrations.py
+DATE_TABLES = ('reservations', 'reservations_archive')
+
+
+def get_date_storage(name):
+    try:
+        return DATE_STORAGES[name]
+    except KeyError:
+        raise ValueError(f"Unknown date storage: {name}. Choose one of: {', '.join(DATE_STORAGES)}")
+
+
+def read_date_storage(db):
+    res = db.execute("SELECT value FROM settings WHERE key = 'date_storage'").fetchone()
+    return get_date_storage(res[0] if res else DEFAULT_DATE_STORAGE)
+
+
+def convert_date_storage(db, target):
+    """
+    The function rewrites all reservation dates into the target storage in one transaction.
+    """
+    source = read_date_storage(db)
+    if source.name == target.name:
+        return target
+
+    convert = lambda value: target.encode(source.decode(value))
+    db.execute("BEGIN")
+    try:
+        for table in DATE_TABLES:
+            rows = db.execute(f"SELECT id, start_date, end_date FROM {table}").fetchall()
+            db.executemany(
+                f"UPDATE {table} SET start_date = ?, end_date = ? WHERE id = ?",
+                ((convert(start_date), convert(end_date), id_) for id_, start_date, end_date in rows)
+            )
+        db.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('date_storage', ?)", (target.name,)
+        )
+    except sqlite3.Error:
+        db.rollback()
+        raise
+    db.commit()
+    return target
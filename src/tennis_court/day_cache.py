@@ -0,0 +1,87 @@
+"""
+Bounded LRU cache of the reservations of a day.
+
+An interactive session asks about the same few days again and again: the schedule, the availability,
+the suggestion and the options of a date outside of the slot index. DataBase keeps the decoded
+reservations of the recently used days here, invalidates the days touched by its own writes
+and drops everything when PRAGMA data_version shows a write of another connection.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+DAY_CACHE_SIZE = 64
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def days_between(start_date, end_date):
+    """
+    The function returns the days overlapped by the period from start_date to end_date.
+    """
+    day = start_date.date()
+    last_day = max(end_date - timedelta(microseconds=1), start_date).date()
+    days = []
+    while day <= last_day:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def day_period(day):
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+class DayCache:
+
+    def __init__(self, maxsize=DAY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._days = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, day):
+        """
+        The function returns the cached reservations of the day or None.
+        """
+        with self._lock:
+            reservations = self._days.get(day)
+            if reservations is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._days.move_to_end(day)
+            return reservations
+
+    def put(self, day, reservations):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._days[day] = tuple(reservations)
+            self._days.move_to_end(day)
+            while len(self._days) > self.maxsize:
+                self._days.popitem(last=False)
+
+    def invalidate(self, start_date, end_date):
+        """
+        The function drops the days overlapped by a reservation from start_date to end_date.
+        """
+        with self._lock:
+            for day in days_between(start_date, end_date):
+                self._days.pop(day, None)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._days))
@@ -0,0 +1,64 @@
+"""
+Writers used by DataBase.save_as_csv and DataBase.save_as_json.
+
+Rows are written as they come, so an export needs the same memory for a day and for years.
+A file is written next to its destination under a temporary name and renamed when it is complete,
+a reader never sees half of it. With compress=True the file is gzipped and gets a .gz suffix.
+"""
+import csv
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+CSV_HEADER = ['name', 'start_date', 'end_date']
+
+
+@contextmanager
+def open_atomic(path, compress=False):
+    """
+    The function opens a temporary text file, which replaces the path when the block ends without an error.
+    """
+    if compress:
+        path += '.gz'
+    # unique for every writer, so concurrent exports of the same file do not mix
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    opener = gzip.open if compress else open
+    try:
+        with opener(temp_path, 'wt', encoding='utf8', newline='') as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_csv(path, batches, compress=False):
+    """
+    The function writes the header and then batches of (name, start_date, end_date) rows,
+    it returns the path of the written file.
+    """
+    with open_atomic(path, compress) as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        for rows in batches:
+            writer.writerows(rows)
+    return path + '.gz' if compress else path
+
+
+def write_json(path, items, compress=False):
+    """
+    The function writes (key, value) items as one JSON object, item by item.
+    The output is the same as json.dump(dict(items), file, indent=2, ensure_ascii=False).
+    """
+    with open_atomic(path, compress) as file:
+        separator = '{\n  '
+        for key, value in items:
+            file.write(separator)
+            file.write(json.dumps(key, ensure_ascii=False) + ': ')
+            file.write(json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+            separator = ',\n  '
+        file.write('{}' if separator == '{\n  ' else '\n}')
+    return path + '.gz' if compress else path
@@ -0,0 +1,175 @@
+"""
+Import of the files written by DataBase.save_as_csv and DataBase.save_as_json.
+
+The files are streamed: rows are parsed one by one and loaded with DataBase.add_many in batches,
+so memory does not grow with the size of the file.
+"""
+import csv
+import gzip
+import json
+from datetime import datetime
+
+BATCH_SIZE = 10000
+CHUNK_SIZE = 1 << 16
+
+
+def parse_date(text):
+    """
+    The function parses "DD.MM.YYYY HH:MM" (change_date_format) into a datetime.
+    """
+    if len(text) == 16 and text[2] == text[5] == '.' and text[10] == ' ' and text[13] == ':':
+        # reordering into ISO format is several times faster than strptime for millions of rows
+        return datetime.fromisoformat(text[6:10] + '-' + text[3:5] + '-' + text[0:2] + text[10:])
+    return datetime.strptime(text, "%d.%m.%Y %H:%M")
+
+
+def split_name(name):
+    first_name, _, last_name = name.partition(' ')
+    return first_name, last_name
+
+
+def read_csv(file):
+    """
+    The function yields (first_name, last_name, start_date, end_date) or None for a row which cannot be parsed.
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header != ['name', 'start_date', 'end_date']:
+        raise ValueError(f"Unexpected CSV header: {header}")
+
+    for row in reader:
+        if not row:
+            continue
+        try:
+            name, start_date, end_date = row
+            yield (*split_name(name), parse_date(start_date), parse_date(end_date))
+        except ValueError:
+            yield None
+
+
+def iter_json_object(file, chunk_size=CHUNK_SIZE):
+    """
+    The function yields (key, value) pairs of the top-level JSON object reading the file chunk by chunk,
+    only one value is kept in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    end_of_file = False
+
+    def read_more():
+        nonlocal buffer, position, end_of_file
+        chunk = file.read(chunk_size)
+        end_of_file = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or end_of_file:
+                return
+            read_more()
+
+    def expect(characters):
+        nonlocal position
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise ValueError(f"Expected one of {characters!r} in the JSON file.")
+        position += 1
+        return buffer[position - 1]
+
+    def decode():
+        nonlocal position
+        skip_whitespace()
+        while True:
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+                return value
+            except json.JSONDecodeError:
+                # the value may continue in the next chunk
+                if end_of_file:
+                    raise
+                read_more()
+
+    expect('{')
+    skip_whitespace()
+    if position < len(buffer) and buffer[position] == '}':
+        return
+    while True:
+        key = decode()
+        expect(':')
+        yield key, decode()
+        if expect(',}') == '}':
+            return
+
+
+def read_json(file, year):
+    """
+    The function yields reservations like read_csv. The file keeps only day and month ("DD.MM"),
+    the days are counted from the given year, moving to the next year when the dates go back.
+    """
+    previous_day = None
+    for key, reservations in iter_json_object(file):
+        try:
+            day = datetime.strptime(f"{key}.{year}", "%d.%m.%Y")
+        except ValueError:
+            yield from (None for _ in reservations)
+            continue
+        if previous_day and day < previous_day:
+            year += 1
+            day = day.replace(year=year)
+        previous_day = day
+
+        for reservation in reservations:
+            try:
+                start_date = datetime.strptime(reservation['start_time'], "%H:%M")
+                end_date = datetime.strptime(reservation['end_time'], "%H:%M")
+                yield (
+                    *split_name(reservation['name']),
+                    day.replace(hour=start_date.hour, minute=start_date.minute),
+                    day.replace(hour=end_date.hour, minute=end_date.minute),
+                )
+            except (KeyError, TypeError, ValueError):
+                yield None
+
+
+def import_file(db, path, year=None, batch_size=BATCH_SIZE):
+    """
+    The function loads a .csv or .json file, gzipped or not, into the database and returns the counts:
+    imported, conflict (overlapping reservations) and invalid (unreadable rows or outside the opening hours).
+    """
+    open_hour = datetime.strptime(db.open_hour, "%H:%M").time()
+    close_hour = datetime.strptime(db.close_hour, "%H:%M").time()
+    summary = {'imported': 0, 'conflict': 0, 'invalid': 0}
+
+    def load(batch):
+        for booking in db.add_many(batch):
+            summary['imported' if booking.booked else booking.reason] += 1
+        batch.clear()
+
+    path = str(path)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf8', newline='') as file:
+        if path.removesuffix('.gz').endswith('.json'):
+            rows = read_json(file, year or datetime.today().year)
+        else:
+            rows = read_csv(file)
+
+        batch = []
+        for row in rows:
+            if (
+                row is None or not row[0] or not row[1]
+                or row[2].date() != row[3].date()
+                or row[2].time() < open_hour or row[3].time() > close_hour
+            ):
+                summary['invalid'] += 1
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                load(batch)
+        load(batch)
+
+    return summary
@@ -0,0 +1,119 @@
+"""
+Counters and latency histograms of the menu, written as a Prometheus textfile.
+
+TennisCourtApp counts every menu action and booking outcome in a Metrics object. A MetricsWriter thread
+writes them every few seconds in the Prometheus text format to a file, which the textfile collector
+of node exporter picks up, so the application needs no network service of its own. The file is replaced
+atomically, a scrape never reads half of it.
+"""
+import threading
+from bisect import bisect_left
+
+DEFAULT_METRICS_INTERVAL = 15.0
+# upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+ACTIONS_TOTAL = 'tennis_court_menu_actions_total'
+ACTION_SECONDS = 'tennis_court_menu_action_duration_seconds'
+OUTCOMES_TOTAL = 'tennis_court_booking_outcomes_total'
+
+HELP = {
+    ACTIONS_TOTAL: 'Menu actions finished, by action.',
+    ACTION_SECONDS: 'Time of a menu action without the time spent waiting for the user, by action.',
+    OUTCOMES_TOTAL: 'Outcomes of the reservations and cancellations, by outcome.',
+}
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Histogram:
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._histograms.setdefault(key, Histogram()).observe(value)
+
+    def value(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def render(self):
+        """
+        The function returns the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._counters}):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+                for (key_name, labels), value in sorted(self._counters.items()):
+                    if key_name == name:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+
+            for name in sorted({name for name, _ in self._histograms}):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                for (key_name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if key_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        from .export import open_atomic
+        with open_atomic(path) as file:
+            file.write(self.render())
+
+
+class MetricsWriter:
+    """
+    A daemon thread writing the metrics to the textfile every interval seconds and once more when stopped.
+    """
+
+    def __init__(self, metrics, path, interval=DEFAULT_METRICS_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-writer', daemon=True)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.metrics.write_textfile(self.path)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.metrics.write_textfile(self.path)
@@ -0,0 +1,142 @@
+"""
+Versioned schema of the tennis court database.
+
+Every migration upgrades the schema by one version. The current version is kept in `PRAGMA user_version`,
+so an existing database file is upgraded in place the next time it is opened.
+"""
+from .counters import create_counters
+from .series import create_series
+
+
+def create_reservations(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservations (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        start_date DATETIME NOT NULL,
+        end_date NOT NULL
+        )
+        """
+    )
+
+
+def add_reservation_indexes(db):
+    # availability checks and schedules
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS reservations_dates_idx ON reservations (start_date, end_date)"
+    )
+    # weekly quota and cancel
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS reservations_user_idx ON reservations (last_name, first_name, start_date)"
+    )
+
+
+def create_settings(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+        )
+        """
+    )
+    # databases created before the settings table keep dates as text
+    db.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('date_storage', 'text')")
+
+
+def create_archive(db):
+    # reservations moved out of the live table by DataBase.archive
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservations_archive (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        start_date DATETIME NOT NULL,
+        end_date NOT NULL
+        )
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS reservations_archive_dates_idx ON reservations_archive (start_date, end_date)"
+    )
+
+
+DEFAULT_COURT = 1
+
+
+def create_courts(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS courts (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+        )
+        """
+    )
+    # the reservations made before there were more courts are on the first one
+    db.execute("INSERT OR IGNORE INTO courts (id, name) VALUES (?, 'Court 1')", (DEFAULT_COURT,))
+    for table in ('reservations', 'reservations_archive'):
+        db.execute(
+            f"ALTER TABLE {table} ADD COLUMN court_id INTEGER NOT NULL DEFAULT {DEFAULT_COURT} REFERENCES courts (id)"
+        )
+
+
+def create_waitlist(db):
+    # users waiting for a taken period, booked by DataBase.cancel when it is freed;
+    # the dates are text like the ones of the series (series.py)
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS waitlist (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        court_id INTEGER NOT NULL REFERENCES courts (id),
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL
+        )
+        """
+    )
+    # the waiters of a freed period, a user waits once for a start
+    db.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS waitlist_slot_idx ON waitlist (court_id, start_date, last_name, first_name)"
+    )
+
+
+MIGRATIONS = [
+    create_reservations,
+    add_reservation_indexes,
+    create_settings,
+    # users and their weekly counters, see counters.py
+    create_counters,
+    create_archive,
+    create_courts,
+    # weekly reservation series, see series.py
+    create_series,
+    create_waitlist,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(db):
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db):
+    """
+    The function applies the missing migrations, each one in its own transaction.
+    """
+    version = get_version(db)
+    for number, migration in enumerate(MIGRATIONS[version:], version + 1):
+        db.execute("BEGIN")
+        try:
+            migration(db)
+            db.execute(f"PRAGMA user_version = {number}")
+        except Exception:
+            db.rollback()
+            raise
+        db.commit()
+    return get_version(db)
@@ -0,0 +1,312 @@
+"""
+Opt-in profiler of the SQL statements and the DataBase calls.
+
+DataBase(profiler=QueryProfiler()) opens its connections with ProfiledConnection, whose cursors time
+every execute and the fetches of its rows. For every statement the profiler keeps the count, the total
+and percentile latency and the rows returned, the public DataBase methods are timed the same way.
+A statement slower than slow_ms gets its EXPLAIN QUERY PLAN captured once and, with slow_log,
+a JSON line appended to the log file. The application enables it with environment variables (app.py).
+"""
+import contextvars
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+DEFAULT_SLOW_QUERY_MS = 50.0
+# latencies kept per statement for the percentiles
+SAMPLES = 10000
+EXPLAINED = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+# the DataBase method running in the current thread or task
+_current_call = contextvars.ContextVar('current_call', default=None)
+
+
+def normalize(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class Timing:
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=SAMPLES)
+        self.callers = Counter()
+
+    def add(self, seconds, rows=0, caller=None):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.samples.append(seconds)
+        if caller:
+            self.callers[caller] += 1
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1e3, 3),
+            'mean_ms': round(self.total / self.count * 1e3, 3) if self.count else 0.0,
+            'p50_ms': round(percentile(self.samples, 0.5) * 1e3, 3),
+            'p95_ms': round(percentile(self.samples, 0.95) * 1e3, 3),
+            'p99_ms': round(percentile(self.samples, 0.99) * 1e3, 3),
+            'max_ms': round(self.max * 1e3, 3),
+            'rows': self.rows,
+            'callers': dict(self.callers),
+        }
+
+
+class QueryProfiler:
+
+    def __init__(self, slow_ms=DEFAULT_SLOW_QUERY_MS, slow_log=None):
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._statements = {}
+        self._calls = {}
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def connection_factory(self):
+        """
+        The function returns the factory argument of sqlite3.connect.
+        """
+        return functools.partial(ProfiledConnection, profiler=self)
+
+    def record_statement(self, connection, sql, parameters, seconds, rows):
+        sql = normalize(sql)
+        caller = _current_call.get()
+        with self._lock:
+            self._statements.setdefault(sql, Timing()).add(seconds, rows, caller)
+            slow = seconds * 1e3 >= self.slow_ms
+            # the parameters of executemany are not kept, its statements are not explained
+            explain = (
+                slow and parameters is not None and sql not in self._plans and sql.upper().startswith(EXPLAINED)
+            )
+        if not slow:
+            return
+
+        if explain:
+            try:
+                plan = [
+                    row[3] for row in sqlite3.Connection.execute(connection, 'EXPLAIN QUERY PLAN ' + sql, parameters)
+                ]
+            except sqlite3.Error as error:
+                plan = [f"EXPLAIN QUERY PLAN failed: {error}"]
+            with self._lock:
+                self._plans[sql] = plan
+
+        if self.slow_log:
+            entry = {
+                'time': datetime.now().isoformat(timespec='milliseconds'),
+                'ms': round(seconds * 1e3, 3),
+                'rows': rows,
+                'call': caller,
+                'sql': sql,
+                'plan': self._plans.get(sql),
+            }
+            with self._lock, open(self.slow_log, 'a', encoding='utf8') as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def record_call(self, name, seconds):
+        with self._lock:
+            self._calls.setdefault(name, Timing()).add(seconds)
+
+    def watch(self, obj):
+        """
+        The function times the public methods of obj, the statements they run are attributed to them.
+        """
+        # the class is inspected, so no property of obj is evaluated
+        for name, _ in inspect.getmembers(type(obj), inspect.isfunction):
+            if not name.startswith('_'):
+                setattr(obj, name, self._wrap(name, getattr(obj, name)))
+
+    def _wrap(self, name, method):
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def generator(*args, **kwargs):
+                seconds = 0.0
+                iterator = method(*args, **kwargs)
+                try:
+                    while True:
+                        token = _current_call.set(name)
+                        start = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                        finally:
+                            seconds += time.perf_counter() - start
+                            _current_call.reset(token)
+                        yield item
+                finally:
+                    self.record_call(name, seconds)
+            return generator
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            token = _current_call.set(name)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record_call(name, time.perf_counter() - start)
+                _current_call.reset(token)
+        return wrapper
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': {name: timing.summary() for name, timing in self._calls.items()},
+                'statements': {sql: timing.summary() for sql, timing in self._statements.items()},
+                'plans': dict(self._plans),
+            }
+
+    def report(self):
+        """
+        The function returns the profile as text, the slowest statements and calls first.
+        """
+        stats = self.stats()
+        header = f"{'count':>8} {'total ms':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'rows':>8}  "
+        line = lambda summary: (
+            f"{summary['count']:>8} {summary['total_ms']:>10.2f} {summary['p50_ms']:>8.3f} {summary['p95_ms']:>8.3f} "
+            f"{summary['p99_ms']:>8.3f} {summary['max_ms']:>8.3f} {summary['rows']:>8}  "
+        )
+        by_total = lambda items: sorted(items, key=lambda item: item[1]['total_ms'], reverse=True)
+
+        text = [f"Query profile {datetime.now():%Y-%m-%d %H:%M:%S}", '', 'DataBase calls:', header + 'call']
+        text += [line(summary) + name for name, summary in by_total(stats['calls'].items())]
+        text += ['', 'Statements:', header + 'statement']
+        for sql, summary in by_total(stats['statements'].items()):
+            text.append(line(summary) + sql)
+            if summary['callers']:
+                text.append(' ' * len(header) + 'from ' + ', '.join(
+                    f"{caller} ({count})" for caller, count in Counter(summary['callers']).most_common()
+                ))
+        if stats['plans']:
+            text += ['', f"Plans of the statements slower than {self.slow_ms} ms:"]
+            for sql, plan in stats['plans'].items():
+                text += [sql] + ['    ' + step for step in plan]
+        return '\n'.join(text) + '\n'
+
+    def dump(self, path):
+        """
+        The function writes the report to the file, '-' is the standard error.
+        """
+        if path == '-':
+            sys.stderr.write(self.report())
+            return
+        with open(path, 'w', encoding='utf8') as file:
+            file.write(self.report())
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    The cursor times every execute and the fetches of its rows, an execution is recorded
+    when its rows are exhausted, on the next execute or when the cursor is closed.
+    """
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._execution = None
+
+    def _finish(self):
+        if self._execution:
+            sql, parameters, seconds, rows = self._execution
+            self._execution = None
+            self.connection.profiler.record_statement(self.connection, sql, parameters, seconds, rows)
+
+    def _timed(self, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            if self._execution:
+                self._execution[2] += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        self._execution = [sql, parameters, 0.0, 0]
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        self._execution = [sql, None, 0.0, 0]
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._execution:
+            self._execution[3] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if not rows:
+            self._finish()
+        elif self._execution:
+            self._execution[3] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._execution:
+            self._execution[3] += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._execution:
+            self._execution[3] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class ProfiledConnection(sqlite3.Connection):
+
+    def __init__(self, *args, profiler, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profiler = profiler
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,224 @@
+"""
+Named SQL statements used by DataBase.
+
+Every statement takes its values as ? parameters, so the SQL text of a statement is the same on every call
+and sqlite3 finds the prepared statement in the statement cache of the connection instead of parsing
+and planning it again. Dates are passed encoded by the date storage of the database (date_storage.py).
+The reservations of one court are selected by its court_id, passed as the last parameter.
+A reservation is not longer than a day (DataBase rejects longer ones), so the statements selecting
+the reservations overlapping a period take from_date - a day as the earliest start: the index of start_date
+is searched by a range instead of from the first reservation of the history.
+"""
+
+DATA_VERSION = "PRAGMA data_version"
+
+# (key), see migrations.py
+SELECT_SETTING = "SELECT value FROM settings WHERE key = ?;"
+
+# (key, value)
+SET_SETTING = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?);"
+
+# (to_date, earliest start, from_date, court_id), reservations overlapping the period
+SELECT_PERIODS = """
+SELECT start_date, end_date FROM reservations
+WHERE start_date < ? AND start_date > ? AND end_date > ? AND court_id = ?;
+"""
+
+SELECT_OVERLAPPING = """
+SELECT first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date < ? AND start_date > ? AND end_date > ? AND court_id = ?
+LIMIT 1;
+"""
+
+SELECT_OVERLAPPING_ALL = """
+SELECT first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date < ? AND start_date > ? AND end_date > ? AND court_id = ?
+ORDER BY start_date;
+"""
+
+# (to_date, earliest start, from_date), reservations of all courts overlapping the period
+SELECT_COURT_PERIODS = """
+SELECT court_id, start_date, end_date FROM reservations
+WHERE start_date < ? AND start_date > ? AND end_date > ?
+ORDER BY start_date;
+"""
+
+# the *_ARCHIVE statements take the same parameters as the ones above them and read the archived
+# reservations as well, they are used for the periods before the archive boundary (DataBase.archive)
+SELECT_OVERLAPPING_ARCHIVE = """
+SELECT first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date < ?1 AND start_date > ?2 AND end_date > ?3 AND court_id = ?4
+UNION ALL
+SELECT first_name, last_name, start_date, end_date FROM reservations_archive
+WHERE start_date < ?1 AND start_date > ?2 AND end_date > ?3 AND court_id = ?4
+LIMIT 1;
+"""
+
+SELECT_OVERLAPPING_ALL_ARCHIVE = """
+SELECT first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date < ?1 AND start_date > ?2 AND end_date > ?3 AND court_id = ?4
+UNION ALL
+SELECT first_name, last_name, start_date, end_date FROM reservations_archive
+WHERE start_date < ?1 AND start_date > ?2 AND end_date > ?3 AND court_id = ?4
+ORDER BY start_date;
+"""
+
+# (from_date, to_date, first_name, last_name)
+COUNT_USER_RESERVATIONS = """
+SELECT COUNT (*) FROM reservations
+WHERE start_date > ? AND start_date < ?
+AND first_name = ? AND last_name = ?;
+"""
+
+# (first_name, last_name, from_week, to_week), reservations of the user in the weeks, see counters.py
+SUM_USER_WEEKS = """
+SELECT COALESCE(SUM(user_weeks.reservations), 0)
+FROM users JOIN user_weeks ON user_weeks.user_id = users.id
+WHERE users.first_name = ? AND users.last_name = ? AND user_weeks.week BETWEEN ? AND ?;
+"""
+
+# (from_day, to_day, court_id), reservations starting in the days
+SELECT_SCHEDULE = """
+SELECT id, first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date >= ? AND start_date < ? AND court_id = ?
+ORDER BY start_date;
+"""
+
+SELECT_SCHEDULE_ARCHIVE = """
+SELECT id, first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date >= ?1 AND start_date < ?2 AND court_id = ?3
+UNION ALL
+SELECT id, first_name, last_name, start_date, end_date FROM reservations_archive
+WHERE start_date >= ?1 AND start_date < ?2 AND court_id = ?3
+ORDER BY start_date;
+"""
+
+SELECT_EXPORT = """
+SELECT id, first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date >= ? AND end_date < ? AND court_id = ?
+ORDER BY start_date;
+"""
+
+SELECT_EXPORT_ARCHIVE = """
+SELECT id, first_name, last_name, start_date, end_date FROM reservations
+WHERE start_date >= ?1 AND end_date < ?2 AND court_id = ?3
+UNION ALL
+SELECT id, first_name, last_name, start_date, end_date FROM reservations_archive
+WHERE start_date >= ?1 AND end_date < ?2 AND court_id = ?3
+ORDER BY start_date;
+"""
+
+INSERT_RESERVATION = """
+INSERT INTO reservations (first_name, last_name, start_date, end_date, court_id)
+VALUES (?, ?, ?, ?, ?);
+"""
+
+# (start_date, first_name, last_name, court_id)
+SELECT_RESERVATION = """
+SELECT * FROM reservations
+WHERE start_date = ? AND first_name = ? AND last_name = ? AND court_id = ?;
+"""
+
+DELETE_RESERVATION = """
+DELETE FROM reservations
+WHERE start_date = ? AND first_name = ? AND last_name = ? AND court_id = ?;
+"""
+
+SELECT_COURTS = "SELECT id, name FROM courts ORDER BY id;"
+
+# (name)
+INSERT_COURT = "INSERT INTO courts (name) VALUES (?);"
+
+# (before, batch size - 1), start_date of the last reservation of the next archive batch
+SELECT_ARCHIVE_BATCH_END = """
+SELECT start_date FROM reservations
+WHERE start_date < ?1 AND end_date <= ?1
+ORDER BY start_date
+LIMIT 1 OFFSET ?2;
+"""
+
+# (before, batch end), reservations ended before the boundary and starting up to the batch end
+ARCHIVE_RESERVATIONS = """
+INSERT INTO reservations_archive (first_name, last_name, start_date, end_date, court_id)
+SELECT first_name, last_name, start_date, end_date, court_id FROM reservations
+WHERE start_date < ?1 AND end_date <= ?1 AND start_date <= ?2;
+"""
+
+DELETE_ARCHIVED = """
+DELETE FROM reservations
+WHERE start_date < ?1 AND end_date <= ?1 AND start_date <= ?2;
+"""
+
+# the series, see series.py; their dates are text whatever the date storage
+
+# (court_id, to_date, from_date), the rules of the court which may have occurrences overlapping the period
+# and not yet expanded into reservations
+SELECT_SERIES_PERIODS = """
+SELECT first_name, last_name, start_date, end_date, until_date, expanded_until FROM series
+WHERE court_id = ?1 AND until_date >= ?3 AND start_date < ?2 AND expanded_until < ?2;
+"""
+
+# (first_name, last_name, from_date, to_date), the rules of the user, for the quota
+SELECT_USER_SERIES = """
+SELECT start_date, end_date, until_date, expanded_until FROM series
+WHERE first_name = ?1 AND last_name = ?2 AND until_date >= ?3 AND start_date < ?4 AND expanded_until < ?4;
+"""
+
+# (first_name, last_name, from_week, to_week), the counters of the user in the weeks, see counters.py
+SELECT_USER_WEEKS = """
+SELECT user_weeks.week, user_weeks.reservations
+FROM users JOIN user_weeks ON user_weeks.user_id = users.id
+WHERE users.first_name = ? AND users.last_name = ? AND user_weeks.week BETWEEN ? AND ?;
+"""
+
+# (until), the rules with occurrences starting before until which are not reservations yet
+SELECT_SERIES_TO_EXPAND = """
+SELECT id, first_name, last_name, court_id, start_date, end_date, until_date, expanded_until FROM series
+WHERE expanded_until < ?1 AND until_date >= expanded_until;
+"""
+
+# (expanded_until, id)
+SET_SERIES_EXPANDED = "UPDATE series SET expanded_until = ? WHERE id = ?;"
+
+# (first_name, last_name, court_id, start_date, end_date, until_date, expanded_until)
+INSERT_SERIES = """
+INSERT INTO series (first_name, last_name, court_id, start_date, end_date, until_date, expanded_until)
+VALUES (?, ?, ?, ?, ?, ?, ?);
+"""
+
+# (start_date, first_name, last_name, court_id), a series by its first occurrence
+SELECT_SERIES = """
+SELECT id, end_date, until_date, expanded_until FROM series
+WHERE start_date = ? AND first_name = ? AND last_name = ? AND court_id = ?;
+"""
+
+# (id)
+DELETE_SERIES = "DELETE FROM series WHERE id = ?;"
+
+# the waitlist, see migrations.py; its dates are text like the ones of the series
+
+# (first_name, last_name, court_id, start_date, end_date)
+INSERT_WAITER = """
+INSERT OR IGNORE INTO waitlist (first_name, last_name, court_id, start_date, end_date)
+VALUES (?, ?, ?, ?, ?);
+"""
+
+# (court_id, start_date, first_name, last_name)
+DELETE_WAITER = """
+DELETE FROM waitlist
+WHERE court_id = ? AND start_date = ? AND first_name = ? AND last_name = ?;
+"""
+
+# (court_id, from_date, to_date, freed_from), the waiters for the periods starting from from_date
+# and overlapping the freed period from freed_from to to_date, the earliest first
+SELECT_WAITERS = """
+SELECT id, first_name, last_name, start_date, end_date FROM waitlist
+WHERE court_id = ?1 AND start_date >= ?2 AND start_date < ?3 AND end_date > ?4
+ORDER BY id;
+"""
+
+# (id)
+DELETE_WAITER_BY_ID = "DELETE FROM waitlist WHERE id = ?;"
+
+# (court_id, now), the waiters of the periods which have started
+DELETE_PAST_WAITERS = "DELETE FROM waitlist WHERE court_id = ? AND start_date < ?;"
@@ -0,0 +1,59 @@
+"""
+Weekly reservation series, e.g. every Tuesday 18:00 - 19:30 until the end of June.
+
+A series is stored as a rule: its first occurrence, the last day an occurrence may start on and
+expanded_until. The occurrences starting before expanded_until are ordinary reservations, so the slot index,
+the schedules and the weekly counters (counters.py) see them; DataBase expands the rules lazily, when the
+booking window moves past expanded_until. The later occurrences exist only as the rule, DataBase checks
+the bookings and the quota beyond the window against them.
+
+The dates of the rules are 'YYYY-MM-DD HH:MM' text whatever the date storage of the reservations.
+"""
+from datetime import datetime, timedelta
+
+WEEK = timedelta(weeks=1)
+
+
+def create_series(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS series (
+        id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        court_id INTEGER NOT NULL REFERENCES courts (id),
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        until_date TEXT NOT NULL,
+        expanded_until TEXT NOT NULL
+        )
+        """
+    )
+    # the rules overlapping a period of a court
+    db.execute("CREATE INDEX IF NOT EXISTS series_court_idx ON series (court_id, until_date)")
+    # the quota and cancel
+    db.execute("CREATE INDEX IF NOT EXISTS series_user_idx ON series (last_name, first_name, start_date)")
+
+
+def to_text(date):
+    return date.isoformat(' ', 'minutes')
+
+
+def from_text(text):
+    return datetime.fromisoformat(text)
+
+
+def occurrences(start_date, end_date, until, from_date=None, to_date=None):
+    """
+    The function yields the (start_date, end_date) of the occurrences of a series starting up to until,
+    only the ones overlapping the period from from_date to to_date when they are given.
+    """
+    length = end_date - start_date
+    week = 0
+    if from_date is not None:
+        # the first occurrence ending after from_date
+        week = max((from_date - length - start_date) // WEEK + 1, 0)
+    start = start_date + WEEK * week
+    while start <= until and (to_date is None or start < to_date):
+        yield start, start + length
+        start += WEEK
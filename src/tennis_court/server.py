@@ -0,0 +1,115 @@
+"""
+Multi-session server: every TCP client gets its own TennisCourtApp menu, line by line.
+
+The menu is blocking code, so each session runs in a worker thread and talks to the event loop
+through the TennisCourtApp io hook. All sessions share one pooled DataBase, the event loop itself
+only reads and writes lines.
+"""
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from .app import TennisCourtApp, make_profiler, make_metrics_writer
+from .config import get_config
+from .control_db import DataBase
+from .metrics import Metrics
+
+
+class Session:
+    """
+    The io pair of one client: input() is called from the worker thread, output() is sent by the event loop.
+    """
+
+    def __init__(self, loop, writer):
+        self._loop = loop
+        self._writer = writer
+        self._lines = queue.Queue()
+
+    def feed(self, line):
+        # None - the client has disconnected
+        self._lines.put(line)
+
+    def input(self):
+        line = self._lines.get()
+        if line is None:
+            raise EOFError
+        return line
+
+    def output(self, text):
+        self._loop.call_soon_threadsafe(self._write, text.encode('utf8'))
+
+    def _write(self, data):
+        if not self._writer.is_closing():
+            self._writer.write(data)
+
+
+class MenuServer:
+
+    def __init__(self, db, executor, metrics=None):
+        self.db = db
+        self.executor = executor
+        # one set of metrics for all sessions
+        self.metrics = metrics if metrics is not None else Metrics()
+
+    async def start(self, host, port):
+        """
+        The function starts accepting clients and returns the asyncio server.
+        """
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        session = Session(loop, writer)
+        app = TennisCourtApp(self.db.db_path, io=(session.input, session.output), db=self.db, metrics=self.metrics)
+        menu = loop.run_in_executor(self.executor, app.run)
+
+        async def read_lines():
+            while line := await reader.readline():
+                session.feed(line.decode('utf8').rstrip('\r\n'))
+            session.feed(None)
+
+        lines = asyncio.ensure_future(read_lines())
+        try:
+            await asyncio.wait([menu, lines], return_when=asyncio.FIRST_COMPLETED)
+            try:
+                # when the client has gone, the menu ends with EOFError
+                await menu
+            except EOFError:
+                pass
+        finally:
+            lines.cancel()
+            # wakes up the menu still waiting for input when the server stops
+            session.feed(None)
+
+        if not writer.is_closing():
+            await writer.drain()
+            writer.close()
+
+
+def run_server(host, port, path_db, pool_size=8, max_sessions=256):
+    """
+    The function serves the menu until it is interrupted.
+    """
+    config = get_config()
+    db = DataBase(config.open, config.close, path_db, config.date_storage, pool_size, profiler=make_profiler(config))
+    db.set_db()
+    executor = ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix='session')
+    menu_server = MenuServer(db, executor)
+    writer = make_metrics_writer(menu_server.metrics, config)
+
+    async def serve():
+        server = await menu_server.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if writer:
+            writer.stop()
+        if db.profiler and config.query_profile:
+            db.profiler.dump(config.query_profile)
+        db.close()
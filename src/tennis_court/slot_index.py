@@ -0,0 +1,120 @@
+"""
+In-memory occupancy bitmap of the booking window.
+
+Reservations can be made at most two weeks ahead (DataBase.has_permission_date), so the window has only
+a few hundred half-hour slots. Slot i is taken when bit i is set; the bitmap is a Python int,
+so searching for the next or the previous free slot is a couple of big-int operations instead of a query.
+For every day the index also keeps a free run table: the number of free slots from each slot
+to the end of the day, so the lengths a reservation can have are read with one lookup.
+"""
+from datetime import datetime, timedelta
+
+SLOT = timedelta(minutes=30)
+# today and the next two weeks, whole days
+WINDOW_DAYS = 15
+SLOTS_PER_DAY = timedelta(days=1) // SLOT
+
+
+class SlotIndex:
+
+    def __init__(self, start, days=WINDOW_DAYS):
+        self.start = start
+        self.size = days * (timedelta(days=1) // SLOT)
+        self.end = start + SLOT * self.size
+        self._bits = 0
+        # {day of the window: free run of every slot of the day}, computed when first needed
+        self._runs = {}
+
+    @staticmethod
+    def window_start(today):
+        return datetime.combine(today.date(), datetime.min.time())
+
+    @staticmethod
+    def is_aligned(date):
+        return date.second == 0 and date.microsecond == 0 and date.minute % 30 == 0
+
+    def slot(self, date):
+        return (date - self.start) // SLOT
+
+    def date(self, slot):
+        return self.start + SLOT * slot
+
+    def _slots(self, start_date, end_date):
+        """
+        The function returns the first and the last + 1 slot taken by the period, or None outside of the window.
+        """
+        if end_date <= self.start or start_date >= self.end:
+            return
+        first = max(self.slot(start_date), 0)
+        # a reservation ending in the middle of a slot still takes it
+        last = min(-(-(end_date - self.start) // SLOT), self.size)
+        if first >= last:
+            return
+        return first, last
+
+    def fill(self, start_date, end_date):
+        slots = self._slots(start_date, end_date)
+        if not slots:
+            return
+        first, last = slots
+        self._bits |= ((1 << (last - first)) - 1) << first
+
+        for day in range(first // SLOTS_PER_DAY, (last - 1) // SLOTS_PER_DAY + 1):
+            runs = self._runs.get(day)
+            if runs is None:
+                continue
+            day_first = max(first - day * SLOTS_PER_DAY, 0)
+            day_last = min(last - day * SLOTS_PER_DAY, SLOTS_PER_DAY)
+            runs[day_first:day_last] = [0] * (day_last - day_first)
+            # the free slots in front of the period now end at it
+            slot = day_first - 1
+            while slot >= 0 and runs[slot]:
+                runs[slot] = runs[slot + 1] + 1
+                slot -= 1
+
+    def clear(self, start_date, end_date):
+        slots = self._slots(start_date, end_date)
+        if not slots:
+            return
+        first, last = slots
+        self._bits &= ~(((1 << (last - first)) - 1) << first)
+        # the freed slots may join the runs around them, the tables of the days are computed again
+        for day in range(first // SLOTS_PER_DAY, (last - 1) // SLOTS_PER_DAY + 1):
+            self._runs.pop(day, None)
+
+    def _day_runs(self, day):
+        runs = self._runs.get(day)
+        if runs is None:
+            bits = self._bits >> day * SLOTS_PER_DAY
+            runs = [0] * (SLOTS_PER_DAY + 1)
+            for slot in range(SLOTS_PER_DAY - 1, -1, -1):
+                runs[slot] = 0 if (bits >> slot) & 1 else runs[slot + 1] + 1
+            # the last item stays 0, so the run of the last slot of the day is computed like the others
+            self._runs[day] = runs
+        return runs
+
+    def free_run(self, date):
+        """
+        The function returns the number of free slots from the date to the first taken slot or the end of the day.
+        """
+        slot = self.slot(date)
+        return self._day_runs(slot // SLOTS_PER_DAY)[slot % SLOTS_PER_DAY]
+
+    def is_free(self, date):
+        return not (self._bits >> self.slot(date)) & 1
+
+    def next_free(self, date):
+        """
+        The function returns the first free slot at or after the date, or None.
+        """
+        free = ~self._bits >> self.slot(date)
+        slot = self.slot(date) + (free & -free).bit_length() - 1
+        return self.date(slot) if slot < self.size else None
+
+    def previous_free(self, date):
+        """
+        The function returns the last free slot before the date, or None.
+        """
+        slot = self.slot(date)
+        slot = (~self._bits & ((1 << slot) - 1)).bit_length() - 1
+        return self.date(slot) if slot >= 0 else None
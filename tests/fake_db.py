@@ -68,4 +68,12 @@ class FakeDB:
             ]
         )
         self._db.commit()
-        self._db.close()
\ No newline at end of file
+        self._db.close()
+
+def remove_db(db_path=os.path.join('src', 'tennis_court', 'db', 'temp.db')):
+    """
+    The function removes the database file together with its WAL files.
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
@@ -0,0 +1,74 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase, Booking
+
+
+class TestAddMany(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime(2030, 5, 14)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def reservation(self, last_name, start, end):
+        return 'Jan', last_name, self.day + timedelta(hours=start), self.day + timedelta(hours=end)
+
+    def stored(self):
+        return self.db._db.execute("SELECT last_name FROM reservations ORDER BY start_date").fetchall()
+
+    def test_report(self):
+        self.db.add(*self.reservation('Stored', 12, 13))
+        report = self.db.add_many([
+            self.reservation('Late', 10.5, 11.5),
+            self.reservation('Early', 10, 11),
+            self.reservation('Noon', 12.5, 13.5),
+            self.reservation('Backwards', 15, 14),
+            self.reservation('Free', 13, 14),
+        ])
+
+        self.assertEqual(
+            report,
+            [
+                Booking(False, 'conflict', self.reservation('Early', 10, 11)),
+                Booking(True),
+                Booking(False, 'conflict', self.reservation('Stored', 12, 13)),
+                Booking(False, 'invalid'),
+                Booking(True),
+            ]
+        )
+        self.assertEqual(self.stored(), [('Early',), ('Stored',), ('Free',)])
+
+    def test_stored_reservation_after_batch_start(self):
+        self.db.add(*self.reservation('Stored', 11, 12))
+        report = self.db.add_many([self.reservation('Long', 10, 12), self.reservation('Short', 10, 11)])
+        self.assertEqual(
+            report,
+            [Booking(False, 'conflict', self.reservation('Stored', 11, 12)), Booking(True)]
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(self.db.add_many([]), [])
+
+    def test_no_overlaps(self):
+        rng = random.Random(2023)
+        batch = []
+        for index in range(300):
+            start = rng.randint(0, 40) / 2
+            batch.append(self.reservation('Player', start, start + rng.choice([0.5, 1, 1.5])))
+        report = self.db.add_many(batch)
+
+        accepted = sorted(reservation[2:] for reservation, booking in zip(batch, report) if booking.booked)
+        self.assertEqual(len(accepted), len(self.stored()))
+        for (_, end_date), (start_date, _) in zip(accepted, accepted[1:]):
+            self.assertLessEqual(end_date, start_date)
+        # every rejected reservation overlaps an accepted one
+        for reservation, booking in zip(batch, report):
+            if not booking.booked:
+                self.assertTrue(any(
+                    start_date < reservation[3] and end_date > reservation[2] for start_date, end_date in accepted
+                ))
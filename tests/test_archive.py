@@ -0,0 +1,123 @@
+import unittest
+import csv
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from tennis_court import control_db
+from tennis_court.control_db import DataBase, Booking
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:', date_storage='minutes')
+        self.db.set_db()
+        self.today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.db.add_many(
+            ('Jan', f'Old{day}', self.today - timedelta(days=day) + timedelta(hours=10),
+             self.today - timedelta(days=day) + timedelta(hours=11))
+            for day in range(40, 30, -1)
+        )
+        self.recent = self.today - timedelta(days=5, hours=-10)
+        self.db.add('Jan', 'Recent', self.recent, self.recent + timedelta(hours=1))
+        self.future = self.today + timedelta(days=3, hours=10)
+        self.db.add('Jan', 'Future', self.future, self.future + timedelta(hours=1))
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def count(self, table):
+        return self.db._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_archive(self):
+        self.assertEqual(self.db.archive(30), 10)
+        self.assertEqual((self.count('reservations'), self.count('reservations_archive')), (2, 10))
+        self.assertEqual(self.db.archive(30), 0)
+        self.assertEqual(self.db.check_counters(), [])
+
+        # the booking window reads only the live table
+        self.assertIsNone(self.db.check_availability_court(self.future))
+
+        # the history reads both tables
+        days = dict(self.db.take_schedule_days(self.today - timedelta(days=40), self.today))
+        self.assertEqual(sum(len(reservations) for reservations in days.values()), 11)
+        self.assertEqual(days[(self.today - timedelta(days=35)).date()][0][2], 'Old35')
+        self.assertIsNone(self.db.check_availability_court(self.today - timedelta(days=35, hours=-10)))
+
+        # longer than the day cache, the rows are streamed
+        days = list(self.db.take_schedule_days(self.today - timedelta(days=200), self.today))
+        self.assertEqual(sum(len(reservations) for _, reservations in days), 11)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.db.save_as_csv('history', [self.today - timedelta(days=40), self.today], directory=directory)
+            with open(path, encoding='utf8') as file:
+                self.assertEqual(len(list(csv.reader(file))), 12)
+
+        # imports of the history are checked against the archive
+        old = self.today - timedelta(days=35, hours=-10)
+        self.assertEqual(
+            self.db.add_many([('Adam', 'Nowak', old, old + timedelta(minutes=30))]),
+            [Booking(False, 'conflict', ('Jan', 'Old35', old, old + timedelta(hours=1)))]
+        )
+        self.assertEqual(self.db.book('Adam', 'Nowak', old, old + timedelta(minutes=30)).reason, 'conflict')
+
+        # an archived reservation is not cancelled
+        self.assertFalse(self.db.cancel('Jan', 'Old35', old))
+
+    def test_booking_window_skips_archive(self):
+        self.db.archive(30)
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        self.db.check_availability_court(self.future + timedelta(hours=2))
+        self.db.suggest_new_date(self.future)
+        self.db.book('Adam', 'Nowak', self.future + timedelta(hours=2), self.future + timedelta(hours=3))
+        self.db._db.set_trace_callback(None)
+        self.assertTrue(any('reservations' in statement for statement in statements))
+        self.assertFalse(any('reservations_archive' in statement for statement in statements))
+
+    def test_archive_in_batches(self):
+        self.addCleanup(setattr, control_db, 'ARCHIVE_BATCH_SIZE', control_db.ARCHIVE_BATCH_SIZE)
+        control_db.ARCHIVE_BATCH_SIZE = 3
+        self.assertEqual(self.db.archive(0), 11)
+        self.assertEqual((self.count('reservations'), self.count('reservations_archive')), (1, 11))
+        self.assertEqual(
+            self.db._db.execute("SELECT last_name FROM reservations_archive ORDER BY start_date").fetchall()[-1],
+            ('Recent',)
+        )
+
+    def test_archive_is_seen_by_another_connection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'archive.db')
+            first = DataBase('9:00', '21:00', path)
+            first.set_db()
+            first.add('Jan', 'Kowalski', self.recent, self.recent + timedelta(hours=1))
+            second = DataBase('9:00', '21:00', path)
+            second.set_db()
+            # the day is cached by the second DataBase before the first one archives it
+            self.assertIsNone(second.check_availability_court(self.recent))
+
+            self.assertEqual(first.archive(1), 1)
+            self.assertIsNone(second.check_availability_court(self.recent))
+            self.assertEqual(list(second.take_schedule_days(self.recent, self.recent))[0][1][0][2], 'Kowalski')
+            first.close()
+            second.close()
+
+    def test_convert_date_storage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'archive.db')
+            db = DataBase('9:00', '21:00', path, date_storage='minutes')
+            db.set_db()
+            db.add('Jan', 'Kowalski', self.recent, self.recent + timedelta(hours=1))
+            db.archive(1)
+            db.close()
+
+            db = DataBase('9:00', '21:00', path, date_storage='text')
+            db.set_db()
+            reservation = list(db.take_schedule_days(self.recent, self.recent))[0][1][0]
+            self.assertEqual(reservation[3:], (self.recent, self.recent + timedelta(hours=1)))
+            db.close()
+
+    def test_negative_days(self):
+        with self.assertRaises(ValueError):
+            self.db.archive(-1)
@@ -0,0 +1,118 @@
+import unittest
+import os
+import multiprocessing
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase, Booking
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+PROCESSES = 4
+SLOTS = 12
+
+
+def book_every_slot(worker, day, results):
+    db = DataBase('9:00', '21:00', TEMP_DB)
+    db.set_db()
+    booked = 0
+    for slot in range(SLOTS):
+        start = day + timedelta(hours=9, minutes=30 * slot)
+        # a new name for every attempt, so only the overlap check can refuse
+        last_name = 'Player' + chr(ord('a') + worker) + chr(ord('a') + slot)
+        booked += db.book('Jan', last_name, start, start + timedelta(minutes=60)).booked
+    db.close()
+    results.put(booked)
+
+
+class TestBook(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.date = datetime.today().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_book(self):
+        self.assertEqual(self.db.book('Jan', 'Kowalski', self.date, self.date + timedelta(hours=1)), Booking(True))
+        self.assertIsNone(self.db.check_availability_court(self.date))
+
+    def test_conflict(self):
+        self.db.book('Jan', 'Kowalski', self.date, self.date + timedelta(hours=1))
+        booking = self.db.book('Adam', 'Nowak', self.date + timedelta(minutes=30), self.date + timedelta(hours=2))
+        self.assertEqual(
+            booking,
+            Booking(False, 'conflict', ('Jan', 'Kowalski', self.date, self.date + timedelta(hours=1)))
+        )
+
+    def test_quota(self):
+        for days in range(2):
+            start = self.date + timedelta(days=days)
+            self.db.book('Jan', 'Kowalski', start, start + timedelta(hours=1))
+        start = self.date + timedelta(days=2)
+        self.assertEqual(self.db.book('Jan', 'Kowalski', start, start + timedelta(hours=1)), Booking(False, 'quota'))
+
+    def test_book_many(self):
+        hour = timedelta(hours=1)
+        bookings = self.db.book_many([
+            ('Jan', 'Kowalski', self.date, self.date + hour),
+            # overlaps the first one of the batch
+            ('Adam', 'Nowak', self.date + hour / 2, self.date + 2 * hour),
+            ('Jan', 'Kowalski', self.date + 2 * hour, self.date + 3 * hour),
+            # the quota counts the reservations booked earlier in the batch
+            ('Jan', 'Kowalski', self.date + 4 * hour, self.date + 5 * hour),
+            ('Ewa', 'Lis', self.date + hour, self.date),
+        ])
+        self.assertEqual(
+            [(booking.booked, booking.reason) for booking in bookings],
+            [(True, None), (False, 'conflict'), (True, None), (False, 'quota'), (False, 'invalid')]
+        )
+        self.assertIsNone(self.db.check_availability_court(self.date + 2 * hour))
+        self.assertTrue(self.db.check_availability_court(self.date + 4 * hour))
+
+    def test_cancel_many(self):
+        self.db.book('Jan', 'Kowalski', self.date, self.date + timedelta(hours=1))
+        self.assertEqual(
+            self.db.cancel_many([('Jan', 'Kowalski', self.date), ('Jan', 'Kowalski', self.date)]), [True, False]
+        )
+        self.assertTrue(self.db.check_availability_court(self.date))
+
+
+class TestBookContention(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # a database left by another test would be counted with the bookings of the workers
+        remove_db(TEMP_DB)
+
+    def tearDown(self) -> None:
+        remove_db(TEMP_DB)
+
+    def test_no_double_booking(self):
+        db = DataBase('9:00', '21:00', TEMP_DB)
+        db.set_db()
+        # a connection must not be carried across fork(), the workers open the migrated database themselves
+        db.close()
+        day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        workers = [
+            context.Process(target=book_every_slot, args=(worker, day, results))
+            for worker in range(PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        booked = sum(results.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+
+        db = DataBase('9:00', '21:00', TEMP_DB)
+        db.set_db()
+        rows = db._db.execute("SELECT start_date, end_date FROM reservations ORDER BY start_date").fetchall()
+        db.close()
+
+        self.assertEqual(len(rows), booked)
+        self.assertTrue(rows)
+        for (_, end_date), (start_date, _) in zip(rows, rows[1:]):
+            self.assertLessEqual(end_date, start_date)
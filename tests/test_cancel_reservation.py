@@ -6,7 +6,7 @@ from faker import Faker
 from datetime import datetime, timedelta
 
 from tennis_court.app import TennisCourtApp
-from .fake_db import FakeDB
+from .fake_db import FakeDB, remove_db
 
 class TestTennisCourtApp(unittest.TestCase):
 
@@ -42,7 +42,7 @@ class TestTennisCourtApp(unittest.TestCase):
             "Please enter the full name of the person whose reservation you want to cancel.\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_cancel_reservation_successful(self):
         FakeDB().run()
@@ -73,7 +73,7 @@ class TestTennisCourtApp(unittest.TestCase):
             f"The reservation ({day.year}-{day.month:0>2}-{day.day:0>2} 10:00:00)"
             f" has been cancelled.\n"
         )
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_cancel_reservation_unsuccessful(self):
         FakeDB().run()
@@ -103,5 +103,5 @@ class TestTennisCourtApp(unittest.TestCase):
             display,
             "You have provided incorrect data.\n"
         )
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
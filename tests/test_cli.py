@@ -0,0 +1,162 @@
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from tennis_court import cli
+from tennis_court.control_db import DataBase
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=3)
+        self.start = f"{self.day:%d.%m.%Y} 10:00"
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def run_batch(self, command, *lines):
+        output = io.StringIO()
+        command(self.db, cli.read_lines(io.StringIO('\n'.join(lines))), output)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_book(self):
+        results = self.run_batch(
+            cli.book,
+            json.dumps({'name': 'jan kowalski', 'start': self.start, 'minutes': 60}),
+            '',
+            json.dumps({'name': 'Adam Nowak', 'start': self.start}),
+            'not a json line',
+            json.dumps({'name': 'Adam', 'start': self.start}),
+            json.dumps({'name': 'Adam Nowak', 'start': f"{self.day:%d.%m.%Y} 10:15"}),
+            json.dumps({'name': 'Adam Nowak', 'start': f"{self.day:%d.%m.%Y} 20:30", 'minutes': 60}),
+            json.dumps({'name': 'Adam Nowak', 'start': f"{self.day + timedelta(days=20):%d.%m.%Y} 10:00"}),
+        )
+
+        self.assertEqual(results[0], {
+            'line': 1, 'status': 'booked', 'name': 'Jan Kowalski',
+            'start': f"{self.day:%Y-%m-%d}T10:00", 'end': f"{self.day:%Y-%m-%d}T11:00",
+        })
+        self.assertEqual(results[1]['line'], 3)
+        self.assertEqual(results[1]['status'], 'conflict')
+        self.assertEqual(results[1]['conflict']['name'], 'Jan Kowalski')
+        self.assertEqual([result['status'] for result in results[2:]], ['invalid'] * 5)
+        self.assertEqual([result['line'] for result in results[2:]], [4, 5, 6, 7, 8])
+
+    def test_batches(self):
+        lines = [
+            json.dumps({'name': f'Jan {chr(ord("A") + i // 26)}{chr(ord("a") + i % 26)}', 'start': self.start})
+            for i in range(5)
+        ]
+        self.addCleanup(setattr, cli, 'BATCH_SIZE', cli.BATCH_SIZE)
+        cli.BATCH_SIZE = 2
+        results = self.run_batch(cli.book, *lines)
+        self.assertEqual([result['status'] for result in results], ['booked'] + ['conflict'] * 4)
+
+    def test_cancel_and_schedule(self):
+        self.run_batch(cli.book, json.dumps({'name': 'Jan Kowalski', 'start': self.start}))
+
+        output = io.StringIO()
+        cli.schedule(self.db, self.day, self.day + timedelta(days=1), output)
+        self.assertEqual(json.loads(output.getvalue()), {
+            'day': f"{self.day:%Y-%m-%d}", 'name': 'Jan Kowalski',
+            'start': f"{self.day:%Y-%m-%d}T10:00", 'end': f"{self.day:%Y-%m-%d}T10:30",
+        })
+
+        results = self.run_batch(
+            cli.cancel,
+            json.dumps({'name': 'Jan Kowalski', 'start': self.start}),
+            json.dumps({'name': 'Jan Kowalski', 'start': self.start}),
+        )
+        self.assertEqual([result['status'] for result in results], ['cancelled', 'not_found'])
+
+    def test_series(self):
+        item = {'name': 'Jan Kowalski', 'start': self.start, 'minutes': 60}
+        until = f"{self.day + timedelta(weeks=4):%d.%m.%Y}"
+        output = io.StringIO()
+        cli.series(self.db, item, until, output)
+        cli.series(self.db, item, '31.02.2030', output)
+        cli.cancel_series(self.db, item, output)
+        cli.cancel_series(self.db, item, output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(results[0], {
+            'status': 'booked', 'name': 'Jan Kowalski',
+            'start': f"{self.day:%Y-%m-%d}T10:00", 'end': f"{self.day:%Y-%m-%d}T11:00",
+            'until': f"{self.day + timedelta(weeks=4):%Y-%m-%d}",
+        })
+        self.assertEqual([result['status'] for result in results[1:]], ['invalid', 'cancelled', 'not_found'])
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self) -> None:
+        remove_db(TEMP_DB)
+
+    def tearDown(self) -> None:
+        remove_db(TEMP_DB)
+
+    def run_main(self, *args, stdin=''):
+        return subprocess.run(
+            [sys.executable, '-m', 'tennis_court', *args, '--db', TEMP_DB],
+            input=stdin, capture_output=True, text=True, check=True,
+            env={**os.environ, 'PYTHONPATH': os.path.join(os.getcwd(), 'src')},
+        ).stdout
+
+    def run_failing(self, *args, stdin=''):
+        process = subprocess.run(
+            [sys.executable, '-m', 'tennis_court', *args, '--db', TEMP_DB],
+            input=stdin, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': os.path.join(os.getcwd(), 'src')},
+        )
+        self.assertEqual(process.returncode, 2)
+        self.assertNotIn('Traceback', process.stderr)
+        return process.stderr
+
+    def test_unknown_court(self):
+        day = datetime.today() + timedelta(days=3)
+        error = self.run_failing('book', 'Jan Kowalski', f"{day:%d.%m.%Y} 10:00", '--court', '99')
+        self.assertIn('There is no court 99', error)
+
+    def test_missing_batch_file(self):
+        for command in ('book', 'cancel'):
+            self.assertIn('cannot read missing.jsonl', self.run_failing(command, '--file', 'missing.jsonl'))
+
+    def test_import_errors(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        header = os.path.join(directory.name, 'header.csv')
+        with open(header, 'w', encoding='utf8') as file:
+            file.write('who,from,to\n')
+        truncated = os.path.join(directory.name, 'truncated.json')
+        with open(truncated, 'w', encoding='utf8') as file:
+            file.write('{"13.05": [{"name": "Jan Kowalski", "start_t')
+
+        self.assertIn('No such file', self.run_failing('import', os.path.join(directory.name, 'missing.csv')))
+        self.assertIn('Unexpected CSV header', self.run_failing('import', header))
+        self.assertIn(f"import: {truncated}", self.run_failing('import', truncated))
+
+    def test_archive_negative_days(self):
+        self.assertIn('the days should not be negative', self.run_failing('archive', '--days', '-1'))
+
+    def test_book_and_export(self):
+        day = datetime.today() + timedelta(days=3)
+        output = self.run_main('book', 'Jan Kowalski', f"{day:%d.%m.%Y} 10:00", '--minutes', '60')
+        self.assertEqual(json.loads(output)['status'], 'booked')
+
+        output = self.run_main('book', stdin=json.dumps({'name': 'Adam Nowak', 'start': f"{day:%d.%m.%Y} 10:30"}))
+        self.assertEqual(json.loads(output)['status'], 'conflict')
+
+        path = json.loads(self.run_main('export', f"{day:%d.%m.%Y}", f"{day:%d.%m.%Y}", '--format', 'csv'))['path']
+        self.addCleanup(os.remove, path)
+        with open(path, encoding='utf8') as file:
+            self.assertIn('Jan Kowalski', file.read())
@@ -0,0 +1,57 @@
+import unittest
+import json
+import os
+import tempfile
+
+from tennis_court.config import load_config, read_env_file, ConfigError
+
+
+class TestConfig(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.env_file = os.path.join(self.directory.name, '.env')
+        self.cache_file = os.path.join(self.directory.name, 'config.json')
+        with open(self.env_file, 'w', encoding='utf8') as file:
+            file.write('OPEN=9:00\nCLOSE=21:00\nSLOW_QUERY_MS=10\n')
+
+    def test_load_config(self):
+        config = load_config({'CLOSE': '22:00', 'METRICS_FILE': 'metrics.prom'}, self.env_file)
+        # the environment wins over the .env file
+        self.assertEqual((config.open, config.close), ('9:00', '22:00'))
+        self.assertEqual(config.slow_query_ms, 10.0)
+        self.assertEqual(config.metrics_file, 'metrics.prom')
+        self.assertIsNone(config.metrics_interval)
+        self.assertIsNone(config.date_storage)
+
+    def test_missing_hours(self):
+        with open(self.env_file, 'w', encoding='utf8') as file:
+            file.write('OPEN=9:00\n')
+        with self.assertRaises(ConfigError):
+            load_config({}, self.env_file)
+        with self.assertRaises(ConfigError):
+            load_config({'CLOSE': '21:00', 'METRICS_INTERVAL': 'often'}, self.env_file)
+
+    def test_cache_file(self):
+        self.assertEqual(read_env_file(self.env_file, self.cache_file)['OPEN'], '9:00')
+
+        # the values are taken from the cache while the .env file does not change
+        with open(self.cache_file, encoding='utf8') as file:
+            cached = json.load(file)
+        cached['values']['OPEN'] = '8:00'
+        with open(self.cache_file, 'w', encoding='utf8') as file:
+            json.dump(cached, file)
+        self.assertEqual(load_config({'CONFIG_CACHE': self.cache_file}, self.env_file).open, '8:00')
+
+        with open(self.env_file, 'a', encoding='utf8') as file:
+            file.write('DATE_STORAGE=text\n')
+        config = load_config({}, self.env_file, self.cache_file)
+        self.assertEqual((config.open, config.date_storage), ('9:00', 'text'))
+
+        # a broken cache is written again
+        with open(self.cache_file, 'w', encoding='utf8') as file:
+            file.write('{')
+        self.assertEqual(read_env_file(self.env_file, self.cache_file)['DATE_STORAGE'], 'text')
+        with open(self.cache_file, encoding='utf8') as file:
+            self.assertEqual(json.load(file)['values']['DATE_STORAGE'], 'text')
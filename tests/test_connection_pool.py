@@ -0,0 +1,78 @@
+import unittest
+import os
+import threading
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.connections import ConnectionPool
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+THREADS = 8
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', TEMP_DB, pool_size=2)
+        self.db.set_db()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    def test_memory_database(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(':memory:')
+
+    def test_connection_per_thread(self):
+        connections = []
+
+        def take_connection():
+            connections.append(self.db._db)
+
+        threads = [threading.Thread(target=take_connection) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(db) for db in connections}), 3)
+
+    def test_read_only_schedule(self):
+        with self.db._connections.reading() as db:
+            with self.assertRaises(Exception):
+                db.execute("DELETE FROM reservations")
+
+    def test_sessions_in_threads(self):
+        errors = []
+        booked = []
+
+        def session(worker):
+            try:
+                for slot in range(24):
+                    start = self.day + timedelta(hours=9, minutes=30 * slot)
+                    if self.db.check_availability_court(start):
+                        self.db.check_reservation_options(start)
+                    else:
+                        self.db.suggest_new_date(start)
+                    self.db.has_permission_can_reservation('Jan', 'Kowalski')
+                    last_name = 'Player' + chr(ord('a') + worker) + chr(ord('a') + slot)
+                    if self.db.book('Jan', last_name, start, start + timedelta(minutes=60)).booked:
+                        booked.append(start)
+                    list(self.db.show_schedule(self.day, self.day + timedelta(days=1)))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=session, args=(worker,)) for worker in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        booked.sort()
+        for start, next_start in zip(booked, booked[1:]):
+            self.assertGreaterEqual(next_start - start, timedelta(minutes=60))
+        schedule = next(self.db.take_schedule_days(self.day, self.day))[1]
+        self.assertEqual(len(schedule), len(booked))
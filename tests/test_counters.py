@@ -0,0 +1,121 @@
+import unittest
+import os
+from unittest import mock
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.counters import week_of
+from .fake_db import FakeDB, remove_db
+
+
+class TestCounters(unittest.TestCase):
+
+    date_storage = 'text'
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:', self.date_storage)
+        self.db.set_db()
+        # a Sunday evening and the Monday after it are in different weeks
+        self.sunday = datetime(2030, 5, 19, 20)
+        self.monday = datetime(2030, 5, 20, 9)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def take_counters(self):
+        return self.db._db.execute(
+            """
+            SELECT first_name, last_name, week, reservations FROM user_weeks JOIN users ON users.id = user_id
+            ORDER BY week, last_name
+            """
+        ).fetchall()
+
+    def test_week_of(self):
+        self.assertEqual(week_of(datetime(1969, 12, 29)), 0)
+        self.assertEqual(week_of(datetime(1970, 1, 4, 23, 59)), 0)
+        self.assertEqual(week_of(datetime(1970, 1, 5)), 1)
+        self.assertEqual(week_of(self.monday), week_of(self.sunday) + 1)
+
+    def test_insert_and_delete(self):
+        self.db.add('Jan', 'Kowalski', self.sunday, self.sunday + timedelta(minutes=30))
+        self.db.add('Jan', 'Kowalski', self.monday, self.monday + timedelta(minutes=30))
+        self.db.add_many([
+            ('Jan', 'Kowalski', self.monday + timedelta(hours=1), self.monday + timedelta(hours=2)),
+            ('Adam', 'Nowak', self.monday + timedelta(hours=3), self.monday + timedelta(hours=4)),
+        ])
+        week = week_of(self.sunday)
+        self.assertEqual(
+            self.take_counters(),
+            [('Jan', 'Kowalski', week, 1), ('Jan', 'Kowalski', week + 1, 2), ('Adam', 'Nowak', week + 1, 1)]
+        )
+
+        self.db.cancel('Jan', 'Kowalski', self.sunday)
+        self.db.cancel('Adam', 'Nowak', self.monday + timedelta(hours=3))
+        self.assertEqual(self.take_counters(), [('Jan', 'Kowalski', week + 1, 2)])
+        self.assertEqual(self.db.check_counters(), [])
+
+    def test_update(self):
+        self.db.add('Jan', 'Kowalski', self.sunday, self.sunday + timedelta(minutes=30))
+        with self.db._connections.writing() as db:
+            db.execute("UPDATE reservations SET first_name = 'Anna', start_date = ?", (self.db._dates.encode(self.monday),))
+            db.commit()
+        self.assertEqual(self.take_counters(), [('Anna', 'Kowalski', week_of(self.monday), 1)])
+
+    def test_check_and_repair(self):
+        self.db.add('Jan', 'Kowalski', self.sunday, self.sunday + timedelta(minutes=30))
+        with self.db._connections.writing() as db:
+            db.execute("UPDATE user_weeks SET reservations = 5")
+            db.commit()
+
+        differences = self.db.check_counters(repair=True)
+        self.assertEqual(differences, [(1, week_of(self.sunday), 5, 1)])
+        self.assertEqual(self.db.check_counters(), [])
+        self.assertEqual(self.take_counters(), [('Jan', 'Kowalski', week_of(self.sunday), 1)])
+
+
+class TestCountersMinutes(TestCounters):
+
+    date_storage = 'minutes'
+
+
+class TestQuota(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        # a Wednesday, the week from now ends on the Wednesday of the next week
+        self.now = datetime(2030, 5, 15, 12)
+        patcher = mock.patch.object(DataBase, 'get_current_date', new_callable=mock.PropertyMock, return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_reservations_outside_of_the_week_do_not_count(self):
+        # the counters of this and the next week reach the quota, the exact count does not
+        for date in (self.now - timedelta(days=1), self.now + timedelta(days=8)):
+            self.db.add('Jan', 'Kowalski', date, date + timedelta(hours=1))
+        self.assertTrue(self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+
+        self.db.add('Jan', 'Kowalski', self.now + timedelta(days=1), self.now + timedelta(days=1, hours=1))
+        self.assertTrue(self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+        self.db.add('Jan', 'Kowalski', self.now + timedelta(days=6), self.now + timedelta(days=6, hours=1))
+        self.assertFalse(self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+        self.assertTrue(self.db.has_permission_can_reservation('Adam', 'Nowak'))
+
+
+class TestUpgrade(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        remove_db()
+
+    def test_counters_of_existing_database(self):
+        FakeDB().run()
+        db = DataBase('9:00', '21:00', os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        db.set_db()
+        self.assertEqual(db.check_counters(), [])
+        users = db._db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        self.assertEqual(users, 5)
+        self.assertFalse(db.has_permission_can_reservation('Jan', 'Kowalski'))
+        db.close()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase, CourtSlot
+from .fake_db import FakeDB, remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestCourts(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', TEMP_DB)
+        self.db.set_db()
+        self.second = self.db.add_court('Court 2')
+        self.third = self.db.add_court('Court 3')
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=3)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    def at(self, hours):
+        return self.day + timedelta(hours=hours)
+
+    def test_courts(self):
+        self.assertEqual(self.db.courts(), [(1, 'Court 1'), (2, 'Court 2'), (3, 'Court 3')])
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.add_court('Court 2')
+
+    def test_unknown_court(self):
+        with self.assertRaises(ValueError):
+            self.db.book('Jan', 'Kowalski', self.at(10), self.at(11), 99)
+        with self.assertRaises(ValueError):
+            self.db.cancel('Jan', 'Kowalski', self.at(10), 99)
+        unknown = DataBase('9:00', '21:00', TEMP_DB, court=99)
+        with self.assertRaises(ValueError):
+            unknown.set_db()
+        unknown.close()
+        self.assertEqual(self.db._db.execute("SELECT COUNT(*) FROM reservations").fetchone()[0], 0)
+
+        # a court added by another DataBase
+        other = DataBase('9:00', '21:00', TEMP_DB)
+        other.set_db()
+        fourth = other.add_court('Court 4')
+        other.close()
+        self.assertTrue(self.db.book('Jan', 'Kowalski', self.at(10), self.at(11), fourth).booked)
+
+    def test_reservations_of_a_court(self):
+        self.assertTrue(self.db.book('Jan', 'Kowalski', self.at(10), self.at(11)).booked)
+        # the same hour is free on another court
+        self.assertTrue(self.db.book('Adam', 'Nowak', self.at(10), self.at(11), self.second).booked)
+        self.assertEqual(self.db.book('Ewa', 'Lis', self.at(10.5), self.at(11), self.second).reason, 'conflict')
+        # the weekly quota counts the reservations of all courts
+        self.db.book('Jan', 'Kowalski', self.at(12), self.at(13), self.second)
+        self.assertEqual(self.db.book('Jan', 'Kowalski', self.at(14), self.at(15), self.third).reason, 'quota')
+
+        second = DataBase('9:00', '21:00', TEMP_DB, court=self.second)
+        second.set_db()
+        self.assertIsNone(second.check_availability_court(self.at(12)))
+        self.assertTrue(self.db.check_availability_court(self.at(12)))
+        self.assertEqual([reservation[2] for _, reservations in second.take_schedule_days(self.day, self.day)
+                          for reservation in reservations], ['Nowak', 'Kowalski'])
+
+        # cancelling on another court keeps the reservation of the court of the DataBase
+        self.assertTrue(self.db.cancel('Jan', 'Kowalski', self.at(12), self.second))
+        self.assertFalse(self.db.cancel('Jan', 'Kowalski', self.at(12)))
+        self.assertIsNone(self.db.check_availability_court(self.at(10)))
+        self.assertTrue(second.check_availability_court(self.at(12)))
+        second.close()
+
+    def test_find_court(self):
+        self.db.add_many([('Jan', 'Kowalski', self.at(10), self.at(12))])
+        self.db.add_many([('Adam', 'Nowak', self.at(9), self.at(10.5)), ('Ewa', 'Lis', self.at(11), self.at(13))],
+                         self.second)
+        self.db.add_many([('Ola', 'Nowak', self.at(9.5), self.at(11.5))], self.third)
+
+        # a tie goes to the lower id
+        self.assertEqual(self.db.find_court(self.at(9), 60), CourtSlot(self.at(9), 1, 'Court 1'))
+        self.assertEqual(self.db.find_court(self.at(10), 30), CourtSlot(self.at(10.5), 2, 'Court 2'))
+        # the half hour between the reservations of the second court is too short
+        self.assertEqual(self.db.find_court(self.at(10), 60), CourtSlot(self.at(11.5), 3, 'Court 3'))
+        self.assertEqual(self.db.find_court(self.at(20.5), 30), CourtSlot(self.at(20.5), 1, 'Court 1'))
+        self.assertIsNone(self.db.find_court(self.at(20.5), 60))
+
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        self.db.find_court(self.at(10), 90)
+        self.db._db.set_trace_callback(None)
+        self.assertEqual(len([statement for statement in statements if 'reservations' in statement]), 1)
+
+    def test_existing_reservations_are_on_the_first_court(self):
+        self.db.close()
+        remove_db(TEMP_DB)
+        FakeDB().run()
+        self.db = DataBase('9:00', '21:00', TEMP_DB)
+        self.db.set_db()
+        self.assertEqual(
+            self.db._db.execute("SELECT DISTINCT court_id FROM reservations").fetchall(), [(1,)]
+        )
+        self.assertEqual(self.db.courts(), [(1, 'Court 1')])
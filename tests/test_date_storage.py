@@ -0,0 +1,70 @@
+import unittest
+import os
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.date_storage import MinuteDates, TextDates
+from .fake_db import FakeDB, remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestConverters(unittest.TestCase):
+
+    def test_round_trip(self):
+        date = datetime(2030, 5, 14, 18, 30)
+        for storage in (TextDates(), MinuteDates()):
+            self.assertEqual(storage.decode(storage.encode(date)), date)
+
+    def test_minutes_keep_order(self):
+        storage = MinuteDates()
+        earlier, later = datetime(2030, 5, 14, 9, 59), datetime(2030, 5, 14, 10)
+        self.assertEqual(storage.encode(later) - storage.encode(earlier), 1)
+
+
+class TestMinuteStorage(unittest.TestCase):
+
+    def setUp(self) -> None:
+        FakeDB().run()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    def test_convert_existing_database(self):
+        self.db = DataBase('9:00', '21:00', TEMP_DB, 'minutes')
+        self.db.set_db()
+
+        types = self.db._db.execute("SELECT DISTINCT typeof(start_date), typeof(end_date) FROM reservations").fetchall()
+        self.assertEqual(types, [('integer', 'integer')])
+
+        day = self.day + timedelta(days=3)
+        self.assertFalse(self.db.check_availability_court(day + timedelta(hours=9, minutes=30)))
+        self.assertEqual(self.db.suggest_new_date(day + timedelta(hours=9, minutes=30)), day + timedelta(hours=10))
+        self.assertEqual(self.db.check_reservation_options(day + timedelta(hours=10)), [30])
+        self.assertFalse(self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+
+        schedule = list(self.db.show_schedule(day, day))
+        self.assertIn(f"{day:%Y-%m-%d} 14:30  - {day:%Y-%m-%d} 15:00", schedule[0])
+
+        self.assertTrue(self.db.cancel('Marcin', 'Mallek', day + timedelta(hours=12, minutes=30)))
+
+    def test_convert_back_to_text(self):
+        self.db = DataBase('9:00', '21:00', TEMP_DB, 'minutes')
+        self.db.set_db()
+        self.db.close()
+
+        self.db = DataBase('9:00', '21:00', TEMP_DB, 'text')
+        self.db.set_db()
+        start_date = self.db._db.execute("SELECT start_date FROM reservations ORDER BY start_date").fetchone()[0]
+        self.assertEqual(start_date, f"{self.day + timedelta(days=1):%Y-%m-%d} 09:00")
+
+    def test_keep_stored_storage(self):
+        self.db = DataBase('9:00', '21:00', TEMP_DB, 'minutes')
+        self.db.set_db()
+        self.db.close()
+
+        self.db = DataBase('9:00', '21:00', TEMP_DB)
+        self.db.set_db()
+        self.assertEqual(self.db._dates.name, 'minutes')
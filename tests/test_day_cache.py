@@ -0,0 +1,163 @@
+import unittest
+import os
+import threading
+from contextlib import contextmanager
+from unittest import mock
+from datetime import datetime, timedelta, date
+
+from tennis_court.control_db import DataBase
+from tennis_court.day_cache import DayCache, CacheInfo, days_between
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestDayCacheLRU(unittest.TestCase):
+
+    def test_least_recently_used_day_is_dropped(self):
+        cache = DayCache(2)
+        cache.put(date(2030, 5, 13), [])
+        cache.put(date(2030, 5, 14), [])
+        cache.get(date(2030, 5, 13))
+        cache.put(date(2030, 5, 15), [])
+
+        self.assertIsNone(cache.get(date(2030, 5, 14)))
+        self.assertEqual(cache.get(date(2030, 5, 13)), ())
+        self.assertEqual(cache.info(), CacheInfo(hits=2, misses=1, maxsize=2, currsize=2))
+
+    def test_days_between(self):
+        day = datetime(2030, 5, 13)
+        self.assertEqual(days_between(day + timedelta(hours=10), day + timedelta(hours=11)), [day.date()])
+        self.assertEqual(days_between(day + timedelta(hours=23), day + timedelta(days=1)), [day.date()])
+        self.assertEqual(
+            days_between(day + timedelta(hours=23), day + timedelta(days=1, hours=1)),
+            [day.date(), day.date() + timedelta(days=1)]
+        )
+
+
+class TestDataBaseDayCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', TEMP_DB)
+        self.db.set_db()
+        # outside of the slot index, so every question goes through the day cache
+        self.day = datetime(2030, 5, 13)
+        self.db.add('Jan', 'Kowalski', self.day + timedelta(hours=10), self.day + timedelta(hours=11))
+
+    def tearDown(self) -> None:
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    def count_queries(self, call):
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        call()
+        self.db._db.set_trace_callback(None)
+        return len([statement for statement in statements if 'reservations' in statement])
+
+    def test_hits_and_misses(self):
+        date = self.day + timedelta(hours=10)
+        self.assertEqual(self.count_queries(lambda: self.db.check_availability_court(date)), 1)
+        self.assertEqual(self.count_queries(lambda: self.db.suggest_new_date(date)), 0)
+        self.assertEqual(self.count_queries(lambda: self.db.check_reservation_options(date + timedelta(hours=1))), 0)
+        self.assertEqual(self.count_queries(lambda: list(self.db.show_schedule(self.day, self.day))), 0)
+
+        info = self.db.cache_info()
+        # the day before is loaded too, a reservation may start before midnight
+        self.assertEqual((info.misses, info.currsize), (2, 2))
+        self.assertEqual(info.hits, 4)
+
+    def test_add_invalidates_only_its_day(self):
+        list(self.db.show_schedule(self.day, self.day + timedelta(days=2)))
+        self.db.add('Adam', 'Nowak', self.day + timedelta(days=1, hours=12), self.day + timedelta(days=1, hours=13))
+
+        self.assertEqual(self.db.cache_info().currsize, 2)
+        self.assertEqual(self.count_queries(lambda: list(self.db.show_schedule(self.day, self.day + timedelta(days=2)))), 1)
+        self.assertFalse(self.db.check_availability_court(self.day + timedelta(days=1, hours=12)))
+
+    def test_cancel_invalidates_its_day(self):
+        date = self.day + timedelta(hours=10)
+        self.assertIsNone(self.db.check_availability_court(date))
+        self.db.cancel('Jan', 'Kowalski', date)
+        self.assertTrue(self.db.check_availability_court(date))
+
+    def test_write_of_another_connection(self):
+        date = self.day + timedelta(hours=12)
+        self.assertTrue(self.db.check_availability_court(date))
+
+        other = DataBase('9:00', '21:00', TEMP_DB)
+        other.set_db()
+        other.add('Adam', 'Nowak', date, date + timedelta(hours=1))
+        other.close()
+
+        self.assertIsNone(self.db.check_availability_court(date))
+        self.assertEqual(self.db.cache_info().currsize, 2)
+
+    def test_write_past_database(self):
+        date = self.day + timedelta(hours=10)
+        self.assertIsNone(self.db.check_availability_court(date))
+        self.db._db.execute("DELETE FROM reservations")
+        self.db._db.commit()
+        self.assertTrue(self.db.check_availability_court(date))
+
+    def test_long_range_is_not_cached(self):
+        days = list(self.db.take_schedule_days(self.day, self.day + timedelta(days=100)))
+        self.assertEqual(len(days), 101)
+        self.assertEqual(len(days[0][1]), 1)
+        self.assertEqual(self.db.cache_info().currsize, 0)
+
+
+class TestPoolDayCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', TEMP_DB, pool_size=2)
+        self.db.set_db()
+        self.day = datetime(2030, 5, 13)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    def test_miss_loaded_during_a_write(self):
+        date = self.day + timedelta(hours=12)
+        self.db.add('Jan', 'Kowalski', self.day + timedelta(hours=9), self.day + timedelta(hours=10))
+        decode = self.db._dates.decode
+        writers = []
+
+        def book_while_loading(value):
+            if not writers:
+                # the miss does not hold the writer, a booking of its day commits before the days are cached
+                writer = threading.Thread(
+                    target=self.db.add, args=('Adam', 'Nowak', date, date + timedelta(hours=1))
+                )
+                writers.append(writer)
+                writer.start()
+                writer.join(timeout=5)
+            return decode(value)
+
+        with mock.patch.object(self.db._dates, 'decode', book_while_loading):
+            self.assertTrue(self.db.check_availability_court(date))
+        self.assertFalse(writers[0].is_alive())
+
+        # the days loaded before the booking are not cached
+        self.assertEqual(self.db.cache_info().currsize, 0)
+        self.assertIsNone(self.db.check_availability_court(date))
+        self.assertEqual(self.db.cache_info().currsize, 2)
+
+    def test_lookups_use_the_connection_of_the_thread(self):
+        connections = []
+        reading = self.db._connections.reading
+
+        @contextmanager
+        def lend():
+            with reading() as db:
+                connections.append(db)
+                yield db
+
+        with mock.patch.object(self.db._connections, 'reading', lend):
+            self.db.check_availability_court(self.day + timedelta(hours=12))
+            self.db.has_permission_can_reservation('Jan', 'Kowalski')
+            self.db._slots = None
+            self.db.check_availability_court(datetime.today().replace(hour=12, minute=0, second=0, microsecond=0)
+                                             + timedelta(days=3))
+        self.assertEqual(connections, [])
@@ -0,0 +1,84 @@
+import unittest
+import json
+import os
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.export import write_csv, write_json
+from tennis_court.importer import import_file
+
+SAVE_PATH = os.path.join('src', 'tennis_court', 'save')
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.day = datetime(2030, 5, 13)
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.db.add_many([
+            ('Jan', 'Kowalski', self.day + timedelta(hours=10), self.day + timedelta(hours=11)),
+            ('Łucja', 'Żak', self.day + timedelta(days=2, hours=9), self.day + timedelta(days=2, hours=10)),
+        ])
+
+    def tearDown(self) -> None:
+        self.db.close()
+        for name in os.listdir(SAVE_PATH):
+            if name.startswith('test_export'):
+                os.remove(os.path.join(SAVE_PATH, name))
+
+    def read(self, name, opener=open):
+        with opener(os.path.join(SAVE_PATH, name), 'rt', encoding='utf8') as file:
+            return file.read()
+
+    def test_json_same_as_json_dump(self):
+        for payload in ({}, {'13.05': []}, {'13.05': [{'name': 'Łucja Żak', 'start_time': '09:00'}], '14.05': []}):
+            write_json(os.path.join(SAVE_PATH, 'test_export.json'), payload.items())
+            self.assertEqual(
+                self.read('test_export.json'), json.dumps(payload, indent=2, ensure_ascii=False)
+            )
+
+    def test_save_as_json(self):
+        self.db.save_as_json('test_export', [self.day, self.day + timedelta(days=2)])
+        self.assertEqual(
+            json.loads(self.read('test_export.json')),
+            {
+                '13.05': [{'name': 'Jan Kowalski', 'start_time': '10:00', 'end_time': '11:00'}],
+                '14.05': [],
+                '15.05': [{'name': 'Łucja Żak', 'start_time': '09:00', 'end_time': '10:00'}],
+            }
+        )
+
+    def test_save_as_csv(self):
+        self.db.save_as_csv('test_export', [self.day, self.day + timedelta(days=2)])
+        self.assertEqual(
+            self.read('test_export.csv'),
+            "name,start_date,end_date\n"
+            "Jan Kowalski,13.05.2030 10:00,13.05.2030 11:00\n"
+            "Łucja Żak,15.05.2030 09:00,15.05.2030 10:00\n"
+        )
+
+    def test_gzip_round_trip(self):
+        for format, extension in (('1', '.json'), ('2', '.csv')):
+            self.db.save_to_file(self.day, self.day + timedelta(days=2), format, compress=True)
+            path = os.path.join(SAVE_PATH, '13.05-15.05' + extension + '.gz')
+            self.addCleanup(os.remove, path)
+
+            target = DataBase('9:00', '21:00', ':memory:')
+            target.set_db()
+            self.assertEqual(import_file(target, path, 2030), {'imported': 2, 'conflict': 0, 'invalid': 0})
+            target.close()
+
+    def test_atomic_write(self):
+        path = os.path.join(SAVE_PATH, 'test_export.csv')
+        write_csv(path, [[('Jan Kowalski', '13.05.2030 10:00', '13.05.2030 11:00')]])
+
+        def broken_rows():
+            yield [('Adam Nowak', '13.05.2030 12:00', '13.05.2030 13:00')]
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            write_csv(path, broken_rows())
+        # the previous file is untouched and no temporary file is left
+        self.assertIn('Jan Kowalski', self.read('test_export.csv'))
+        self.assertEqual([name for name in os.listdir(SAVE_PATH) if name.startswith('test_export')], ['test_export.csv'])
@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+
+
+class TestFindFreeSlots(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=2)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def at(self, days, hours):
+        return self.day + timedelta(days=days, hours=hours)
+
+    def test_gaps(self):
+        self.db.add_many([
+            ('Jan', 'Kowalski', self.at(0, 9), self.at(0, 19)),
+            ('Adam', 'Nowak', self.at(0, 19.5), self.at(0, 21)),
+            ('Ewa', 'Lis', self.at(1, 9), self.at(1, 10)),
+            ('Ola', 'Nowak', self.at(1, 10.5), self.at(1, 12)),
+        ])
+        self.assertEqual(
+            self.db.find_free_slots(self.at(0, 12), 30, 4),
+            [self.at(0, 19), self.at(1, 10), self.at(1, 12), self.at(1, 12.5)]
+        )
+        # the half-hour gaps are too short for an hour
+        self.assertEqual(self.db.find_free_slots(self.at(0, 12), 60, 2), [self.at(1, 12), self.at(1, 12.5)])
+        # the last start fits before the closing hour, the next one is on the next day
+        self.assertEqual(
+            self.db.find_free_slots(self.at(1, 19), 90, 3), [self.at(1, 19), self.at(1, 19.5), self.at(2, 9)]
+        )
+
+    def test_horizon(self):
+        self.db.add('Jan', 'Kowalski', self.at(0, 9), self.at(0, 21))
+        self.assertEqual(self.db.find_free_slots(self.at(0, 9), horizon=timedelta(days=1)), [])
+        self.assertEqual(self.db.find_free_slots(self.at(0, 9), limit=1), [self.at(1, 9)])
+        # the booking window ends two weeks from now
+        self.assertEqual(self.db.find_free_slots(self.at(30, 9)), [])
+
+    def test_one_query(self):
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        self.db.find_free_slots(self.at(0, 9), limit=100)
+        self.db._db.set_trace_callback(None)
+        self.assertEqual(len([statement for statement in statements if 'reservations' in statement]), 1)
@@ -0,0 +1,29 @@
+import unittest
+from datetime import datetime, timedelta
+
+from benchmarks.generator import generate_reservations, history_days, PER_DAY, FIRST_DAY
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.last_day = datetime(2026, 10, 31)
+
+    def test_sizes_of_the_suite(self):
+        # 9:00 - 21:00 has 24 half hours
+        for count in (10000, 1000000, 10000000):
+            days = history_days(count, self.last_day, 24)
+            self.assertLessEqual(count, days * 24)
+            self.assertGreaterEqual(self.last_day - timedelta(days=days - 1), FIRST_DAY)
+        self.assertEqual(history_days(10000, self.last_day, 24), 10000 // PER_DAY)
+
+        with self.assertRaises(ValueError):
+            history_days(24 * (self.last_day - FIRST_DAY).days + 1, self.last_day, 24)
+
+    def test_reservations(self):
+        reservations = list(generate_reservations(1000, self.last_day, seed=1))
+        self.assertEqual(len(reservations), 1000)
+        self.assertEqual(reservations[-1][2].date(), self.last_day.date())
+        for previous, reservation in zip(reservations, reservations[1:]):
+            self.assertLessEqual(previous[3], reservation[2])
+        self.assertEqual(reservations, list(generate_reservations(1000, self.last_day, seed=1)))
@@ -0,0 +1,76 @@
+import unittest
+import io
+import os
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.importer import import_file, iter_json_object, parse_date
+
+SAVE_PATH = os.path.join('src', 'tennis_court', 'save')
+
+
+class TestImport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.day = datetime(2030, 12, 30)
+        self.source = DataBase('9:00', '21:00', ':memory:')
+        self.source.set_db()
+        self.reservations = [
+            ('Jan', 'Kowalski', self.day + timedelta(hours=10), self.day + timedelta(hours=11)),
+            ('Iwona', 'Zamkowska', self.day + timedelta(hours=11), self.day + timedelta(hours=12, minutes=30)),
+            ('Adam', 'Lewanowski', self.day + timedelta(days=3, hours=9), self.day + timedelta(days=3, hours=10)),
+        ]
+        self.source.add_many(self.reservations)
+        self.target = DataBase('9:00', '21:00', ':memory:')
+        self.target.set_db()
+
+    def tearDown(self) -> None:
+        self.source.close()
+        self.target.close()
+        for extension in ('.csv', '.json'):
+            path = os.path.join(SAVE_PATH, 'test_import' + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def stored(self, db):
+        return [row[1:] for day in db.take_schedule_days(self.day, self.day + timedelta(days=4)) for row in day[1]]
+
+    def test_csv_round_trip(self):
+        self.source.save_as_csv('test_import', [self.day, self.day + timedelta(days=4)])
+        summary = import_file(self.target, os.path.join(SAVE_PATH, 'test_import.csv'))
+
+        self.assertEqual(summary, {'imported': 3, 'conflict': 0, 'invalid': 0})
+        self.assertEqual(self.stored(self.target), self.reservations)
+
+    def test_json_round_trip_over_new_year(self):
+        self.source.save_as_json('test_import', [self.day, self.day + timedelta(days=4)])
+        summary = import_file(self.target, os.path.join(SAVE_PATH, 'test_import.json'), year=2030)
+
+        self.assertEqual(summary, {'imported': 3, 'conflict': 0, 'invalid': 0})
+        self.assertEqual(self.stored(self.target), self.reservations)
+
+    def test_conflicts_and_invalid_rows(self):
+        self.source.save_as_csv('test_import', [self.day, self.day + timedelta(days=4)])
+        path = os.path.join(SAVE_PATH, 'test_import.csv')
+        with open(path, 'a', encoding='utf8') as file:
+            file.write('Jan Nowak,30.12.2030 08:00,30.12.2030 09:00\n')
+            file.write('Jan Nowak,30.12.2030 20:30,30.12.2030 21:30\n')
+            file.write('Jan Nowak,31.12.2030 10:00\n')
+        self.target.add(*self.reservations[0])
+
+        summary = import_file(self.target, path)
+        self.assertEqual(summary, {'imported': 2, 'conflict': 1, 'invalid': 3})
+
+    def test_iter_json_object_small_chunks(self):
+        text = '{\n  "13.05": [{"name": "Jan Kowalski", "start_time": "10:00"}],\n  "14.05": [] }'
+        self.assertEqual(
+            list(iter_json_object(io.StringIO(text), chunk_size=3)),
+            [('13.05', [{'name': 'Jan Kowalski', 'start_time': '10:00'}]), ('14.05', [])]
+        )
+        self.assertEqual(list(iter_json_object(io.StringIO('{}'), chunk_size=1)), [])
+
+    def test_parse_date(self):
+        self.assertEqual(parse_date('05.01.2031 09:30'), datetime(2031, 1, 5, 9, 30))
+        self.assertEqual(parse_date('5.1.2031 9:30'), datetime(2031, 1, 5, 9, 30))
+        with self.assertRaises(ValueError):
+            parse_date('32.01.2031 09:30')
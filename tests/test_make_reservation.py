@@ -6,7 +6,7 @@ from faker import Faker
 from datetime import datetime, timedelta
 
 from tennis_court.app import TennisCourtApp
-from .fake_db import FakeDB
+from .fake_db import FakeDB, remove_db
 
 DEFAULT_PATH_DB = os.path.join('temp.db')
 MENU = """
@@ -226,7 +226,7 @@ class TestTennisCourtAppWithDB(unittest.TestCase):
             display, "User cannot have more than 2 reservations in the current week.\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_make_reservation_has_not_permission_date(self):
         FakeDB().run()
@@ -253,7 +253,7 @@ class TestTennisCourtAppWithDB(unittest.TestCase):
             display, "The date must be at least an hour later than the current date.\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_make_reservation_no_place(self):
         FakeDB().run()
@@ -280,7 +280,112 @@ class TestTennisCourtAppWithDB(unittest.TestCase):
             display, "All hours are occupied on this day. Choose different date.\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
+
+    def test_make_reservation_free_slots(self):
+        FakeDB().run()
+
+        app = TennisCourtApp(
+                    os.path.join('src', 'tennis_court', 'db', 'temp.db'), io=(self.fake_input, self.fake_output)
+        )
+
+        app_thread = threading.Thread(target=app.run, daemon=True)
+        app_thread.start()
+
+        self.get_output(), self.send_input('1')
+        self.get_output(), self.send_input('Jan test')
+
+        date = datetime.today() + timedelta(days=1)
+        self.get_output(), self.send_input(f"{date.day:0>2}.{date.month:0>2}.{date.year:0>4} 12:30")
+        self.get_output()
+        # the next day is taken from 10:00 to 20:00
+        next_day = f"{date + timedelta(days=1):%d.%m.%Y}"
+        display = self.get_output()
+        self.assertEqual(
+            display,
+            "The nearest free dates are:\n"
+            f"[1] {next_day} 09:00\n[2] {next_day} 09:30\n[3] {next_day} 20:00\n[4] {next_day} 20:30\n"
+            f"[5] {date + timedelta(days=2):%d.%m.%Y} 10:00\n"
+            "Choose a number or press enter to choose a different date.\n"
+        )
+        self.send_input('3')
+        display = self.get_output()
+        self.assertEqual(
+            display, "How long would you like to book court?\n[1] 30 minutes\n[2] 60 minutes\n"
+        )
+        self.send_input('2')
+        display = self.get_output()
+        self.assertEqual(
+            display, f"Add reservation: {(date + timedelta(days=1)).replace(hour=20, minute=0, second=0, microsecond=0)}\n"
+        )
+
+        remove_db()
+
+    def test_make_reservation_waitlist(self):
+        FakeDB().run()
+
+        app = TennisCourtApp(
+                    os.path.join('src', 'tennis_court', 'db', 'temp.db'), io=(self.fake_input, self.fake_output)
+        )
+
+        app_thread = threading.Thread(target=app.run, daemon=True)
+        app_thread.start()
+
+        self.get_output(), self.send_input('1')
+        self.get_output(), self.send_input('Jan test')
+
+        date = datetime.today() + timedelta(days=1)
+        self.get_output(), self.send_input(f"{date.day:0>2}.{date.month:0>2}.{date.year:0>4} 12:30")
+        self.get_output()
+        # no free date is chosen
+        self.get_output(), self.send_input('')
+        display = self.get_output()
+        self.assertEqual(
+            display,
+            f"Would you like to wait for {date:%d.%m.%Y} 12:30? You get the court if somebody cancels.\n"
+            "[1] 30 minutes\n[2] 60 minutes\n[3] 90 minutes\n"
+            "Choose a number or press enter to choose a different date.\n"
+        )
+        self.send_input('2')
+        display = self.get_output()
+        self.assertEqual(display, f"You are on the waiting list for {date:%d.%m.%Y} 12:30.\n")
+        self.assertEqual(
+            self.get_output(), 'When would you like to book? {DD.MM.YYYY HH:MM}\n'
+        )
+
+        remove_db()
+
+    def test_make_reservation_waitlist_before_closing(self):
+        FakeDB().run()
+
+        app = TennisCourtApp(
+                    os.path.join('src', 'tennis_court', 'db', 'temp.db'), io=(self.fake_input, self.fake_output)
+        )
+
+        app_thread = threading.Thread(target=app.run, daemon=True)
+        app_thread.start()
+
+        self.get_output(), self.send_input('1')
+        self.get_output(), self.send_input('Jan test')
+
+        date = datetime.today() + timedelta(days=1)
+        self.get_output(), self.send_input(f"{date.day:0>2}.{date.month:0>2}.{date.year:0>4} 20:00")
+        self.get_output()
+        self.get_output(), self.send_input('')
+        # the lengths ending after the closing hour are not offered
+        display = self.get_output()
+        self.assertEqual(
+            display,
+            f"Would you like to wait for {date:%d.%m.%Y} 20:00? You get the court if somebody cancels.\n"
+            "[1] 30 minutes\n[2] 60 minutes\n"
+            "Choose a number or press enter to choose a different date.\n"
+        )
+        self.send_input('3')
+        self.assertEqual(
+            self.get_output(), 'When would you like to book? {DD.MM.YYYY HH:MM}\n'
+        )
+
+        remove_db()
 
     def test_make_reservation_unavailable_date(self):
         FakeDB().run()
@@ -315,7 +420,7 @@ class TestTennisCourtAppWithDB(unittest.TestCase):
             "How long would you like to book court?\n" + "[1] 30 minutes\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_make_reservation_unavailable_date_options(self):
         FakeDB().run()
@@ -343,4 +448,4 @@ class TestTennisCourtAppWithDB(unittest.TestCase):
             "How long would you like to book court?\n[1] 30 minutes\n"
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
\ No newline at end of file
+        remove_db()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from tennis_court.app import TennisCourtApp
+from tennis_court.control_db import DataBase
+from tennis_court.metrics import Metrics, MetricsWriter, ACTIONS_TOTAL, ACTION_SECONDS, OUTCOMES_TOTAL
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_render(self):
+        metrics = Metrics()
+        metrics.inc(ACTIONS_TOTAL, action='make')
+        metrics.inc(ACTIONS_TOTAL, action='make')
+        metrics.observe(ACTION_SECONDS, 0.003, action='make')
+        metrics.observe(ACTION_SECONDS, 7, action='make')
+
+        text = metrics.render()
+        self.assertIn(f"# TYPE {ACTIONS_TOTAL} counter\n{ACTIONS_TOTAL}{{action=\"make\"}} 2\n", text)
+        self.assertIn(f"# TYPE {ACTION_SECONDS} histogram\n", text)
+        self.assertIn(f'{ACTION_SECONDS}_bucket{{action="make",le="0.0025"}} 0\n', text)
+        self.assertIn(f'{ACTION_SECONDS}_bucket{{action="make",le="0.005"}} 1\n', text)
+        self.assertIn(f'{ACTION_SECONDS}_bucket{{action="make",le="+Inf"}} 2\n', text)
+        self.assertIn(f'{ACTION_SECONDS}_sum{{action="make"}} 7.003\n', text)
+        self.assertIn(f'{ACTION_SECONDS}_count{{action="make"}} 2\n', text)
+
+    def test_writer(self):
+        metrics = Metrics()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tennis_court.prom')
+            writer = MetricsWriter(metrics, path, interval=60).start()
+            metrics.inc(OUTCOMES_TOTAL, outcome='booked')
+            writer.stop()
+            with open(path, encoding='utf8') as file:
+                self.assertIn(f'{OUTCOMES_TOTAL}{{outcome="booked"}} 1', file.read())
+            self.assertEqual(os.listdir(directory), ['tennis_court.prom'])
+
+
+class TestAppMetrics(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.metrics = Metrics()
+        self.date = datetime.today().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=3)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def run_app(self, *responses):
+        responses = iter(responses)
+        app = TennisCourtApp(io=(lambda: next(responses), lambda text: None), db=self.db, metrics=self.metrics)
+        app.run()
+
+    def test_actions_and_outcomes(self):
+        date = f"{self.date:%d.%m.%Y %H:%M}"
+        self.db.add('Adam', 'Nowak', self.date, self.date + timedelta(hours=1))
+        self.run_app(
+            # the date is taken, the suggestion is accepted
+            '1', 'Jan Kowalski', date, 'yes', '1', '',
+            '1', 'Jan Kowalski', date, 'no', f"{self.date + timedelta(days=1):%d.%m.%Y %H:%M}", '1', '',
+            # the weekly quota is reached
+            '1', 'Jan Kowalski', date, '',
+            '2', 'Adam Nowak', date, '',
+            '2', 'Adam Nowak', date, '',
+            '5',
+        )
+
+        self.assertEqual(self.metrics.value(ACTIONS_TOTAL, action='make'), 3)
+        self.assertEqual(self.metrics.value(ACTIONS_TOTAL, action='cancel'), 2)
+        for outcome, count in (
+            ('booked', 2), ('suggestion_accepted', 1), ('suggestion_declined', 1), ('quota', 1),
+            ('cancelled', 1), ('cancel_not_found', 1),
+        ):
+            with self.subTest(outcome):
+                self.assertEqual(self.metrics.value(OUTCOMES_TOTAL, outcome=outcome), count)
+        self.assertIn(f'{ACTION_SECONDS}_count{{action="make"}} 3', self.metrics.render())
@@ -0,0 +1,123 @@
+import unittest
+import os
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.migrations import SCHEMA_VERSION, get_version
+from .fake_db import FakeDB, remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestMigrations(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        remove_db(TEMP_DB)
+
+    def test_upgrade_existing_database(self):
+        # FakeDB creates the first, unversioned schema
+        FakeDB().run()
+
+        db = DataBase('9:00', '21:00', TEMP_DB)
+        db.set_db()
+        self.assertEqual(get_version(db._db), SCHEMA_VERSION)
+
+        indexes = {row[0] for row in db._db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({'reservations_dates_idx', 'reservations_user_idx'} <= indexes)
+        self.assertEqual(db._db.execute("SELECT COUNT(*) FROM reservations").fetchone()[0], 6)
+        db.close()
+
+    def test_migrate_twice(self):
+        for _ in range(2):
+            db = DataBase('9:00', '21:00', TEMP_DB)
+            db.set_db()
+            self.assertEqual(get_version(db._db), SCHEMA_VERSION)
+            db.close()
+
+
+class TestQueryPlans(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.date = datetime(2030, 5, 14, 12)
+        self.db.add('Jan', 'Kowalski', self.date, self.date + timedelta(hours=1))
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def take_plans(self, call):
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        call()
+        self.db._db.set_trace_callback(None)
+        return [
+            ' '.join(row[3] for row in self.db._db.execute('EXPLAIN QUERY PLAN ' + statement))
+            for statement in statements if statement.lstrip().startswith(('SELECT', 'DELETE'))
+        ]
+
+    def assertUseIndex(self, plans, index):
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertIn(index, plan)
+
+    def test_check_availability_court(self):
+        # the days are loaded into the day cache by a range of start_date
+        plans = self.take_plans(lambda: self.db.check_availability_court(self.date))
+        self.assertSearchStartRange(plans)
+
+    def test_suggest_new_date(self):
+        plans = self.take_plans(lambda: self.db.suggest_new_date(self.date))
+        self.assertSearchStartRange(plans)
+
+    def test_has_permission_can_reservation(self):
+        plans = self.take_plans(lambda: self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+        self.assertEqual(len(plans), 1)
+        self.assertUseIndex(plans, 'user_weeks USING PRIMARY KEY')
+
+        # the counters reach the quota, the reservations of the week are counted
+        tomorrow = datetime.today().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        for days in range(2):
+            self.db.add('Jan', 'Kowalski', tomorrow + timedelta(days=days), tomorrow + timedelta(days=days, hours=1))
+        plans = self.take_plans(lambda: self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+        self.assertEqual(len(plans), 2)
+        self.assertIn('COVERING INDEX reservations_user_idx', plans[1])
+
+    def test_cancel(self):
+        plans = self.take_plans(lambda: self.db.cancel('Jan', 'Kowalski', self.date))
+        self.assertUseIndex(plans[:-2], 'reservations_user_idx')
+        # the past waiters are deleted and the waiters of the freed period are found by its start
+        self.assertIn('INDEX waitlist_slot_idx (court_id=? AND start_date<?)', plans[-2])
+        self.assertIn('INDEX waitlist_slot_idx (court_id=? AND start_date>? AND start_date<?)', plans[-1])
+
+    def assertSearchStartRange(self, plans):
+        # the overlap statements search a range of start_date, not the history before the date
+        plans = [plan for plan in plans if 'reservations' in plan.split(' USING ')[0]]
+        self.assertUseIndex(plans, 'INDEX reservations_dates_idx (start_date>? AND start_date<?)')
+
+    def test_book(self):
+        plans = self.take_plans(
+            lambda: self.db.book('Adam', 'Nowak', self.date + timedelta(hours=2), self.date + timedelta(hours=3))
+        )
+        self.assertSearchStartRange(plans)
+
+    def test_add_many(self):
+        plans = self.take_plans(
+            lambda: self.db.add_many([('Adam', 'Nowak', self.date, self.date + timedelta(hours=3))])
+        )
+        self.assertSearchStartRange(plans)
+
+    def test_find_court_and_free_slots(self):
+        plans = self.take_plans(lambda: self.db.find_court(self.date))
+        plans += self.take_plans(lambda: self.db.find_free_slots(self.date, horizon=timedelta(days=1)))
+        self.assertSearchStartRange(plans)
+
+    def test_build_slot_index(self):
+        date = datetime.today().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=3)
+        self.db._slots = None
+        plans = self.take_plans(lambda: self.db.check_availability_court(date))
+        self.assertSearchStartRange(plans)
+
+    def test_take_schedule_days(self):
+        plans = self.take_plans(lambda: list(self.db.take_schedule_days(self.date, self.date)))
+        self.assertSearchStartRange(plans)
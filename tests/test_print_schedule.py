@@ -2,11 +2,13 @@ import unittest
 import threading
 import queue
 import os
+import json
 from faker import Faker
 from datetime import datetime, timedelta
 
 from tennis_court.app import TennisCourtApp
-from .fake_db import FakeDB
+from tennis_court.control_db import DataBase
+from .fake_db import FakeDB, remove_db
 
 class TestTennisCourtApp(unittest.TestCase):
 
@@ -42,7 +44,7 @@ class TestTennisCourtApp(unittest.TestCase):
             "Please enter the start date: "
         )
 
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
     def test_print_schedule(self):
         FakeDB().run()
@@ -73,5 +75,55 @@ class TestTennisCourtApp(unittest.TestCase):
             display,
             'Today:\nNo Reservations\n\n'
         )
-        os.remove(os.path.join('src', 'tennis_court', 'db', 'temp.db'))
+        remove_db()
 
+
+
+class TestShowScheduleRange(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime(2030, 5, 13)
+        self.db.add('Jan', 'Kowalski', self.day + timedelta(hours=10), self.day + timedelta(hours=11))
+        self.db.add('Iwona', 'Zamkowska', self.day + timedelta(days=2, hours=9), self.day + timedelta(days=2, hours=10))
+        self.db.add('Adam', 'Lewanowski', self.day + timedelta(days=5, hours=12), self.day + timedelta(days=5, hours=13))
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_take_schedule_days_one_query(self):
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        days = list(self.db.take_schedule_days(self.day, self.day + timedelta(days=3)))
+        self.db._db.set_trace_callback(None)
+
+        self.assertEqual(len([statement for statement in statements if 'reservations' in statement]), 1)
+        self.assertEqual([day for day, _ in days], [(self.day + timedelta(days=i)).date() for i in range(4)])
+        self.assertEqual([len(res) for _, res in days], [1, 0, 1, 0])
+
+    def test_show_schedule(self):
+        schedule = list(self.db.show_schedule(self.day, self.day + timedelta(days=1)))
+        self.assertEqual(
+            schedule,
+            [
+                "Monday\n* Jan Kowalski                   2030-05-13 10:00  - 2030-05-13 11:00 \n\n",
+                "Tuesday\nNo Reservations\n\n",
+            ]
+        )
+
+    def test_save_as_json(self):
+        self.db.save_as_json('test_schedule', [self.day, self.day + timedelta(days=2)])
+        path = os.path.join('src', 'tennis_court', 'save', 'test_schedule.json')
+        with open(path, encoding='utf8') as file:
+            payload = json.load(file)
+        os.remove(path)
+
+        self.assertEqual(
+            payload,
+            {
+                '13.05': [{'name': 'Jan Kowalski', 'start_time': '10:00', 'end_time': '11:00'}],
+                '14.05': [],
+                '15.05': [{'name': 'Iwona Zamkowska', 'start_time': '09:00', 'end_time': '10:00'}],
+            }
+        )
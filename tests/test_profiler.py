@@ -0,0 +1,82 @@
+import unittest
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.profiler import QueryProfiler, normalize
+from tennis_court import queries
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestQueryProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.slow_log = os.path.join(self.directory.name, 'slow.log')
+        self.day = datetime(2030, 5, 13)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        remove_db(TEMP_DB)
+
+    def make_db(self, profiler, **kwargs):
+        db = DataBase('9:00', '21:00', TEMP_DB, profiler=profiler, **kwargs)
+        db.set_db()
+        self.addCleanup(db.close)
+        db.add('Jan', 'Kowalski', self.day + timedelta(hours=10), self.day + timedelta(hours=11))
+        db.add('Adam', 'Nowak', self.day + timedelta(hours=12), self.day + timedelta(hours=13))
+        return db
+
+    def test_statements_and_calls(self):
+        profiler = QueryProfiler()
+        db = self.make_db(profiler)
+        days = list(db.show_schedule(self.day, self.day + timedelta(days=1)))
+        self.assertEqual(len(days), 2)
+
+        stats = profiler.stats()
+        schedule = stats['statements'][normalize(queries.SELECT_SCHEDULE)]
+        self.assertEqual((schedule['count'], schedule['rows']), (1, 2))
+        self.assertEqual(schedule['callers'], {'take_schedule_days': 1})
+
+        insert = stats['statements'][normalize(queries.INSERT_RESERVATION)]
+        self.assertEqual((insert['count'], insert['callers']), (2, {'add': 2}))
+        self.assertEqual(stats['calls']['add']['count'], 2)
+        self.assertEqual(stats['calls']['show_schedule']['count'], 1)
+        # no statement reached the threshold
+        self.assertEqual(stats['plans'], {})
+
+        report = profiler.report()
+        self.assertIn('show_schedule', report)
+        self.assertIn(normalize(queries.SELECT_SCHEDULE), report)
+
+    def test_slow_query_log(self):
+        profiler = QueryProfiler(slow_ms=0, slow_log=self.slow_log)
+        db = self.make_db(profiler)
+        db.check_availability_court(self.day + timedelta(hours=10))
+
+        with open(self.slow_log, encoding='utf8') as file:
+            entries = [json.loads(line) for line in file]
+        schedule = [entry for entry in entries if entry['sql'] == normalize(queries.SELECT_SCHEDULE)]
+        self.assertEqual(len(schedule), 1)
+        self.assertEqual(schedule[0]['call'], 'check_availability_court')
+        self.assertIn('reservations_dates_idx', ' '.join(schedule[0]['plan']))
+        self.assertIn(normalize(queries.SELECT_SCHEDULE), profiler.stats()['plans'])
+
+    def test_pool(self):
+        profiler = QueryProfiler()
+        db = self.make_db(profiler, pool_size=2)
+        list(db.take_schedule_days(self.day, self.day + timedelta(days=100)))
+        self.assertEqual(profiler.stats()['calls']['take_schedule_days']['count'], 1)
+        self.assertIn(normalize(queries.SELECT_SCHEDULE), profiler.stats()['statements'])
+
+    def test_dump(self):
+        profiler = QueryProfiler()
+        self.make_db(profiler)
+        path = os.path.join(self.directory.name, 'profile.txt')
+        profiler.dump(path)
+        with open(path, encoding='utf8') as file:
+            self.assertIn('DataBase calls:', file.read())
@@ -0,0 +1,64 @@
+import unittest
+import sqlite3
+
+from tennis_court import queries
+from tennis_court.migrations import migrate
+
+PARAMETERS = {
+    'DATA_VERSION': 0,
+    'SELECT_SETTING': 1,
+    'SET_SETTING': 2,
+    'SELECT_PERIODS': 4,
+    'SELECT_OVERLAPPING': 4,
+    'SELECT_OVERLAPPING_ALL': 4,
+    'SELECT_OVERLAPPING_ARCHIVE': 4,
+    'SELECT_OVERLAPPING_ALL_ARCHIVE': 4,
+    'SELECT_COURT_PERIODS': 3,
+    'COUNT_USER_RESERVATIONS': 4,
+    'SUM_USER_WEEKS': 4,
+    'SELECT_SCHEDULE': 3,
+    'SELECT_SCHEDULE_ARCHIVE': 3,
+    'SELECT_EXPORT': 3,
+    'SELECT_EXPORT_ARCHIVE': 3,
+    'INSERT_RESERVATION': 5,
+    'SELECT_RESERVATION': 4,
+    'DELETE_RESERVATION': 4,
+    'SELECT_COURTS': 0,
+    'INSERT_COURT': 1,
+    'SELECT_ARCHIVE_BATCH_END': 2,
+    'ARCHIVE_RESERVATIONS': 2,
+    'DELETE_ARCHIVED': 2,
+    'SELECT_SERIES_PERIODS': 3,
+    'SELECT_USER_SERIES': 4,
+    'SELECT_USER_WEEKS': 4,
+    'SELECT_SERIES_TO_EXPAND': 1,
+    'SET_SERIES_EXPANDED': 2,
+    'INSERT_SERIES': 7,
+    'SELECT_SERIES': 4,
+    'DELETE_SERIES': 1,
+    'INSERT_WAITER': 5,
+    'DELETE_WAITER': 4,
+    'SELECT_WAITERS': 4,
+    'DELETE_WAITER_BY_ID': 1,
+    'DELETE_PAST_WAITERS': 2,
+}
+
+
+class TestQueries(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = sqlite3.connect(':memory:')
+        migrate(self.db)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_all_statements_are_listed(self):
+        names = {name for name in dir(queries) if name.isupper()}
+        self.assertEqual(names, set(PARAMETERS))
+
+    def test_statements_prepare_on_current_schema(self):
+        for name, count in PARAMETERS.items():
+            with self.subTest(name):
+                # sqlite3 raises ProgrammingError when the number of ? placeholders differs
+                self.db.execute('EXPLAIN ' + getattr(queries, name), (0,) * count)
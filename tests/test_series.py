@@ -0,0 +1,137 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase, Booking
+
+
+class TestSeries(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # a Wednesday, the booking window ends with the 29th of May
+        self.now = datetime(2030, 5, 15, 12)
+        patcher = mock.patch.object(DataBase, 'get_current_date', new_callable=mock.PropertyMock, return_value=self.now)
+        self.current_date = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        # every Tuesday 18:00 - 19:30
+        self.tuesday = datetime(2030, 5, 21, 18)
+        # the last one on the 30th of July
+        self.until = datetime(2030, 7, 30, 23, 59)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def reservations(self, last_name='Kowalski'):
+        return [
+            reservation[3] for _, reservations in self.db.take_schedule_days(self.now, self.until)
+            for reservation in reservations if reservation[2] == last_name
+        ]
+
+    def add_tuesdays(self):
+        return self.db.add_series('Jan', 'Kowalski', self.tuesday, self.tuesday + timedelta(minutes=90), self.until)
+
+    def test_add_series(self):
+        self.assertEqual(self.add_tuesdays(), Booking(True))
+        # only the occurrences of the booking window are reservations
+        self.assertEqual(self.reservations(), [self.tuesday, self.tuesday + timedelta(weeks=1)])
+        self.assertIsNone(self.db.check_availability_court(self.tuesday + timedelta(weeks=1, minutes=30)))
+        self.assertEqual(self.db.check_counters(), [])
+
+        # the later ones are checked against the bookings
+        later = self.tuesday + timedelta(weeks=5)
+        self.assertEqual(
+            self.db.book('Adam', 'Nowak', later + timedelta(minutes=30), later + timedelta(hours=2)),
+            Booking(False, 'conflict', ('Jan', 'Kowalski', later, later + timedelta(minutes=90)))
+        )
+        self.assertEqual(
+            self.db.add_many([('Adam', 'Nowak', later - timedelta(minutes=30), later + timedelta(minutes=30))]),
+            [Booking(False, 'conflict', ('Jan', 'Kowalski', later, later + timedelta(minutes=90)))]
+        )
+        self.assertTrue(self.db.book('Adam', 'Nowak', later + timedelta(minutes=90), later + timedelta(hours=2)).booked)
+        self.assertEqual(self.db.find_free_slots(later, 60, 1, timedelta(hours=3)), [later + timedelta(hours=2)])
+
+    def test_expansion_follows_the_window(self):
+        self.add_tuesdays()
+        self.current_date.return_value = self.now + timedelta(weeks=1)
+        self.assertIsNone(self.db.check_availability_court(self.tuesday + timedelta(weeks=2)))
+        self.assertEqual(self.reservations(), [self.tuesday + timedelta(weeks=week) for week in range(3)])
+
+        # the window reaches the last occurrence, the series adds nothing more
+        for days in (60, 70):
+            self.current_date.return_value = self.now + timedelta(days=days)
+            self.db.check_availability_court(self.now + timedelta(days=days, hours=2))
+        self.assertEqual(self.db._db.execute("SELECT COUNT(*) FROM reservations").fetchone()[0], 11)
+        self.assertEqual(self.db.check_counters(), [])
+
+    def test_conflicts_are_checked_with_one_query(self):
+        busy = self.tuesday + timedelta(weeks=7, minutes=60)
+        self.db.add('Adam', 'Nowak', busy, busy + timedelta(hours=1))
+
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        booking = self.add_tuesdays()
+        self.db._db.set_trace_callback(None)
+        self.assertEqual(booking, Booking(False, 'conflict', ('Adam', 'Nowak', busy, busy + timedelta(hours=1))))
+        self.assertEqual(
+            len([statement for statement in statements if 'FROM reservations' in statement]), 1
+        )
+        self.assertEqual(self.db._db.execute("SELECT COUNT(*) FROM series").fetchone()[0], 0)
+        self.assertEqual(self.reservations(), [])
+
+        # a series overlapping another series
+        self.db.cancel('Adam', 'Nowak', busy)
+        self.add_tuesdays()
+        evening = self.tuesday + timedelta(weeks=9, hours=1)
+        self.assertEqual(
+            self.db.add_series('Adam', 'Nowak', evening, evening + timedelta(hours=1), self.until),
+            Booking(
+                False, 'conflict', ('Jan', 'Kowalski', evening - timedelta(hours=1), evening + timedelta(minutes=30))
+            )
+        )
+
+    def test_quota(self):
+        thursday = datetime(2030, 5, 16, 10)
+        self.assertTrue(self.add_tuesdays().booked)
+        self.assertTrue(
+            self.db.add_series('Jan', 'Kowalski', thursday, thursday + timedelta(hours=1), self.until).booked
+        )
+        # both series take the week from now
+        self.assertFalse(self.db.has_permission_can_reservation('Jan', 'Kowalski'))
+
+        # a third series would give more than two reservations a week
+        friday = datetime(2030, 7, 5, 10)
+        self.assertEqual(
+            self.db.add_series('Jan', 'Kowalski', friday, friday + timedelta(hours=1), friday + timedelta(weeks=4)),
+            Booking(False, 'quota')
+        )
+        # after the other series end it is possible
+        self.assertTrue(
+            self.db.add_series('Jan', 'Kowalski', friday + timedelta(weeks=4), friday + timedelta(weeks=4, hours=1),
+                               friday + timedelta(weeks=8)).booked
+        )
+        self.assertTrue(self.db.add_series('Adam', 'Nowak', friday, friday + timedelta(hours=1), self.until).booked)
+
+    def test_cancel_series(self):
+        self.add_tuesdays()
+        # one occurrence is cancelled like a reservation, the series stays
+        self.assertTrue(self.db.cancel('Jan', 'Kowalski', self.tuesday))
+        self.assertTrue(self.db.check_availability_court(self.tuesday))
+        later = self.tuesday + timedelta(weeks=3)
+        self.assertEqual(self.db.book('Adam', 'Nowak', later, later + timedelta(hours=1)).reason, 'conflict')
+
+        self.assertTrue(self.db.cancel_series('Jan', 'Kowalski', self.tuesday))
+        self.assertFalse(self.db.cancel_series('Jan', 'Kowalski', self.tuesday))
+        self.assertEqual(self.reservations(), [])
+        self.assertTrue(self.db.check_availability_court(self.tuesday + timedelta(weeks=1)))
+        self.assertTrue(self.db.book('Adam', 'Nowak', later, later + timedelta(hours=1)).booked)
+        self.assertEqual(self.db.check_counters(), [])
+
+    def test_invalid(self):
+        end = self.tuesday + timedelta(minutes=90)
+        self.assertEqual(self.db.add_series('Jan', 'Kowalski', end, self.tuesday, self.until).reason, 'invalid')
+        self.assertEqual(
+            self.db.add_series('Jan', 'Kowalski', self.tuesday, end, self.tuesday - timedelta(days=1)).reason,
+            'invalid'
+        )
@@ -0,0 +1,77 @@
+import unittest
+import asyncio
+import gc
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from tennis_court.control_db import DataBase
+from tennis_court.server import MenuServer
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+CLIENTS = 50
+MENU = """
+What do you want to do? Choose number: \n 
+\t[1] Make a reservation
+\t[2] Cancel a reservation
+\t[3] Print schedule
+\t[4] Save schedule to a file
+\t[5] Exit\n
+"""
+
+
+class TestMenuServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', TEMP_DB, pool_size=4)
+        self.db.set_db()
+        self.executor = ThreadPoolExecutor(max_workers=CLIENTS)
+        self.server = await MenuServer(self.db, self.executor).start('127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        # the sessions finish on the event loop, so do not block it
+        await asyncio.to_thread(self.executor.shutdown)
+        self.db.close()
+        remove_db(TEMP_DB)
+
+    async def read_text(self, reader, text):
+        return (await reader.readexactly(len(text.encode('utf8')))).decode('utf8')
+
+    async def exit_session(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        menu = await self.read_text(reader, MENU)
+        writer.write(b'5\n')
+        goodbye = await reader.read()
+        writer.close()
+        return menu, goodbye.decode('utf8')
+
+    async def test_concurrent_sessions(self):
+        results = await asyncio.wait_for(
+            asyncio.gather(*(self.exit_session() for _ in range(CLIENTS))), timeout=10
+        )
+        self.assertEqual(results, [(MENU, 'See you soon!\n')] * CLIENTS)
+
+    async def test_print_schedule(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        await self.read_text(reader, MENU)
+        writer.write(b'3\n')
+        self.assertEqual(await self.read_text(reader, "Please enter the start date: "), "Please enter the start date: ")
+        writer.write(b'13.05.2030\n13.05.2030\n')
+        await self.read_text(reader, "Please enter the end date: ")
+        self.assertEqual(await self.read_text(reader, "Monday\nNo Reservations\n\n"), "Monday\nNo Reservations\n\n")
+        writer.close()
+
+    async def test_client_disconnects(self):
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        await self.read_text(reader, MENU)
+        writer.close()
+        # the session thread is released, so another client can be served
+        self.assertEqual(await asyncio.wait_for(self.exit_session(), timeout=5), (MENU, 'See you soon!\n'))
+        # the EOFError ending the menu is a normal end of the session, not an unretrieved exception
+        gc.collect()
+        self.assertEqual(errors, [])
@@ -0,0 +1,149 @@
+import unittest
+import random
+import os
+from unittest import mock
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.slot_index import SlotIndex
+from .test_suggest_new_date import suggest_new_date_step_by_step
+from .fake_db import remove_db
+
+TEMP_DB = os.path.join('src', 'tennis_court', 'db', 'temp.db')
+
+
+class TestSlotIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.start = datetime(2030, 5, 14)
+        self.slots = SlotIndex(self.start, days=1)
+        self.slots.fill(self.start + timedelta(hours=10), self.start + timedelta(hours=11))
+
+    def hour(self, hours):
+        return self.start + timedelta(hours=hours)
+
+    def test_is_free(self):
+        self.assertTrue(self.slots.is_free(self.hour(9.5)))
+        self.assertFalse(self.slots.is_free(self.hour(10.5)))
+        self.assertTrue(self.slots.is_free(self.hour(11)))
+
+    def test_search(self):
+        self.assertEqual(self.slots.next_free(self.hour(10)), self.hour(11))
+        self.assertEqual(self.slots.previous_free(self.hour(10.5)), self.hour(9.5))
+
+    def test_full_window(self):
+        self.slots.fill(self.start, self.start + timedelta(days=1))
+        self.assertIsNone(self.slots.next_free(self.hour(0)))
+        self.assertIsNone(self.slots.previous_free(self.hour(23.5)))
+
+    def test_clear(self):
+        self.slots.clear(self.hour(10), self.hour(10.5))
+        self.assertTrue(self.slots.is_free(self.hour(10)))
+        self.assertFalse(self.slots.is_free(self.hour(10.5)))
+
+    def test_free_run(self):
+        self.assertEqual(self.slots.free_run(self.hour(8)), 4)
+        self.assertEqual(self.slots.free_run(self.hour(10.5)), 0)
+        # up to the end of the day
+        self.assertEqual(self.slots.free_run(self.hour(11)), 26)
+
+        self.slots.fill(self.hour(9), self.hour(9.5))
+        self.assertEqual(self.slots.free_run(self.hour(8)), 2)
+        self.assertEqual(self.slots.free_run(self.hour(9.5)), 1)
+        self.slots.clear(self.hour(9), self.hour(11))
+        self.assertEqual(self.slots.free_run(self.hour(8)), 32)
+
+    def test_free_run_follows_changes(self):
+        rng = random.Random(2023)
+        slots = SlotIndex(self.start, days=3)
+        for _ in range(300):
+            start = self.start + timedelta(minutes=30 * rng.randint(0, 3 * 48 - 1))
+            end = start + timedelta(minutes=30 * rng.randint(1, 6))
+            (slots.fill if rng.random() < 0.6 else slots.clear)(start, end)
+
+            date = self.start + timedelta(minutes=30 * rng.randint(0, 3 * 48 - 1))
+            run = 0
+            while (date + timedelta(minutes=30 * run)).date() == date.date() and \
+                    slots.is_free(date + timedelta(minutes=30 * run)):
+                run += 1
+            self.assertEqual(slots.free_run(date), run)
+
+
+class TestDataBaseSlotIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=3)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def add(self, start, end):
+        self.db.add('Jan', 'Kowalski', self.day + timedelta(hours=start), self.day + timedelta(hours=end))
+
+    def test_no_select_on_hot_path(self):
+        self.add(10, 11)
+        date = self.day + timedelta(hours=10)
+
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        self.assertIsNone(self.db.check_availability_court(date))
+        self.assertEqual(self.db.suggest_new_date(date), date - timedelta(minutes=30))
+        self.assertEqual(self.db.check_reservation_options(date - timedelta(minutes=30)), [30])
+        self.db._db.set_trace_callback(None)
+
+        self.assertFalse([statement for statement in statements if 'reservations' in statement])
+
+    def test_cancel_frees_slots(self):
+        self.add(10, 11)
+        self.db.cancel('Jan', 'Kowalski', self.day + timedelta(hours=10))
+        self.assertTrue(self.db.check_availability_court(self.day + timedelta(hours=10, minutes=30)))
+
+    def test_same_answers_as_sql(self):
+        rng = random.Random(2023)
+        without_index = lambda: mock.patch.object(self.db, '_take_slot_index', return_value=None)
+        for _ in range(100):
+            self.db._cursor.execute("DELETE FROM reservations")
+            self.db._slots = self.db._build_slot_index(self.db._db, self.db._slots.start)
+            reservations = []
+            hour = 9 + rng.randint(0, 4) / 2
+            while hour < 21:
+                length = rng.choice([0.5, 1, 1.5])
+                if rng.random() < 0.7:
+                    end = min(hour + length, 21)
+                    self.add(hour, end)
+                    reservations.append((self.day + timedelta(hours=hour), self.day + timedelta(hours=end)))
+                hour += length
+
+            date = self.day + timedelta(hours=9 + rng.randint(0, 23) / 2)
+            self.assertEqual(
+                self.db.suggest_new_date(date),
+                suggest_new_date_step_by_step(reservations, date, '9:00', '21:00')
+            )
+            availability = self.db.check_availability_court(date)
+            options = self.db.check_reservation_options(date) if availability else None
+            with without_index():
+                self.assertEqual(availability, self.db.check_availability_court(date))
+                if availability:
+                    self.assertEqual(options, self.db.check_reservation_options(date))
+
+
+class TestSlotIndexOtherProcess(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        remove_db(TEMP_DB)
+
+    def test_rebuild_after_external_write(self):
+        first = DataBase('9:00', '21:00', TEMP_DB)
+        first.set_db()
+        second = DataBase('9:00', '21:00', TEMP_DB)
+        second.set_db()
+
+        date = datetime.today().replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=2)
+        self.assertTrue(first.check_availability_court(date))
+        second.add('Jan', 'Kowalski', date, date + timedelta(hours=1))
+        self.assertIsNone(first.check_availability_court(date))
+
+        first.close()
+        second.close()
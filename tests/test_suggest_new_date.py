@@ -0,0 +1,90 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+
+
+def suggest_new_date_step_by_step(reservations, date, open_hour, close_hour):
+    """
+    Reference search: walks half-hour by half-hour in both directions like the original algorithm.
+    """
+    open_court = datetime.strptime(open_hour, "%H:%M").time()
+    close_court = datetime.strptime(close_hour, "%H:%M").time()
+    is_taken = lambda hour: any(start <= hour < end for start, end in reservations)
+
+    new_hour_right = date + timedelta(minutes=30)
+    new_hour_left = date - timedelta(minutes=30)
+    is_close, is_open = True, True
+
+    while is_close or is_open:
+        if is_close and close_court > new_hour_right.time():
+            if not is_taken(new_hour_right):
+                return new_hour_right
+            new_hour_right += timedelta(minutes=30)
+        else:
+            is_close = False
+
+        if is_open and new_hour_left.time() > open_court:
+            if not is_taken(new_hour_left):
+                return new_hour_left
+            new_hour_left -= timedelta(minutes=30)
+        else:
+            is_open = False
+
+
+class TestSuggestNewDate(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime(2030, 5, 14)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def add(self, start, end):
+        self.db.add('Jan', 'Kowalski', self.day + timedelta(hours=start), self.day + timedelta(hours=end))
+
+    def test_suggest_later_hour(self):
+        self.add(9, 10)
+        self.assertEqual(self.db.suggest_new_date(self.day + timedelta(hours=9.5)), self.day + timedelta(hours=10))
+
+    def test_suggest_earlier_hour(self):
+        self.add(12, 21)
+        self.assertEqual(self.db.suggest_new_date(self.day + timedelta(hours=13)), self.day + timedelta(hours=11.5))
+
+    def test_full_day(self):
+        self.add(9, 21)
+        self.assertIsNone(self.db.suggest_new_date(self.day + timedelta(hours=12.5)))
+
+    def test_one_query_per_call(self):
+        for hour in range(9, 21):
+            self.add(hour, hour + 0.5)
+
+        statements = []
+        self.db._db.set_trace_callback(statements.append)
+        self.db.suggest_new_date(self.day + timedelta(hours=15))
+        self.db._db.set_trace_callback(None)
+
+        self.assertEqual(len([statement for statement in statements if 'reservations' in statement]), 1)
+
+    def test_same_answers_as_step_by_step_search(self):
+        rng = random.Random(2023)
+        for _ in range(200):
+            self.db._cursor.execute("DELETE FROM reservations")
+            reservations = []
+            hour = 9 + rng.randint(0, 4) / 2
+            while hour < 21:
+                length = rng.choice([0.5, 1, 1.5])
+                if rng.random() < 0.7:
+                    end = min(hour + length, 21)
+                    self.add(hour, end)
+                    reservations.append((self.day + timedelta(hours=hour), self.day + timedelta(hours=end)))
+                hour += length
+
+            date = self.day + timedelta(hours=9 + rng.randint(0, 23) / 2)
+            self.assertEqual(
+                self.db.suggest_new_date(date),
+                suggest_new_date_step_by_step(reservations, date, '9:00', '21:00')
+            )
@@ -0,0 +1,136 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+from tennis_court.control_db import DataBase
+from tennis_court.app import TennisCourtApp
+
+
+class TestWaitlist(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.promoted = []
+        self.db.on_promote = self.promoted.extend
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=3)
+        self.db.add('Jan', 'Kowalski', self.at(10), self.at(11.5))
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def at(self, hours):
+        return self.day + timedelta(hours=hours)
+
+    def waiters(self):
+        return self.db._db.execute("SELECT first_name, last_name FROM waitlist ORDER BY id").fetchall()
+
+    def test_join_and_leave(self):
+        self.assertTrue(self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(11)))
+        self.assertFalse(self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(10.5)))
+        self.assertFalse(self.db.join_waitlist('Adam', 'Nowak', self.at(11), self.at(10)))
+        self.assertTrue(self.db.leave_waitlist('Adam', 'Nowak', self.at(10)))
+        self.assertFalse(self.db.leave_waitlist('Adam', 'Nowak', self.at(10)))
+        self.assertEqual(self.waiters(), [])
+
+    def test_join_a_future_period_between_the_opening_hours(self):
+        self.db.add('Jan', 'Kowalski', self.at(20.5), self.at(21))
+        self.assertFalse(self.db.join_waitlist('Adam', 'Nowak', self.at(20.5), self.at(22)))
+        self.assertFalse(self.db.join_waitlist('Adam', 'Nowak', self.at(8.5), self.at(9.5)))
+        self.assertFalse(self.db.join_waitlist('Adam', 'Nowak', self.at(-72 + 10), self.at(-72 + 11)))
+        self.assertEqual(self.waiters(), [])
+
+        self.db.cancel('Jan', 'Kowalski', self.at(20.5))
+        self.assertEqual(self.promoted, [])
+
+    def test_cancel_books_the_earliest_waiter(self):
+        self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(11))
+        self.db.join_waitlist('Ewa', 'Lis', self.at(10.5), self.at(11.5))
+        # the freed period does not cover the whole hour of Ola
+        self.db.add('Jan', 'Kowalski', self.at(12), self.at(13))
+        self.db.join_waitlist('Ola', 'Nowak', self.at(11), self.at(12.5))
+
+        self.assertTrue(self.db.cancel('Jan', 'Kowalski', self.at(10)))
+        self.assertEqual(self.promoted, [('Adam', 'Nowak', self.at(10), self.at(11), 1)])
+        self.assertEqual(self.waiters(), [('Ewa', 'Lis'), ('Ola', 'Nowak')])
+        self.assertIsNone(self.db.check_availability_court(self.at(10.5)))
+        self.assertTrue(self.db.check_availability_court(self.at(11)))
+        self.assertEqual(self.db.check_reservation_options(self.at(11)), [30, 60])
+        self.assertEqual(
+            [reservation[1] for _, reservations in self.db.take_schedule_days(self.day, self.day)
+             for reservation in reservations], ['Adam', 'Jan']
+        )
+        self.assertEqual(self.db.check_counters(), [])
+
+    def test_one_cancel_books_several_waiters(self):
+        self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(10.5))
+        self.db.join_waitlist('Ewa', 'Lis', self.at(10.5), self.at(11.5))
+        self.db.cancel_many([('Jan', 'Kowalski', self.at(10))])
+        self.assertEqual([promoted[1] for promoted in self.promoted], ['Nowak', 'Lis'])
+        self.assertEqual(self.waiters(), [])
+
+    def test_quota(self):
+        for days in (1, 2):
+            self.db.add('Adam', 'Nowak', self.at(24 * days + 10), self.at(24 * days + 11))
+        self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(11))
+        self.db.join_waitlist('Ewa', 'Lis', self.at(10), self.at(11))
+        self.db.cancel('Jan', 'Kowalski', self.at(10))
+        self.assertEqual([promoted[1] for promoted in self.promoted], ['Lis'])
+        # Adam waits for the next cancel
+        self.assertEqual(self.waiters(), [('Adam', 'Nowak')])
+
+    def test_waiters_of_other_courts_and_hours(self):
+        second = self.db.add_court('Court 2')
+        self.db.add('Jan', 'Kowalski', self.at(10), self.at(11), second)
+        self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(11), second)
+        self.db.join_waitlist('Ewa', 'Lis', self.at(14), self.at(15))
+        self.db.cancel('Jan', 'Kowalski', self.at(10))
+        self.assertEqual(self.promoted, [])
+
+        self.db.cancel('Jan', 'Kowalski', self.at(10), second)
+        self.assertEqual(self.promoted, [('Adam', 'Nowak', self.at(10), self.at(11), second)])
+        self.assertEqual(self.waiters(), [('Ewa', 'Lis')])
+
+    def test_past_waiters_are_deleted(self):
+        self.db.join_waitlist('Adam', 'Nowak', self.at(10), self.at(11))
+        self.db.join_waitlist('Ewa', 'Lis', self.at(14), self.at(15))
+        with mock.patch.object(DataBase, 'get_current_date', new_callable=mock.PropertyMock, return_value=self.at(12)):
+            self.db.cancel('Jan', 'Kowalski', self.at(10))
+        self.assertEqual(self.promoted, [])
+        self.assertEqual(self.waiters(), [('Ewa', 'Lis')])
+
+
+class TestOfferWaitlist(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db = DataBase('9:00', '21:00', ':memory:')
+        self.db.set_db()
+        self.day = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=3)
+        self.answers = []
+        self.outputs = []
+        self.app = TennisCourtApp(io=(lambda: self.answers.pop(0), self.outputs.append), db=self.db)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def offer(self, date, *answers):
+        self.answers.extend(answers)
+        self.app._offer_waitlist('Adam', 'Nowak', date)
+        return self.outputs[-1]
+
+    def test_outside_opening_hours(self):
+        for hour in (8, 21):
+            self.assertEqual(
+                self.offer(self.day + timedelta(hours=hour)),
+                "The waiting list is only for the hours between 9:00 - 21:00.\n"
+            )
+
+    def test_already_waiting(self):
+        date = self.day + timedelta(hours=12)
+        self.db.join_waitlist('Adam', 'Nowak', date, date + timedelta(hours=1))
+        self.assertEqual(self.offer(date, '1'), f"You are already on the waiting list for {date:%d.%m.%Y %H:%M}.\n")
+
+    def test_passed_while_choosing(self):
+        date = self.day + timedelta(hours=12)
+        with mock.patch.object(DataBase, 'get_current_date', new_callable=mock.PropertyMock, return_value=date):
+            self.assertEqual(self.offer(date, '1'), f"The date {date:%d.%m.%Y %H:%M} has already passed.\n")